@@ -0,0 +1,175 @@
+"""
+Duomenų bazės ir servisų našumo matavimai
+-----------------------------
+Repozitorijų masinio rašymo ir skaitymo bei TradingService.backtest_strategy
+matavimai SQLite atminties duomenų bazėje. Lentelės kuriamos iš tų pačių ORM
+modelių kaip MySQL duomenų bazėje, todėl matuojamas ORM ir repozitorijų kodas.
+"""
+
+import contextlib
+import os
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from benchmarks.harness import register
+from database.models import Base, BtcPriceData, TechnicalIndicator, TradingSignal
+from database.repositories import BtcPriceRepository, TechnicalIndicatorRepository
+
+# ORM rašymas ir skaitymas lėti (objektas kiekvienai eilutei), todėl ribojamas duomenų dydis
+DATABASE_MAX_BARS = 500000
+
+# TechnicalIndicator stulpelis -> calculate_technical_indicators() stulpelis
+INDICATOR_COLUMNS = {
+    'sma7': 'SMA_7',
+    'sma30': 'SMA_30',
+    'sma50': 'SMA_50',
+    'sma200': 'SMA_200',
+    'ema7': 'EMA_7',
+    'ema14': 'EMA_14',
+    'ema30': 'EMA_30',
+    'rsi14': 'RSI_14',
+    'rsi7': 'RSI_7',
+    'macd': 'MACD',
+    'macd_signal': 'MACD_signal',
+    'macd_hist': 'MACD_hist',
+    'bb_upper': 'Bollinger_upper',
+    'bb_middle': 'Bollinger_middle',
+    'bb_lower': 'Bollinger_lower',
+    'atr14': 'ATR_14',
+    'obv': 'OBV',
+    'volume_sma20': 'Volume_SMA20',
+    'adx14': 'ADX_14'
+}
+
+def create_session():
+    """
+    Sukuria tuščią SQLite atminties duomenų bazę su visomis lentelėmis.
+    
+    Returns:
+        sqlalchemy.orm.Session: Sesija
+    """
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+def price_entities(data):
+    """
+    Paverčia OHLCV duomenis BtcPriceData objektais.
+    
+    Args:
+        data (pandas.DataFrame): OHLCV duomenys
+    
+    Returns:
+        list: BtcPriceData objektai
+    """
+    columns = zip(data.index.to_pydatetime(), data['Open'].tolist(), data['High'].tolist(),
+                  data['Low'].tolist(), data['Close'].tolist(), data['Volume'].tolist())
+    return [BtcPriceData(timestamp=timestamp, open=open_, high=high, low=low, close=close, volume=volume)
+            for timestamp, open_, high, low, close, volume in columns]
+
+def indicator_entities(indicators, prices):
+    """
+    Paverčia techninius indikatorius TechnicalIndicator objektais.
+    
+    Args:
+        indicators (pandas.DataFrame): calculate_technical_indicators() rezultatas
+        prices (pandas.DataFrame): OHLCV duomenys, kurių eilutės įrašytos į tuščią lentelę iš eilės
+            (i-tosios eilutės ID - i + 1)
+    
+    Returns:
+        list: TechnicalIndicator objektai
+    """
+    price_ids = (prices.index.get_indexer(indicators.index) + 1).tolist()
+    timestamps = indicators.index.to_pydatetime()
+    values = {column: indicators[source].tolist() for column, source in INDICATOR_COLUMNS.items()}
+    
+    entities = []
+    for i, price_id in enumerate(price_ids):
+        entities.append(TechnicalIndicator(price_id=price_id, timestamp=timestamps[i],
+                                           **{column: column_values[i] for column, column_values in values.items()}))
+    return entities
+
+def populated_session(context):
+    """
+    Grąžina (vieną kartą kiekvienam kontekstui sukurtą) duomenų bazę su kainomis ir indikatoriais.
+    
+    Args:
+        context (BenchmarkContext): Duomenų kontekstas
+    
+    Returns:
+        sqlalchemy.orm.Session: Sesija
+    """
+    def populate():
+        session = create_session()
+        BtcPriceRepository(session).add_all(price_entities(context.ohlcv))
+        TechnicalIndicatorRepository(session).add_all(indicator_entities(context.indicators, context.ohlcv))
+        session.expunge_all()
+        return session
+    return context.cached('sqlite_session', populate)
+
+@contextlib.contextmanager
+def working_directory(path):
+    """
+    Laikinai pakeičia darbinį katalogą (servisai rašo ir skaito santykiniais keliais).
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def _write_prices_setup(context):
+    return create_session(), price_entities(context.ohlcv)
+
+@register('database.add_all.prices', setup=_write_prices_setup, max_bars=DATABASE_MAX_BARS)
+def write_prices(argument):
+    session, entities = argument
+    if not BtcPriceRepository(session).add_all(entities):
+        raise RuntimeError("Nepavyko įrašyti kainų")
+
+def _write_indicators_setup(context):
+    session = create_session()
+    BtcPriceRepository(session).add_all(price_entities(context.ohlcv))
+    session.expunge_all()
+    return session, indicator_entities(context.indicators, context.ohlcv)
+
+@register('database.add_all.indicators', setup=_write_indicators_setup, max_bars=DATABASE_MAX_BARS)
+def write_indicators(argument):
+    session, entities = argument
+    if not TechnicalIndicatorRepository(session).add_all(entities):
+        raise RuntimeError("Nepavyko įrašyti indikatorių")
+
+@register('database.get_all_as_dataframe.prices', setup=populated_session, max_bars=DATABASE_MAX_BARS)
+def read_prices(session):
+    df = BtcPriceRepository(session).get_all_as_dataframe()
+    session.expunge_all()
+    if df.empty:
+        raise RuntimeError("Nepavyko nuskaityti kainų")
+
+@register('database.get_all_as_dataframe.indicators', setup=populated_session, max_bars=DATABASE_MAX_BARS)
+def read_indicators(session):
+    df = TechnicalIndicatorRepository(session).get_all_as_dataframe()
+    session.expunge_all()
+    if df.empty:
+        raise RuntimeError("Nepavyko nuskaityti indikatorių")
+
+def _backtest_setup(context):
+    from services.trading_service import TradingService
+    # Katalogas ištrinamas, kai kontekstas atlaisvina duomenis
+    workdir = context.cached('workdir', tempfile.TemporaryDirectory)
+    return TradingService(populated_session(context)), workdir.name
+
+@register('services.backtest_strategy', setup=_backtest_setup, max_bars=DATABASE_MAX_BARS)
+def backtest_strategy(argument):
+    service, workdir = argument
+    # Tuščiame darbiniame kataloge nėra data/processed/btc_features.csv, todėl duomenys skaitomi iš duomenų bazės
+    with working_directory(workdir):
+        results = service.backtest_strategy()
+    # Servisas klaidas tik registruoja, todėl tikriname, kad signalai tikrai įrašyti (o ne atšaukti)
+    saved_signals = service.session.query(TradingSignal).count()
+    service.session.expunge_all()
+    if results.empty:
+        raise RuntimeError("backtest_strategy negrąžino rezultatų")
+    if not saved_signals:
+        raise RuntimeError("backtest_strategy neįrašė signalų į duomenų bazę")
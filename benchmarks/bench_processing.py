@@ -0,0 +1,34 @@
+"""
+Duomenų apdorojimo našumo matavimai
+-----------------------------
+Sintetinių duomenų generavimo ir process_btc_data etapų (valymo, techninių
+indikatorių, pažangių ypatybių, transformavimo modeliams) matavimai.
+Etapai gauna tuos pačius duomenis, kuriuos process_btc_data gautų iš duomenų bazės.
+"""
+
+from benchmarks.harness import register
+from src.data.synthetic import generate_ohlcv
+from src.data import processor
+
+def _advanced_features(context):
+    return context.cached('advanced_features', lambda: processor.create_advanced_features(context.indicators))
+
+@register('data.generate_ohlcv')
+def generate(context):
+    generate_ohlcv(context.bars, seed=context.seed)
+
+@register('processor.clean_data', setup=lambda context: context.ohlcv)
+def clean_data(data):
+    processor.clean_data(data)
+
+@register('processor.calculate_technical_indicators', setup=lambda context: context.ohlcv)
+def calculate_technical_indicators(data):
+    processor.calculate_technical_indicators(data)
+
+@register('processor.create_advanced_features', setup=lambda context: context.indicators)
+def create_advanced_features(data):
+    processor.create_advanced_features(data)
+
+@register('processor.transform_data_for_models', setup=_advanced_features)
+def transform_data_for_models(data):
+    processor.transform_data_for_models(data)
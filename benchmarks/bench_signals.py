@@ -0,0 +1,54 @@
+"""
+Signalų generatorių našumo matavimai
+-----------------------------
+Kiekvienam signalų generatoriui matuojami du keliai: vektorinis signal_values()
+visiems žingsniams (įvykiais grindžiama simuliacija) ir generate_signal()
+kiekviename žingsnyje, kaip jį kviečia SimulatorEngine.bar_signals()
+(įskaitant žingsnio eilutės paėmimą iš DataFrame).
+"""
+
+import random
+from benchmarks.harness import register
+from simulator.signals.technical_indicator_signal_generator import (
+    TechnicalIndicatorSignalGenerator,
+    MacdSignalGenerator,
+    RsiSignalGenerator
+)
+from simulator.signals.model_prediction_signal_generator import ModelPredictionSignalGenerator
+from simulator.signals.hybrid_signal_generator import HybridSignalGenerator
+from simulator.signals.simple_test_signal_generator import SimpleTestSignalGenerator
+
+# Žingsnio kelias lėtas (pandas eilutė kiekviename žingsnyje), todėl ribojamas duomenų dydis
+PER_BAR_MAX_BARS = 200000
+
+# Generatoriaus pavadinimas -> (gamyklinė funkcija, ar palaiko vektorinį signal_values())
+GENERATORS = {
+    'TechnicalIndicatorSignalGenerator': (TechnicalIndicatorSignalGenerator, True),
+    'MacdSignalGenerator': (MacdSignalGenerator, True),
+    'RsiSignalGenerator': (RsiSignalGenerator, True),
+    'ModelPredictionSignalGenerator': (ModelPredictionSignalGenerator, True),
+    'HybridSignalGenerator': (lambda: HybridSignalGenerator([TechnicalIndicatorSignalGenerator(),
+                                                             ModelPredictionSignalGenerator()]), True),
+    'SimpleTestSignalGenerator': (SimpleTestSignalGenerator, False)
+}
+
+def _setup(factory):
+    def setup(context):
+        random.seed(context.seed)
+        return factory(), context.features
+    return setup
+
+def _signal_values(argument):
+    generator, data = argument
+    generator.signal_values(data)
+
+def _generate_signal(argument):
+    generator, data = argument
+    index = data.index
+    for i in range(len(data)):
+        generator.generate_signal(data.iloc[i], data, index[i])
+
+for _name, (_factory, _vectorized) in GENERATORS.items():
+    if _vectorized:
+        register(f"signals.{_name}.signal_values", setup=_setup(_factory))(_signal_values)
+    register(f"signals.{_name}.generate_signal", setup=_setup(_factory), max_bars=PER_BAR_MAX_BARS)(_generate_signal)
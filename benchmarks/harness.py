@@ -0,0 +1,362 @@
+"""
+Našumo matavimų karkasas
+-----------------------------
+Šis modulis apibrėžia našumo matavimų registrą, vykdymą ir istoriją.
+Kiekvienas matavimas turi paruošimo funkciją (nematuojama, kviečiama prieš
+kiekvieną pakartojimą) ir matuojamą funkciją. Duomenys generuojami
+sintetiniu OHLCV generatoriumi pagal sėklą, todėl to paties dydžio ir sėklos
+matavimai palyginami tarp versijų. Rezultatai kaupiami JSON istorijoje,
+o naujas rezultatas lyginamas su paskutiniu ankstesniu to paties matavimo rezultatu.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+from datetime import datetime
+from time import perf_counter
+from src.data.synthetic import generate_ohlcv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = "benchmarks/results/history.json"
+
+# Registruoti matavimai: pavadinimas -> Benchmark
+BENCHMARKS = {}
+
+class Benchmark:
+    """
+    Vienas našumo matavimas.
+    """
+    def __init__(self, name, run, setup=None, max_bars=None, group=None):
+        """
+        Inicializuoja matavimą.
+        
+        Args:
+            name (str): Matavimo pavadinimas (pvz. 'engine.run_simulation')
+            run (callable): Matuojama funkcija (paruošimo rezultatas) -> bet kas
+            setup (callable, optional): Paruošimo funkcija (BenchmarkContext) -> matuojamos funkcijos argumentas
+            max_bars (int, optional): Didžiausias duomenų dydis; didesniems matavimas praleidžiamas
+            group (str, optional): Matavimų grupė (numatyta - pavadinimo pradžia iki taško)
+        """
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.max_bars = max_bars
+        self.group = group or name.split('.')[0]
+
+def register(name, setup=None, max_bars=None, group=None):
+    """
+    Dekoratorius, registruojantis matuojamą funkciją.
+    
+    Args:
+        name (str): Matavimo pavadinimas
+        setup (callable, optional): Paruošimo funkcija (žr. Benchmark)
+        max_bars (int, optional): Didžiausias duomenų dydis
+        group (str, optional): Matavimų grupė
+    
+    Returns:
+        callable: Dekoratorius
+    """
+    def decorator(run):
+        if name in BENCHMARKS:
+            raise ValueError(f"Matavimas jau užregistruotas: {name}")
+        BENCHMARKS[name] = Benchmark(name, run, setup, max_bars, group)
+        return run
+    return decorator
+
+class BenchmarkContext:
+    """
+    Vieno dydžio ir sėklos matavimų duomenys. Brangūs paruošimo žingsniai
+    (duomenų generavimas, indikatoriai) atliekami vieną kartą ir naudojami visuose matavimuose.
+    """
+    def __init__(self, bars, seed=42):
+        """
+        Inicializuoja kontekstą.
+        
+        Args:
+            bars (int): Sintetinių duomenų žingsnių skaičius
+            seed (int): Atsitiktinumo sėkla
+        """
+        self.bars = bars
+        self.seed = seed
+        self._cache = {}
+    
+    def cached(self, key, factory):
+        """
+        Grąžina išsaugotą reikšmę arba ją sukuria.
+        
+        Args:
+            key (str): Reikšmės raktas
+            factory (callable): Funkcija be argumentų, sukurianti reikšmę
+        
+        Returns:
+            Išsaugota reikšmė
+        """
+        if key not in self._cache:
+            with quiet():
+                self._cache[key] = factory()
+        return self._cache[key]
+    
+    @property
+    def ohlcv(self):
+        """
+        pandas.DataFrame: Sintetiniai 15 min. OHLCV duomenys.
+        """
+        return self.cached('ohlcv', lambda: generate_ohlcv(self.bars, seed=self.seed))
+    
+    @property
+    def indicators(self):
+        """
+        pandas.DataFrame: OHLCV duomenys su techniniais indikatoriais (process_btc_data etapas).
+        """
+        from src.data.processor import calculate_technical_indicators
+        return self.cached('indicators', lambda: calculate_technical_indicators(self.ohlcv))
+    
+    @property
+    def features(self):
+        """
+        pandas.DataFrame: Indikatoriai su signalų, prognozių ir z_score stulpeliais (simuliatoriaus įvestis).
+        """
+        from simulator.utils.data_diagnostics import add_test_signals
+        return self.cached('features', lambda: add_z_score(add_test_signals(self.indicators)))
+    
+    def clear(self):
+        """
+        Atlaisvina išsaugotus duomenis.
+        """
+        self._cache.clear()
+
+def add_z_score(data, window=20):
+    """
+    Prideda slenkantį uždarymo kainos z_score stulpelį (MeanReversionStrategy įvestis).
+    
+    Args:
+        data (pandas.DataFrame): Duomenys su Close stulpeliu
+        window (int): Slenkančio lango dydis
+    
+    Returns:
+        pandas.DataFrame: Duomenys su z_score stulpeliu
+    """
+    rolling = data['Close'].rolling(window=window)
+    data['z_score'] = (data['Close'] - rolling.mean()) / rolling.std()
+    return data
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Nutildo print() išvestį ir žemesnius nei ERROR žurnalo įrašus matavimo metu.
+    """
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(previous)
+
+def run_benchmark(benchmark, context, repeat=3, warmup=0):
+    """
+    Įvykdo vieną matavimą.
+    
+    Args:
+        benchmark (Benchmark): Matavimas
+        context (BenchmarkContext): Duomenų kontekstas
+        repeat (int): Matuojamų pakartojimų skaičius
+        warmup (int): Nematuojamų įšilimo pakartojimų skaičius
+    
+    Returns:
+        dict: Matavimo rezultatas (status 'ok', 'skipped' arba 'error')
+    """
+    result = {'name': benchmark.name, 'group': benchmark.group, 'bars': context.bars, 'seed': context.seed}
+    
+    if benchmark.max_bars is not None and context.bars > benchmark.max_bars:
+        result.update(status='skipped', reason=f"bars > {benchmark.max_bars}")
+        return result
+    
+    timings = []
+    try:
+        for attempt in range(warmup + repeat):
+            argument = context
+            if benchmark.setup is not None:
+                with quiet():
+                    argument = benchmark.setup(context)
+            
+            gc.collect()
+            with quiet():
+                start = perf_counter()
+                benchmark.run(argument)
+                elapsed = perf_counter() - start
+            
+            if attempt >= warmup:
+                timings.append(elapsed)
+            del argument
+    except Exception as e:
+        logger.error(f"Matavimas {benchmark.name} nepavyko: {e}")
+        result.update(status='error', reason=f"{type(e).__name__}: {e}")
+        return result
+    
+    best = min(timings)
+    result.update(
+        status='ok',
+        repeat=repeat,
+        best_s=best,
+        mean_s=sum(timings) / len(timings),
+        timings_s=timings,
+        bars_per_s=context.bars / best if best > 0 else None
+    )
+    return result
+
+def select_benchmarks(patterns=None):
+    """
+    Atrenka matavimus pagal pavadinimo fragmentus.
+    
+    Args:
+        patterns (list, optional): Pavadinimo fragmentai (None - visi matavimai)
+    
+    Returns:
+        list: Benchmark objektai
+    """
+    if not patterns:
+        return list(BENCHMARKS.values())
+    return [benchmark for name, benchmark in BENCHMARKS.items() if any(pattern in name for pattern in patterns)]
+
+def run_suite(benchmarks, bars_list, seed=42, repeat=3, warmup=0):
+    """
+    Įvykdo matavimus su visais duomenų dydžiais.
+    
+    Args:
+        benchmarks (list): Benchmark objektai
+        bars_list (list): Duomenų dydžiai (žingsnių skaičiai)
+        seed (int): Atsitiktinumo sėkla
+        repeat (int): Matuojamų pakartojimų skaičius
+        warmup (int): Nematuojamų įšilimo pakartojimų skaičius
+    
+    Returns:
+        list: Matavimų rezultatai
+    """
+    results = []
+    for bars in bars_list:
+        context = BenchmarkContext(bars, seed)
+        for benchmark in benchmarks:
+            result = run_benchmark(benchmark, context, repeat, warmup)
+            results.append(result)
+            if result['status'] == 'ok':
+                logger.info(f"{benchmark.name} [{bars}]: {result['best_s']:.4f} s "
+                            f"({result['bars_per_s']:,.0f} žingsnių/s)")
+            else:
+                logger.info(f"{benchmark.name} [{bars}]: {result['status']} ({result['reason']})")
+        context.clear()
+    
+    return results
+
+def environment_info():
+    """
+    Surenka vykdymo aplinkos informaciją (versija, Python, platforma).
+    
+    Returns:
+        dict: Aplinkos informacija
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+def load_history(path=DEFAULT_HISTORY_PATH):
+    """
+    Įkelia matavimų istoriją.
+    
+    Args:
+        path (str): Istorijos failo kelias
+    
+    Returns:
+        list: Ankstesni paleidimai (seniausias pirmas)
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def append_history(results, path=DEFAULT_HISTORY_PATH, label=None):
+    """
+    Prideda paleidimo rezultatus į istoriją.
+    
+    Args:
+        results (list): run_suite() rezultatai
+        path (str): Istorijos failo kelias
+        label (str, optional): Paleidimo žymė (pvz. versijos numeris)
+    
+    Returns:
+        dict: Įrašytas paleidimas
+    """
+    history = load_history(path)
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'label': label,
+        'environment': environment_info(),
+        'results': results
+    }
+    history.append(entry)
+    
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Įrašome per laikiną failą, kad nutrūkęs įrašymas nesugadintų istorijos
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+    
+    return entry
+
+def compare_with_history(results, history, tolerance=0.2):
+    """
+    Palygina rezultatus su paskutiniu ankstesniu to paties matavimo (pavadinimas, dydis, sėkla) rezultatu.
+    
+    Args:
+        results (list): run_suite() rezultatai
+        history (list): load_history() rezultatas (be dabartinio paleidimo)
+        tolerance (float): Leidžiamas sulėtėjimas (0.2 = 20%)
+    
+    Returns:
+        list: Palyginimai - žodynai su name, bars, previous_s, current_s, ratio, regression
+    """
+    previous = {}
+    for entry in history:
+        for result in entry.get('results', []):
+            if result.get('status') == 'ok':
+                previous[(result['name'], result['bars'], result.get('seed'))] = result['best_s']
+    
+    comparisons = []
+    for result in results:
+        if result.get('status') != 'ok':
+            continue
+        baseline = previous.get((result['name'], result['bars'], result.get('seed')))
+        if baseline is None or baseline <= 0:
+            continue
+        
+        ratio = result['best_s'] / baseline
+        comparisons.append({
+            'name': result['name'],
+            'bars': result['bars'],
+            'previous_s': baseline,
+            'current_s': result['best_s'],
+            'ratio': ratio,
+            'regression': ratio > 1 + tolerance
+        })
+    
+    return comparisons
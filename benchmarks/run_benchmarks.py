@@ -0,0 +1,111 @@
+"""
+Našumo matavimų paleidimo skriptas
+-----------------------------
+Paleidžia našumo matavimus su sintetiniais duomenimis, įrašo rezultatus į
+JSON istoriją ir palygina juos su ankstesniu paleidimu.
+
+Pavyzdys:
+    python -m benchmarks.run_benchmarks --bars 10000 100000 --filter engine signals --label v1.2
+"""
+
+import argparse
+import logging
+import sys
+import pandas as pd
+from benchmarks.harness import (
+    DEFAULT_HISTORY_PATH,
+    select_benchmarks,
+    run_suite,
+    load_history,
+    append_history,
+    compare_with_history
+)
+
+# Matavimų moduliai registruoja savo matavimus importuojant
+import benchmarks.bench_processing  # noqa: F401
+import benchmarks.bench_signals  # noqa: F401
+import benchmarks.bench_engines  # noqa: F401
+import benchmarks.bench_database  # noqa: F401
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+def format_results(results):
+    """
+    Suformatuoja matavimų rezultatus lentele.
+    
+    Args:
+        results (list): run_suite() rezultatai
+    
+    Returns:
+        str: Lentelė
+    """
+    rows = [{
+        'name': result['name'],
+        'bars': result['bars'],
+        'status': result['status'],
+        'best_s': result.get('best_s'),
+        'mean_s': result.get('mean_s'),
+        'bars_per_s': result.get('bars_per_s')
+    } for result in results]
+    return pd.DataFrame(rows).to_string(index=False, float_format=lambda value: f"{value:.4f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simuliatoriaus ir duomenų apdorojimo našumo matavimai")
+    parser.add_argument('--bars', type=int, nargs='+', default=[10000],
+                        help="Sintetinių duomenų dydžiai (15 min. žvakių skaičius, pvz. 10000 1000000 10000000)")
+    parser.add_argument('--seed', type=int, default=42, help="Sintetinių duomenų sėkla")
+    parser.add_argument('--repeat', type=int, default=3, help="Matuojamų pakartojimų skaičius")
+    parser.add_argument('--warmup', type=int, default=0, help="Nematuojamų įšilimo pakartojimų skaičius")
+    parser.add_argument('--filter', type=str, nargs='*', default=None,
+                        help="Vykdyti tik matavimus, kurių pavadinime yra bent vienas fragmentas")
+    parser.add_argument('--history', type=str, default=DEFAULT_HISTORY_PATH, help="JSON istorijos failas")
+    parser.add_argument('--label', type=str, default=None, help="Paleidimo žymė (pvz. versija)")
+    parser.add_argument('--no-save', action='store_true', help="Neįrašyti rezultatų į istoriją")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Leidžiamas sulėtėjimas, palyginti su ankstesniu paleidimu (0.2 = 20%%)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Grąžinti klaidos kodą, jei kuris nors matavimas sulėtėjo daugiau nei leidžiama")
+    parser.add_argument('--list', action='store_true', help="Išvardyti matavimus ir baigti")
+    
+    args = parser.parse_args(argv)
+    
+    benchmarks = select_benchmarks(args.filter)
+    if args.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        return 0
+    if not benchmarks:
+        logger.error("Nerasta matavimų pagal nurodytus filtrus")
+        return 1
+    
+    history = load_history(args.history)
+    results = run_suite(benchmarks, args.bars, args.seed, args.repeat, args.warmup)
+    
+    print("\n--- Matavimų rezultatai ---")
+    print(format_results(results))
+    
+    comparisons = compare_with_history(results, history, args.tolerance)
+    regressions = [comparison for comparison in comparisons if comparison['regression']]
+    if comparisons:
+        print("\n--- Palyginimas su ankstesniu paleidimu ---")
+        print(pd.DataFrame(comparisons).to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+    for regression in regressions:
+        logger.warning(f"Sulėtėjimas: {regression['name']} [{regression['bars']}] "
+                       f"{regression['previous_s']:.4f} s -> {regression['current_s']:.4f} s "
+                       f"(x{regression['ratio']:.2f})")
+    
+    if not args.no_save:
+        append_history(results, args.history, args.label)
+        logger.info(f"Rezultatai įrašyti: {args.history}")
+    
+    if args.fail_on_regression and regressions:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ Simuliatoriaus paleidimo skriptas
 """
 
 import argparse
+import json
 import logging
 import pandas as pd
 from datetime import datetime
@@ -23,6 +24,10 @@ from simulator.signals.hybrid_signal_generator import HybridSignalGenerator
 from simulator.signals.simple_test_signal_generator import SimpleTestSignalGenerator  # Naujas generatorius
 from simulator.strategies.trend_following_strategy import TrendFollowingStrategy
 from simulator.strategies.mean_reversion_strategy import MeanReversionStrategy
+from simulator.optimization.parameter_sweep import ParameterSweep
+from simulator.optimization.pruning import DrawdownPruner, SuccessiveHalving
+from simulator.utils.log_config import configure_logging
+from simulator.utils.run_registry import DEFAULT_REGISTRY_PATH, RunRegistry
 
 # Konfigūruojame logerio formatą
 logging.basicConfig(
@@ -32,7 +37,7 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def run_simulation(data_file, initial_capital=10000, test_mode=False):
+def run_simulation(data_file, initial_capital=10000, test_mode=False, seed=None, registry=None):
     """
     Funkcija simuliacijos paleidimui su nurodytais parametrais.
     
@@ -40,6 +45,9 @@ def run_simulation(data_file, initial_capital=10000, test_mode=False):
         data_file (str): Duomenų failo kelias
         initial_capital (float): Pradinis kapitalas
         test_mode (bool): Ar naudoti testavimo režimą
+        seed (int, optional): Praslydimo atsitiktinumo sėkla (be jos pakartotinis paleidimas
+            registre nerandamas, nes rezultatai neatkartojami)
+        registry (RunRegistry, optional): Paleidimų registras rezultatams saugoti
     
     Returns:
         dict: Simuliacijos rezultatai
@@ -55,7 +63,7 @@ def run_simulation(data_file, initial_capital=10000, test_mode=False):
     df = pd.read_csv(data_file, index_col=0, parse_dates=True)
     
     # Inicializuojame simuliatorių
-    simulator = SimulatorEngine(db_session, initial_balance=initial_capital)
+    simulator = SimulatorEngine(db_session, initial_balance=initial_capital, seed=seed, registry=registry)
     
     # Įkeliame duomenis į simuliatorių
     simulator.load_data(df)
@@ -88,14 +96,19 @@ def run_simulation(data_file, initial_capital=10000, test_mode=False):
         risk_params={
             'stop_loss_percentage': 0.05,
             'take_profit_percentage': 0.1
-        }
+        },
+        save_results=registry is None
     )
     
     # Rodome rezultatus
     display_results(results)
     
-    # Išsaugome rezultatus
-    save_results(results)
+    # Išsaugome rezultatus (su registru jie jau įrašyti pagal paleidimo ID)
+    if registry is None:
+        save_results(results)
+    elif results.get('run_id'):
+        source = "paimti iš registro" if results.get('cached') else "įrašyti į registrą"
+        print(f"\nRezultatai {source}: {registry.root} (paleidimo ID {results['run_id']})")
     
     # Uždarome aplikaciją
     app.cleanup()
@@ -161,12 +174,80 @@ def save_results(results):
     if 'portfolio_history' in results and not results['portfolio_history'].empty:
         results['portfolio_history'].to_csv("data/simulation/portfolio_history.csv")
 
+def run_parameter_sweep(data_file, grid_file, initial_capital=10000, processes=None, seed=None, prune_drawdown=None,
+                        halving_eta=None, registry=None):
+    """
+    Vykdo parametrų tinklelio perrinkimą per visus procesoriaus branduolius.
+    
+    Args:
+        data_file (str): Duomenų failo kelias
+        grid_file (str): JSON failas su parametrų tinkleliu (parametras -> reikšmių sąrašas)
+        initial_capital (float): Pradinis kapitalas
+        processes (int, optional): Procesų skaičius
+        seed (int, optional): Atsitiktinumo sėkla atkartojamiems rezultatams
+        prune_drawdown (float, optional): Nutraukti simuliacijas, kurių kritimas viršija šią ribą
+        halving_eta (float, optional): Nuoseklaus skaidymo koeficientas (po kiekvienos pakopos tęsiama 1/eta konfigūracijų)
+        registry (RunRegistry, optional): Paleidimų registras - jau apskaičiuotos konfigūracijos nevykdomos iš naujo
+    
+    Returns:
+        pandas.DataFrame: Rezultatų lentelė
+    """
+    logger.info(f"Įkeliami duomenys iš failo: {data_file}")
+    df = pd.read_csv(data_file, index_col=0, parse_dates=True)
+    
+    with open(grid_file) as f:
+        param_grid = json.load(f)
+    
+    pruners = [DrawdownPruner(prune_drawdown)] if prune_drawdown else None
+    halving = SuccessiveHalving(eta=halving_eta) if halving_eta else None
+    
+    sweep = ParameterSweep(param_grid, initial_balance=initial_capital, processes=processes, seed=seed,
+                           pruners=pruners, halving=halving, registry=registry)
+    results_df = sweep.run(df)
+    
+    # Išsaugome rezultatų lentelę
+    os.makedirs("data/simulation", exist_ok=True)
+    results_df.to_csv("data/simulation/sweep_results.csv")
+    
+    print(f"\n--- Parametrų perrinkimo rezultatai ({len(results_df)} konfigūracijos) ---")
+    if 'total_return' in results_df.columns:
+        print(results_df.sort_values('total_return', ascending=False).head(10).to_string())
+    print("\nRezultatai išsaugoti: data/simulation/sweep_results.csv")
+    
+    return results_df
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Kriptovaliutų prekybos simuliatorius")
     parser.add_argument('--data', type=str, default="data/processed/btc_features.csv", help="Duomenų failo kelias")
     parser.add_argument('--capital', type=float, default=10000, help="Pradinis kapitalas")
     parser.add_argument('--test', action='store_true', help="Naudoti testavimo režimą su SimpleTestSignalGenerator")
+    parser.add_argument('--sweep', type=str, default=None, help="JSON failas su parametrų tinkleliu perrinkimui")
+    parser.add_argument('--processes', type=int, default=None, help="Procesų skaičius perrinkimui (numatyta - visi branduoliai)")
+    parser.add_argument('--seed', type=int, default=None, help="Atsitiktinumo sėkla atkartojamiems rezultatams")
+    parser.add_argument('--prune-drawdown', type=float, default=None,
+                        help="Perrinkime nutraukti simuliacijas, kurių kritimas viršija ribą (pvz. 0.3)")
+    parser.add_argument('--halving-eta', type=float, default=None,
+                        help="Perrinkimas nuosekliu skaidymu: po kiekvienos pakopos tęsiama 1/eta konfigūracijų")
+    parser.add_argument('--log-level', type=str, default="INFO", help="Simuliatoriaus žurnalo failo lygis")
+    parser.add_argument('--log-sample', type=int, default=None,
+                        help="Signalų ir strategijų žurnalo įrašų atranka: paliekamas kas N-tasis įrašas")
+    parser.add_argument('--runs-dir', type=str, default=DEFAULT_REGISTRY_PATH,
+                        help="Paleidimų registro katalogas (rezultatai saugomi pagal konfigūracijos ir duomenų maišą)")
+    parser.add_argument('--run-label', type=str, default=None, help="Registro įrašų žymė (pvz. eksperimento pavadinimas)")
+    parser.add_argument('--no-registry', action='store_true',
+                        help="Nenaudoti registro: rezultatai perrašomi data/simulation/ kataloge")
     
     args = parser.parse_args()
     
-    run_simulation(args.data, args.capital, args.test)
\ No newline at end of file
+    sampling = None
+    if args.log_sample:
+        sampling = {'simulator.signals': args.log_sample, 'simulator.strategies': args.log_sample}
+    configure_logging(level=getattr(logging, args.log_level.upper()), sampling=sampling)
+    
+    registry = None if args.no_registry else RunRegistry(args.runs_dir, label=args.run_label)
+    
+    if args.sweep:
+        run_parameter_sweep(args.data, args.sweep, args.capital, args.processes, args.seed, args.prune_drawdown,
+                            args.halving_eta, registry)
+    else:
+        run_simulation(args.data, args.capital, args.test, args.seed, registry)
\ No newline at end of file
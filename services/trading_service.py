@@ -8,6 +8,7 @@ valdo prekybos strategijas ir skaičiuoja portfelio rezultatus.
 import pandas as pd
 import numpy as np
 import logging
+import os
 from datetime import datetime, timedelta
 from database.unit_of_work import UnitOfWork
 from database.models import BtcPriceData, TechnicalIndicator, TradingSignal, Portfolio, Trade
@@ -382,6 +383,15 @@ class TradingService:
                     ml_signal = row.get('ML_Signal', 0)
                     combined_signal = row.get('Combined_Signal', 0)
                     
+                    # combined_signal stulpelis loginis (ar signalas kombinuotas), o kryptis - signal_type
+                    if combined_signal > 0:
+                        signal_type = 'buy'
+                    elif combined_signal < 0:
+                        signal_type = 'sell'
+                    else:
+                        signal_type = 'hold'
+                    signal_strength = min(abs(float(combined_signal)), 1.0)
+                    
                     # Gauname atitinkamą kainos įrašą pagal timestamp
                     timestamp = idx
                     price_data = self.uow.btc_prices.session.query(BtcPriceData).filter(
@@ -403,7 +413,10 @@ class TradingService:
                         existing_signal.macd_signal = macd_signal
                         existing_signal.bollinger_signal = bollinger_signal
                         existing_signal.ml_signal = ml_signal
-                        existing_signal.combined_signal = combined_signal
+                        existing_signal.signal_type = signal_type
+                        existing_signal.signal_strength = signal_strength
+                        existing_signal.indicator_source = 'Combined_Signal'
+                        existing_signal.combined_signal = True
                         existing_signal.price_id = price_data.id
                         existing_signal.update_time = datetime.now()
                     else:
@@ -416,7 +429,10 @@ class TradingService:
                             macd_signal=macd_signal,
                             bollinger_signal=bollinger_signal,
                             ml_signal=ml_signal,
-                            combined_signal=combined_signal,
+                            signal_type=signal_type,
+                            signal_strength=signal_strength,
+                            indicator_source='Combined_Signal',
+                            combined_signal=True,
                             create_time=datetime.now(),
                             update_time=datetime.now()
                         )
@@ -461,7 +477,7 @@ class TradingService:
             # Inicializuojame portfelio stulpelius
             signals_df['Position'] = 0  # 0 = nėra pozicijos, 1 = ilgoji pozicija
             signals_df['Portfolio_Value'] = 0.0
-            signals_df['Cash'] = initial_capital
+            signals_df['Cash'] = float(initial_capital)
             signals_df['BTC_Holdings'] = 0.0
             signals_df['Trade_Price'] = 0.0
             signals_df['Trade_Size'] = 0.0
@@ -0,0 +1,283 @@
+"""
+Monte Carlo robustiškumo analizės modulis
+-----------------------------
+Šis modulis įvertina simuliacijos rezultatų patikimumą: sandorių seka
+permaišoma, o žingsnių grąžos imamos blokiniu bootstrap metodu tūkstančius
+kartų. Visi keliai skaičiuojami kaip vienas 2-D NumPy masyvas.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 15 minučių žingsnių skaičius per metus (kriptovaliutų rinka veikia visą parą)
+PERIODS_PER_YEAR_15M = 365 * 24 * 4
+
+def path_statistics(returns, initial_balance, periods_per_year):
+    """
+    Apskaičiuoja kiekvieno kelio galutinę vertę, maksimalų kritimą ir Sharpe rodiklį.
+    
+    Args:
+        returns (numpy.ndarray): Grąžų matrica (keliai x žingsniai)
+        initial_balance (float): Pradinis balansas
+        periods_per_year (int): Žingsnių skaičius per metus Sharpe anualizavimui
+    
+    Returns:
+        dict: final_equity, max_drawdown ir sharpe_ratio masyvai
+    """
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.nan)
+    
+    # Skaičiuojame vietoje, kad neišskirtume papildomų didelių matricų
+    equity = np.add(returns, 1.0, out=returns)
+    np.cumprod(equity, axis=1, out=equity)
+    equity *= initial_balance
+    final_equity = equity[:, -1].copy()
+    
+    running_max = np.maximum.accumulate(equity, axis=1)
+    np.maximum(running_max, initial_balance, out=running_max)
+    np.divide(equity, running_max, out=equity)
+    max_drawdown = equity.min(axis=1) - 1.0
+    
+    return {
+        'final_equity': final_equity,
+        'max_drawdown': max_drawdown,
+        'sharpe_ratio': sharpe
+    }
+
+def _resample_indices(rng, n_returns, n_paths, block_size, replace):
+    """
+    Sugeneruoja perėmimo indeksų matricą.
+    
+    Args:
+        rng (numpy.random.Generator): Atsitiktinių skaičių generatorius
+        n_returns (int): Grąžų skaičius
+        n_paths (int): Kelių skaičius
+        block_size (int): Bloko ilgis (1 - paprastas bootstrap)
+        replace (bool): Ar imti su grąžinimu (False - tik permaišymas)
+    
+    Returns:
+        numpy.ndarray: Indeksų matrica (keliai x grąžos)
+    """
+    if not replace:
+        return rng.permuted(np.broadcast_to(np.arange(n_returns), (n_paths, n_returns)), axis=1)
+    
+    if block_size <= 1:
+        return rng.integers(0, n_returns, size=(n_paths, n_returns), dtype=np.int32)
+    
+    # Ciklinis blokinis bootstrap: indeksai rodo į grąžų masyvą, pratęstą block_size - 1 elementais,
+    # todėl blokai gali persisukti per duomenų pabaigą be modulio operacijos
+    n_blocks = -(-n_returns // block_size)
+    starts = rng.integers(0, n_returns, size=(n_paths, n_blocks), dtype=np.int32)
+    indices = np.repeat(starts, block_size, axis=1)[:, :n_returns]
+    indices += np.tile(np.arange(block_size, dtype=np.int32), n_blocks)[:n_returns]
+    return indices
+
+def _simulate_chunk(returns, n_paths, block_size, replace, seed, initial_balance, periods_per_year, chunk_size):
+    """
+    Sugeneruoja kelių paketą ir grąžina jų statistiką. Naudojama ir procesuose.
+    
+    Args:
+        returns (numpy.ndarray): Istorinės grąžos
+        n_paths (int): Kelių skaičius šiame pakete
+        block_size (int): Bloko ilgis
+        replace (bool): Ar imti su grąžinimu
+        seed (numpy.random.SeedSequence): Atsitiktinumo sėkla
+        initial_balance (float): Pradinis balansas
+        periods_per_year (int): Žingsnių skaičius per metus
+        chunk_size (int): Maksimalus kelių skaičius vienoje matricoje
+    
+    Returns:
+        dict: Statistikos masyvai
+    """
+    rng = np.random.default_rng(seed)
+    padded = np.concatenate([returns, returns[:max(block_size - 1, 0)]])
+    parts = []
+    
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        indices = _resample_indices(rng, len(returns), size, block_size, replace)
+        parts.append(path_statistics(padded[indices], initial_balance, periods_per_year))
+    
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+def trade_returns_from_results(results):
+    """
+    Išskaido portfelio vertės kreivę į sandorių segmentų grąžas.
+    Kiekvienas segmentas - laikotarpis tarp dviejų iš eilės einančių sandorių.
+    
+    Args:
+        results (dict): SimulatorEngine.run_simulation() rezultatai
+    
+    Returns:
+        numpy.ndarray: Segmentų grąžos
+    """
+    history = results.get('portfolio_history')
+    trades = results.get('trade_history') or []
+    
+    if history is None or history.empty or not trades:
+        return np.array([], dtype=np.float64)
+    
+    values = history['portfolio_value'].to_numpy(dtype=np.float64)
+    trade_times = pd.DatetimeIndex(sorted(pd.Timestamp(t['timestamp']) for t in trades if t.get('timestamp') is not None))
+    
+    # Segmentų ribos - pirmasis žingsnis kiekvieno sandorio metu arba po jo
+    boundaries = np.unique(np.concatenate([[0], history.index.searchsorted(trade_times), [len(values) - 1]]))
+    boundaries = boundaries[boundaries < len(values)]
+    
+    segment_values = values[boundaries]
+    return segment_values[1:] / segment_values[:-1] - 1.0
+
+class MonteCarloAnalyzer:
+    """
+    Monte Carlo / bootstrap robustiškumo analizė simuliacijos rezultatams.
+    """
+    def __init__(self, n_paths=10000, block_size=96, periods_per_year=PERIODS_PER_YEAR_15M,
+                 seed=None, processes=1, max_matrix_size=1_000_000):
+        """
+        Inicializuoja Monte Carlo analizę.
+        
+        Args:
+            n_paths (int): Sugeneruojamų kelių skaičius
+            block_size (int): Bloko ilgis žingsnių grąžų bootstrap metodui (96 = viena para 15m duomenims)
+            periods_per_year (int): Žingsnių skaičius per metus Sharpe anualizavimui
+            seed (int, optional): Atsitiktinumo sėkla atkartojamumui
+            processes (int): Procesų skaičius (1 - be procesų telkinio, None - visi branduoliai)
+            max_matrix_size (int): Maksimalus elementų skaičius vienoje kelių matricoje
+        """
+        self.n_paths = n_paths
+        self.block_size = block_size
+        self.periods_per_year = periods_per_year
+        self.seed = seed
+        self.processes = processes or os.cpu_count() or 1
+        self.max_matrix_size = max_matrix_size
+        
+        logger.info(f"Inicializuota Monte Carlo analizė: n_paths={n_paths}, block_size={block_size}, "
+                   f"processes={self.processes}")
+    
+    def _run(self, returns, block_size, replace, initial_balance, periods_per_year):
+        """
+        Paskirsto kelius paketais (ir, jei nurodyta, procesais) ir sujungia rezultatus.
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        returns = returns[np.isfinite(returns)]
+        
+        if len(returns) == 0:
+            logger.warning("Nėra grąžų Monte Carlo analizei")
+            return None
+        
+        chunk_size = max(1, self.max_matrix_size // len(returns))
+        n_workers = min(self.processes, -(-self.n_paths // chunk_size))
+        seeds = np.random.SeedSequence(self.seed).spawn(n_workers)
+        paths_per_worker = np.array_split(np.arange(self.n_paths), n_workers)
+        
+        args = [
+            (returns, len(paths), block_size, replace, seed, initial_balance, periods_per_year, chunk_size)
+            for paths, seed in zip(paths_per_worker, seeds)
+        ]
+        
+        if n_workers == 1:
+            parts = [_simulate_chunk(*args[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                parts = list(executor.map(_simulate_chunk, *zip(*args)))
+        
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    
+    def resample_trades(self, trade_returns, initial_balance=10000.0, replace=True):
+        """
+        Permaišo sandorių grąžų seką.
+        
+        Args:
+            trade_returns (array-like): Sandorių grąžos (dalis nuo kapitalo)
+            initial_balance (float): Pradinis balansas
+            replace (bool): Ar imti su grąžinimu (False - tik sekos permaišymas)
+        
+        Returns:
+            dict: final_equity, max_drawdown ir sharpe_ratio masyvai (po vieną reikšmę kelyje)
+        """
+        # Sandorių Sharpe neanualizuojamas - sandorių dažnis nežinomas
+        return self._run(trade_returns, 1, replace, initial_balance, 1)
+    
+    def block_bootstrap(self, bar_returns, initial_balance=10000.0):
+        """
+        Blokiniu bootstrap metodu perima žingsnių grąžas, išlaikydamas trumpalaikę autokoreliaciją.
+        
+        Args:
+            bar_returns (array-like): Žingsnių grąžos
+            initial_balance (float): Pradinis balansas
+        
+        Returns:
+            dict: final_equity, max_drawdown ir sharpe_ratio masyvai (po vieną reikšmę kelyje)
+        """
+        return self._run(bar_returns, self.block_size, True, initial_balance, self.periods_per_year)
+    
+    @staticmethod
+    def summarize(distribution, percentiles=(5, 25, 50, 75, 95)):
+        """
+        Apibendrina pasiskirstymus procentiliais.
+        
+        Args:
+            distribution (dict): resample_trades() arba block_bootstrap() rezultatas
+            percentiles (tuple): Procentiliai
+        
+        Returns:
+            pandas.DataFrame: Eilutės - metrikos, stulpeliai - vidurkis ir procentiliai
+        """
+        if distribution is None:
+            return pd.DataFrame()
+        
+        rows = {}
+        for key, values in distribution.items():
+            values = values[np.isfinite(values)]
+            row = {'mean': values.mean() if len(values) else np.nan}
+            row.update({f'p{p}': np.percentile(values, p) if len(values) else np.nan for p in percentiles})
+            rows[key] = row
+        
+        return pd.DataFrame(rows).T
+    
+    def analyze(self, results, initial_balance=10000.0):
+        """
+        Atlieka pilną robustiškumo analizę simuliacijos rezultatams.
+        
+        Args:
+            results (dict): SimulatorEngine.run_simulation() rezultatai
+            initial_balance (float): Pradinis balansas
+        
+        Returns:
+            dict: Rezultatai:
+                - trades: sandorių permaišymo pasiskirstymų suvestinė
+                - bars: žingsnių blokinio bootstrap pasiskirstymų suvestinė
+                - probability_of_loss: tikimybė baigti su nuostoliu (pagal bootstrap)
+                - distributions: pilni pasiskirstymų masyvai
+        """
+        history = results.get('portfolio_history')
+        bar_returns = np.array([], dtype=np.float64)
+        if history is not None and not history.empty:
+            values = history['portfolio_value'].to_numpy(dtype=np.float64)
+            bar_returns = values[1:] / values[:-1] - 1.0
+        
+        trade_distribution = self.resample_trades(trade_returns_from_results(results), initial_balance)
+        bar_distribution = self.block_bootstrap(bar_returns, initial_balance)
+        
+        probability_of_loss = np.nan
+        if bar_distribution is not None:
+            probability_of_loss = float(np.mean(bar_distribution['final_equity'] < initial_balance))
+        
+        logger.info(f"Monte Carlo analizė baigta: {self.n_paths} keliai, nuostolio tikimybė={probability_of_loss:.2%}")
+        
+        return {
+            'trades': self.summarize(trade_distribution),
+            'bars': self.summarize(bar_distribution),
+            'probability_of_loss': probability_of_loss,
+            'distributions': {
+                'trades': trade_distribution,
+                'bars': bar_distribution
+            }
+        }
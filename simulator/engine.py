@@ -11,12 +11,21 @@ from datetime import datetime, timedelta
 import logging
 import json
 import os
-from database.models import Portfolio, Trade
+import random
+import time
 from simulator.risk.risk_manager import RiskManager
 from simulator.risk.dynamic_risk_adjuster import DynamicRiskAdjuster
 from simulator.execution.order_executor import OrderExecutor
 from simulator.execution.trading_statistics import TradingStatistics
-from simulator.utils.data_diagnostics import check_required_columns, diagnose_data, add_test_signals
+from simulator.execution.portfolio_state import PortfolioState
+from simulator.execution.database_sink import DatabaseSink
+from simulator.execution.intrabar import FILL_POLICIES, scan_long_exit, scan_short_exit
+from simulator.execution.latency import LatencyQueue
+from simulator.execution.order_book import OrderBook
+from simulator.records import Order
+from simulator.utils.checkpoint import data_fingerprint, read_checkpoint, write_checkpoint
+from simulator.utils.data_diagnostics import check_required_columns, diagnose_data, add_test_signals, needs_test_signals
+from simulator.utils.run_registry import UncacheableConfig, data_hash
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +33,36 @@ class SimulatorEngine:
     """
     Pagrindinis simuliatoriaus variklis, kuris koordinuoja visus komponentus.
     """
-    def __init__(self, db_session, initial_balance=10000.0, portfolio_name="Simulator Portfolio"):
+    def __init__(self, db_session=None, initial_balance=10000.0, portfolio_name="Simulator Portfolio", sink=None,
+                 intrabar_policy="stop_first", seed=None, market_impact=None, latency=None, margin=None,
+                 profiler=None, registry=None):
         """
         Inicializuoja simuliatoriaus variklį.
         
         Args:
-            db_session: SQLAlchemy duomenų bazės sesija
+            db_session: SQLAlchemy duomenų bazės sesija (None - simuliacija vykdoma tik atmintyje)
             initial_balance (float): Pradinis balansas
             portfolio_name (str): Portfelio pavadinimas
+            sink (optional): Rezultatų saugykla su write(portfolio, journal) metodu
+                (numatyta - DatabaseSink, jei nurodyta db_session)
+            intrabar_policy (str): Stop-loss/take-profit vertinimas žingsnio viduje:
+                'stop_first' - pagal High/Low, kai pasiekiamos abi ribos, pirmas stop-loss;
+                'take_profit_first' - pagal High/Low, pirmas take-profit;
+                'close' - tik pagal uždarymo kainą
+            seed (int | numpy.random.SeedSequence, optional): Praslydimo ir (jei vėlinimo modeliui sėkla
+                nenurodyta) vėlinimo atsitiktinumo sėkla atkartojamumui
+            market_impact (MarketImpactModel, optional): Apimties ribos ir kainos poveikio modelis
+                (neįvykdyti užsakymų likučiai perkeliami į sekančius žingsnius)
+            latency (LatencyModel, optional): Užsakymų vėlinimo modelis (None - sprendimai vykdomi tame pačiame žingsnyje)
+            margin (MarginModel, optional): Maržinės prekybos modelis (trumposios pozicijos, svertas, likvidavimas,
+                finansavimo mokesčiai); None - tik ilgosios pozicijos be sverto
+            profiler (StepProfiler, optional): Žingsnio etapų laikmatis (None - profiliavimas išjungtas)
+            registry (RunRegistry, optional): Paleidimų registras - baigtos simuliacijos įrašomos į jį, o identiška
+                konfigūracija su tais pačiais duomenimis grąžinama iš registro nevykdant simuliacijos
         """
+        if intrabar_policy not in FILL_POLICIES:
+            raise ValueError(f"Nežinoma įvykdymo politika: {intrabar_policy}")
+        
         self.db_session = db_session
         self.initial_balance = initial_balance
         self.portfolio_name = portfolio_name
@@ -40,16 +70,37 @@ class SimulatorEngine:
         # Inicializuojame komponentus
         self.risk_manager = RiskManager()
         self.dynamic_risk_adjuster = DynamicRiskAdjuster()
-        self.order_executor = OrderExecutor(db_session)
-        self.trading_statistics = TradingStatistics()
+        self.order_executor = OrderExecutor(db_session, seed=seed, market_impact=market_impact)
+        self.trading_statistics = TradingStatistics(initial_balance)
         self.stats = self.trading_statistics
         
-        # Sukuriame arba gauname portfelį
-        self.portfolio = self._get_or_create_portfolio()
+        # Portfelis laikomas atmintyje, o į duomenų bazę įrašomas tik per saugyklą
+        self.portfolio = PortfolioState(name=portfolio_name, balance=initial_balance)
+        if sink is None and db_session is not None:
+            sink = DatabaseSink(db_session, portfolio_name)
+        self.sink = sink
         
         # Simuliacijos būsena
         self.current_time = None
+        self.current_index = 0
         self.data = None
+        self.intrabar_policy = intrabar_policy
+        
+        # Artimiausi pozicijų stop-loss/take-profit įvykiai: symbol -> (žingsnis, priežastis, kaina, aukščiausia kaina, stop-loss)
+        self._stop_events = {}
+        self._next_stop_index = None
+        self._pending_orders = {}  # symbol -> neįvykdytas užsakymo likutis
+        self.order_book = OrderBook()  # laukiantys limit/stop užsakymai
+        self.latency_model = latency
+        if latency is not None:
+            latency.seed_from(seed)
+        self.latency_queue = LatencyQueue()  # vėluojantys sprendimai
+        self.margin_model = margin
+        self._funding_settled = 0  # paskutinis žingsnis, už kurį sumokėti finansavimo mokesčiai
+        self.profiler = profiler
+        self.registry = registry
+        self._data_hash = None  # įkeltų duomenų maiša registro raktui (skaičiuojama vieną kartą)
+        self._run_components = None
         self.is_running = False
         self.active_positions = {}  # symbol -> position_info
         
@@ -57,44 +108,13 @@ class SimulatorEngine:
         self.results = {
             "trades": [],
             "portfolio_values": [],
-            "metrics": {}
+            "metrics": {},
+            "funding_paid": 0.0,
+            "liquidations": 0
         }
         
         logger.info(f"Inicializuotas simuliatoriaus variklis. Pradinis balansas: {initial_balance}")
     
-    def _get_or_create_portfolio(self):
-        """
-        Gauna arba sukuria portfelį duomenų bazėje.
-        
-        Returns:
-            Portfolio: Portfelio objektas
-        """
-        # Bandome rasti portfelį pagal pavadinimą
-        portfolio = self.db_session.query(Portfolio).filter_by(name=self.portfolio_name).first()
-        
-        # Jei nerastas, sukuriame naują
-        if not portfolio:
-            portfolio = Portfolio(
-                name=self.portfolio_name,
-                balance=self.initial_balance,
-                btc_amount=0.0,
-                description="Prekybos simuliatoriaus portfelis",
-                create_time=datetime.now(),
-                update_time=datetime.now()
-            )
-            self.db_session.add(portfolio)
-            self.db_session.commit()
-            logger.info(f"Sukurtas naujas portfelis: {self.portfolio_name}")
-        else:
-            # Atnaujiname portfelio būseną
-            portfolio.balance = self.initial_balance
-            portfolio.btc_amount = 0.0
-            portfolio.update_time = datetime.now()
-            self.db_session.commit()
-            logger.info(f"Atnaujintas esamas portfelis: {self.portfolio_name}")
-        
-        return portfolio
-    
     def load_data(self, data):
         """
         Įkelia duomenis į simuliatorių.
@@ -123,22 +143,44 @@ class SimulatorEngine:
         if not check_required_columns(data, required_columns):
             logger.warning("Trūksta kai kurių pagrindinių kainų stulpelių")
         
-        # PATOBULINIMAS: Tikriname, ar yra techniniai indikatoriai ir ML prognozės
-        has_indicators = any(col.endswith('_Signal') for col in data.columns)
-        has_predictions = 'predicted_direction' in data.columns and 'confidence' in data.columns
-        
-        # PATOBULINIMAS: Jei trūksta indikatorių ar prognozių, pridedame testinius
-        if not has_indicators or not has_predictions:
+        # PATOBULINIMAS: Jei trūksta techninių indikatorių ar ML prognozių, pridedame testinius
+        if needs_test_signals(data):
             logger.warning("Duomenyse trūksta techninių indikatorių arba ML prognozių")
             logger.info("Pridedami testiniai signalai ir prognozės simuliacijos testavimui")
             data = add_test_signals(data)
         
-        self.data = data.sort_index()
+        # Surikiuotų duomenų nekopijuojame (pvz. parametrų perrinkimo memmap duomenys lieka bendri)
+        self.data = data if data.index.is_monotonic_increasing else data.sort_index()
         self.current_time = self.data.index[0]
+        self._data_hash = None
+        
+        self._prepare_models()
+        
         logger.info(f"Įkelti duomenys nuo {self.data.index[0]} iki {self.data.index[-1]} ({len(self.data)} eilutės)")
         
         return True
     
+    def _prepare_models(self):
+        """
+        Paruošia kainų masyvus ir vykdymo modelius (rinkos poveikio, vėlinimo, maržos) įkeltiems duomenims.
+        """
+        # Kainų masyvai stop-loss/take-profit vertinimui (be High/Low - tik uždarymo kaina)
+        close = self.data['Close'].to_numpy(dtype=np.float64)
+        self._close = close
+        if self.intrabar_policy == 'close' or not {'Open', 'High', 'Low'}.issubset(self.data.columns):
+            self._open = self._high = self._low = close
+        else:
+            self._open = self.data['Open'].to_numpy(dtype=np.float64)
+            self._high = self.data['High'].to_numpy(dtype=np.float64)
+            self._low = self.data['Low'].to_numpy(dtype=np.float64)
+        
+        if self.order_executor.market_impact is not None:
+            self.order_executor.market_impact.prepare(self.data)
+        if self.latency_model is not None:
+            self.latency_model.prepare(self.data)
+        if self.margin_model is not None:
+            self.margin_model.prepare(self.data)
+    
     def add_strategy(self, strategy):
         """
         Prideda prekybos strategiją.
@@ -154,33 +196,45 @@ class SimulatorEngine:
         Atstato simuliatoriaus būseną į pradinę.
         """
         # Atstatome portfelio būseną
-        self.portfolio.balance = self.initial_balance
-        self.portfolio.btc_amount = 0.0
-        self.portfolio.update_time = datetime.now()
-        self.db_session.commit()
+        self.portfolio.reset(self.initial_balance)
+        
+        # Išvalome operacijų žurnalą (portfelio būsena įrašoma kartu su operacijomis simuliacijos pabaigoje)
+        self.order_executor.journal.clear()
         
         # Atstatome simuliacijos būseną
         self.current_time = self.data.index[0] if self.data is not None else None
         self.current_timestamp = self.current_time  # Užtikriname, kad yra abi laiko kintamųjų versijos
+        self.current_index = 0
         self.is_running = False
         self.active_positions = {}  # Išvalome aktyvias pozicijas
+        self._stop_events = {}
+        self._next_stop_index = None
+        self._pending_orders = {}
+        self.order_book = OrderBook()
+        self.latency_queue = LatencyQueue()
+        self._funding_settled = 0
         
         # Išvalome simuliacijos rezultatus
         self.results = {
             "trades": [],
             "portfolio_values": [],
-            "metrics": {}
+            "metrics": {},
+            "funding_paid": 0.0,
+            "liquidations": 0
         }
         
         # Išvalome prekybos istoriją
         self.trade_history = []
         
         # Atstatome prekybos statistiką
-        self.trading_statistics = TradingStatistics()
+        self.trading_statistics = TradingStatistics(self.initial_balance)
+        self.stats = self.trading_statistics
         
         logger.info("Simuliatoriaus būsena atstatyta į pradinę")
     
-    def run_simulation(self, generators=None, strategy_list=None, risk_params=None):
+    def run_simulation(self, generators=None, strategy_list=None, risk_params=None, save_results=True,
+                       persist_trades=True, event_driven=False, checkpoint_path=None, checkpoint_every=None,
+                       until=None, pruners=None, prune_every=1):
         """
         Vykdo pilną simuliaciją nuo pradžios iki pabaigos.
         
@@ -188,33 +242,241 @@ class SimulatorEngine:
             generators (list): SignalGenerator objektų sąrašas
             strategy_list (list): TradingStrategy objektų sąrašas
             risk_params (dict, optional): Rizikos parametrai
+            save_results (bool): Ar išsaugoti rezultatus į data/simulation/ katalogą
+                (nepriklausomai nuo paleidimų registro)
+            persist_trades (bool): Ar simuliacijos pabaigoje įrašyti portfelį ir operacijas į saugyklą
+            event_driven (bool): Ar praleisti žingsnius, kuriuose nei strategijos, nei stop-loss/take-profit
+                nieko nedarytų (jei kuris nors komponentas to nepalaiko, vykdomas kiekvienas žingsnis)
+            checkpoint_path (str, optional): Kontrolinio taško failas
+            checkpoint_every (int, optional): Kas kiek duomenų eilučių įrašyti kontrolinį tašką
+            until (int, optional): Žingsnis, prieš kurį simuliacija sustabdoma (rezultatų status 'paused');
+                simuliaciją galima tęsti resume_simulation() metodu
+            pruners (list, optional): Nutraukimo taisyklės - funkcijos (live_metrics() žodynas) -> priežastis arba None;
+                grąžinus priežastį, simuliacija nutraukiama (rezultatų status 'pruned')
+            prune_every (int): Kas kiek duomenų eilučių tikrinti nutraukimo taisykles
         
         Returns:
-            dict: Simuliacijos rezultatai
+            dict: Simuliacijos rezultatai; naudojant registrą - su 'run_id', o grąžinti iš registro -
+                su 'cached': True (žingsnių rezultatai registre nesaugomi, variklio būsena neatnaujinama)
         """
-        # Parengiame parametrus
-        signal_generators = generators or []
-        strategies = strategy_list or []
-        risk_parameters = risk_params or {}
-        
         if self.data is None or len(self.data) == 0:
             logger.error("Nėra įkeltų duomenų. Naudokite load_data() prieš vykdydami simuliaciją.")
             return {'error': 'No data loaded'}
         
+        # Registras naudojamas tik pilnoms simuliacijoms (sustabdytos ar nutraukiamos priklauso nuo taisyklių)
+        run_key = None
+        if self.registry is not None and until is None and not pruners:
+            # Raktas skaičiuojamas prieš simuliaciją - vėliau komponentų būsena pasikeičia
+            try:
+                run_key = self.registry.key(self.run_config(generators, strategy_list, risk_params, event_driven),
+                                            self.data, self.data_digest())
+            except UncacheableConfig as e:
+                logger.warning("Registras nenaudojamas: %s", e)
+            cached = self.registry.load(run_key['run_id']) if run_key is not None else None
+            if cached is not None:
+                logger.info("Simuliacijos rezultatai paimti iš registro: %s", run_key['run_id'])
+                return cached
+        
+        started = time.perf_counter()
+        self._start_run(generators, strategy_list, risk_params, event_driven)
+        
+        results = self._run_loop(save_results, persist_trades, checkpoint_path, checkpoint_every, until, pruners,
+                                 prune_every)
+        
+        if run_key is not None and results.get('status') == 'finished':
+            results['run_id'] = self.registry.save(run_key, results, self.data, time.perf_counter() - started)
+            logger.info("Simuliacija įrašyta į registrą: %s", results['run_id'])
+        
+        return results
+    
+    def data_digest(self):
+        """
+        Grąžina įkeltų duomenų turinio maišą (apskaičiuojama vieną kartą po load_data()).
+        
+        Returns:
+            str: Šešioliktainė maiša
+        """
+        if self._data_hash is None:
+            self._data_hash = data_hash(self.data)
+        return self._data_hash
+    
+    def run_config(self, generators=None, strategy_list=None, risk_params=None, event_driven=False):
+        """
+        Grąžina paleidimo konfigūraciją registro raktui: variklio nustatymus ir visus komponentus
+        (su jų būsena, įskaitant praslydimo ir vėlinimo atsitiktinumo generatorių būsenas).
+        Komponentai, naudojantys globalų random modulį (SimpleTestSignalGenerator), ar išoriniai objektai
+        registre nesaugomi - RunRegistry.key() tokiai konfigūracijai kelia UncacheableConfig.
+        
+        Args:
+            generators (list): SignalGenerator objektų sąrašas
+            strategy_list (list): TradingStrategy objektų sąrašas
+            risk_params (dict, optional): Rizikos parametrai
+            event_driven (bool): Ar praleisti žingsnius be galimų sprendimų
+        
+        Returns:
+            dict: Konfigūracija
+        """
+        executor = self.order_executor
+        return {
+            'engine': f"{type(self).__module__}.{type(self).__qualname__}",
+            'initial_balance': self.initial_balance,
+            'intrabar_policy': self.intrabar_policy,
+            'event_driven': event_driven,
+            'generators': generators or [],
+            'strategies': strategy_list or [],
+            'risk_params': risk_params or {},
+            'risk_manager': self.risk_manager,
+            'execution': {
+                'fee_model': executor.fee_model,
+                'fee_percentage': executor.fee_percentage,
+                'slippage_model': executor.slippage_model,
+                'slippage_range': executor.slippage_range,
+                'slippage_stream': executor.slippage_stream,
+                'market_impact': executor.market_impact
+            },
+            'latency': self.latency_model,
+            'margin': self.margin_model
+        }
+    
+    def _start_run(self, generators=None, strategy_list=None, risk_params=None, event_driven=False):
+        """
+        Atstato būseną ir paruošia naują simuliacijos paleidimą.
+        
+        Args:
+            generators (list): SignalGenerator objektų sąrašas
+            strategy_list (list): TradingStrategy objektų sąrašas
+            risk_params (dict, optional): Rizikos parametrai
+            event_driven (bool): Ar praleisti žingsnius be galimų sprendimų
+        """
         # Atstata simuliatoriaus būseną
         self.reset()
         
-        # Saugome portfelio vertės istoriją
-        portfolio_values = []
+        # Parengiame parametrus
+        self._run_components = {
+            'generators': generators or [],
+            'strategies': strategy_list or [],
+            'risk_params': risk_params or {},
+            'event_driven': event_driven
+        }
+        
+        # Saugome portfelio vertės istoriją (kiekvienam žingsniui, įskaitant praleistus)
+        self._portfolio_values = np.full(len(self.data), np.nan)
+        self._recorded_until = 1
+        self._step_results = []
+        self._step_count = 0
+        self._skipped_count = 0
         
-        # Vykdome žingsnius per visus duomenis
-        results = []
+        if self.profiler is not None:
+            self.profiler.reset()
         
         logger.info(f"Pradedama simuliacija su {len(self.data)} įrašais")
+    
+    def resume_simulation(self, checkpoint_path=None, generators=None, strategy_list=None, risk_params=None,
+                          save_results=True, persist_trades=True, event_driven=None, checkpoint_every=None,
+                          until=None, pruners=None, prune_every=1):
+        """
+        Tęsia simuliaciją iš kontrolinio taško. Nurodžius kitus komponentus ar parametrus,
+        simuliacija atšakojama: tęsiama nuo to paties taško su naujais nustatymais.
+        
+        Args:
+            checkpoint_path (str, optional): Kontrolinio taško failas (None - tęsiama nuo restore_checkpoint() būsenos)
+            generators (list, optional): SignalGenerator objektų sąrašas (None - iš kontrolinio taško)
+            strategy_list (list, optional): TradingStrategy objektų sąrašas (None - iš kontrolinio taško)
+            risk_params (dict, optional): Rizikos parametrai (None - iš kontrolinio taško)
+            save_results (bool): Ar išsaugoti rezultatus į data/simulation/ katalogą
+            persist_trades (bool): Ar simuliacijos pabaigoje įrašyti portfelį ir operacijas į saugyklą
+            event_driven (bool, optional): Ar praleisti žingsnius (None - kaip kontroliniame taške)
+            checkpoint_every (int, optional): Kas kiek duomenų eilučių toliau įrašyti kontrolinį tašką
+            until (int, optional): Žingsnis, prieš kurį simuliacija vėl sustabdoma
+            pruners (list, optional): Nutraukimo taisyklės (žr. run_simulation)
+            prune_every (int): Kas kiek duomenų eilučių tikrinti nutraukimo taisykles
+        
+        Returns:
+            dict: Simuliacijos rezultatai
+        """
+        if checkpoint_path is not None:
+            self.restore_checkpoint(checkpoint_path)
+        elif getattr(self, '_run_components', None) is None:
+            raise ValueError("Nėra atkurtos simuliacijos būsenos. Nurodykite checkpoint_path.")
+        
+        components = self._run_components
+        if generators is not None:
+            components['generators'] = generators
+        if strategy_list is not None:
+            components['strategies'] = strategy_list
+        if risk_params is not None:
+            components['risk_params'] = risk_params
+        if event_driven is not None:
+            components['event_driven'] = event_driven
+        
+        logger.info(f"Simuliacija tęsiama nuo {self.current_index}/{len(self.data)} žingsnio ({self.current_time})")
+        
+        return self._run_loop(save_results, persist_trades, checkpoint_path if checkpoint_every else None,
+                              checkpoint_every, until, pruners, prune_every)
+    
+    def _run_loop(self, save_results, persist_trades, checkpoint_path=None, checkpoint_every=None, until=None,
+                  pruners=None, prune_every=1):
+        """
+        Vykdo simuliacijos žingsnius nuo dabartinio žymeklio iki duomenų pabaigos, sustabdymo žingsnio
+        arba nutraukimo taisyklės suveikimo.
+        
+        Args:
+            save_results (bool): Ar išsaugoti rezultatus į data/simulation/ katalogą
+            persist_trades (bool): Ar simuliacijos pabaigoje įrašyti portfelį ir operacijas į saugyklą
+            checkpoint_path (str, optional): Kontrolinio taško failas
+            checkpoint_every (int, optional): Kas kiek duomenų eilučių įrašyti kontrolinį tašką
+            until (int, optional): Žingsnis, prieš kurį simuliacija sustabdoma
+            pruners (list, optional): Nutraukimo taisyklės
+            prune_every (int): Kas kiek duomenų eilučių tikrinti nutraukimo taisykles
+        
+        Returns:
+            dict: Simuliacijos rezultatai
+        """
+        signal_generators = self._run_components['generators']
+        strategies = self._run_components['strategies']
+        risk_parameters = self._run_components['risk_params']
+        
+        # Žingsniai, kuriuose strategijos gali priimti sprendimą (None - kiekvienas žingsnis)
+        wake_indices = None
+        if self._run_components['event_driven']:
+            wake_indices = self._plan_wakeups(signal_generators, strategies)
+        
+        next_checkpoint = None
+        if checkpoint_path and checkpoint_every:
+            next_checkpoint = self.current_index + checkpoint_every
+        
+        if until is not None and until >= len(self.data):
+            until = None
+        next_prune_check = self.current_index + prune_every if pruners else None
+        status = 'finished'
+        prune_reason = None
+        profiler = self.profiler
         
         # Vykdome simuliaciją per visus duomenis
-        step_count = 0
         while True:
+            if next_checkpoint is not None and self.current_index >= next_checkpoint:
+                self.save_checkpoint(checkpoint_path)
+                next_checkpoint = self.current_index + checkpoint_every
+            
+            if wake_indices is not None:
+                # Sekantis strategijų arba stop-loss/take-profit įvykis
+                target = self._next_wakeup(wake_indices)
+            else:
+                target = self.current_index + 1
+            
+            if until is not None and target >= until:
+                # Sustabdome prieš until žingsnį; praleisti žingsniai įvertinami, kad būsena būtų tęstina
+                self._skip_to(until, strategies)
+                status = 'paused'
+                break
+            
+            if wake_indices is not None:
+                if profiler is not None:
+                    profiler.start()
+                self._skip_to(target, strategies)
+                if profiler is not None:
+                    profiler.lap('skip')
+            
             step_result = self.step(signal_generators, strategies, risk_parameters)
             
             if step_result is None:
@@ -223,19 +485,100 @@ class SimulatorEngine:
             elif 'error' in step_result or step_result.get('status') == 'finished':
                 break
             
-            # Pridedame portfelio vertę į istoriją
-            portfolio_values.append({
-                'timestamp': self.current_timestamp,
-                'portfolio_value': step_result['portfolio_value']
-            })
+            self._record_step(step_result)
+            if profiler is not None:
+                profiler.lap('record')
             
-            results.append(step_result)
-            step_count += 1
+            if next_prune_check is not None and self.current_index >= next_prune_check:
+                prune_reason = self._check_pruners(pruners)
+                if prune_reason is not None:
+                    status = 'pruned'
+                    break
+                next_prune_check = self.current_index + prune_every
+        
+        # Sustabdyta simuliacija bus tęsiama, todėl rezultatai dar neįrašomi
+        paused = status == 'paused'
+        return self._finish_run(save_results and not paused, persist_trades and not paused, status, prune_reason)
+    
+    def _check_pruners(self, pruners):
+        """
+        Įvertina nutraukimo taisykles pagal einamąsias metrikas.
+        
+        Args:
+            pruners (list): Nutraukimo taisyklės
+        
+        Returns:
+            str: Pirmos suveikusios taisyklės priežastis arba None
+        """
+        metrics = self.live_metrics()
+        for pruner in pruners:
+            reason = pruner(metrics)
+            if reason:
+                logger.info(f"Simuliacija nutraukta {self.current_index}/{len(self.data)} žingsnyje: {reason}")
+                return reason
+        return None
+    
+    def _skip_to(self, target, strategies):
+        """
+        Praleidžia žingsnius iki target (neimtinai): portfelio vertė jiems apskaičiuojama vektoriškai,
+        o strategijoms perduodamas praleistų žingsnių skaičius.
+        
+        Args:
+            target (int): Sekantis vykdytinas žingsnis
+            strategies (list): TradingStrategy objektų sąrašas
+        """
+        skipped = target - self.current_index - 1
+        if skipped <= 0:
+            return
+        
+        start = self.current_index + 1
+        values = self._mark_to_market(start, target)
+        self._portfolio_values[start:target] = values
+        self.trading_statistics.update_equity_range(values, self.portfolio.btc_amount * self._close[start:target])
+        for strategy in strategies:
+            strategy.on_skip(skipped)
+        
+        self.current_index = target - 1
+        self.current_timestamp = self.current_time = self.data.index[target - 1]
+        self._recorded_until = target
+        self._skipped_count += skipped
+    
+    def _record_step(self, step_result):
+        """
+        Įrašo įvykdyto žingsnio rezultatą ir portfelio vertę.
+        
+        Args:
+            step_result (dict): step() rezultatas
+        """
+        self._portfolio_values[self.current_index] = step_result['portfolio_value']
+        self._recorded_until = self.current_index + 1
+        self.trading_statistics.update_equity(step_result['portfolio_value'],
+                                              self.portfolio.btc_amount * self._close[self.current_index])
+        
+        self._step_results.append(step_result)
+        self._step_count += 1
+    
+    def _finish_run(self, save_results, persist_trades, status='finished', prune_reason=None):
+        """
+        Užbaigia simuliaciją: apskaičiuoja metrikas, įrašo rezultatus ir grąžina jų žodyną.
+        
+        Args:
+            save_results (bool): Ar išsaugoti rezultatus į data/simulation/ katalogą
+            persist_trades (bool): Ar įrašyti portfelį ir operacijas į saugyklą
+            status (str): 'finished', 'paused' (sustabdyta ties until) arba 'pruned' (nutraukta taisyklės)
+            prune_reason (str, optional): Nutraukimo priežastis
+        
+        Returns:
+            dict: Simuliacijos rezultatai
+        """
+        portfolio_values = self._portfolio_values
         
         # Sukuriame portfelio vertės DataFrame
-        portfolio_df = pd.DataFrame(portfolio_values)
-        if not portfolio_df.empty:
-            portfolio_df.set_index('timestamp', inplace=True)
+        recorded_until = self._recorded_until
+        portfolio_df = pd.DataFrame(
+            {'portfolio_value': portfolio_values[1:recorded_until]},
+            index=self.data.index[1:recorded_until].rename('timestamp')
+        )
         
         # PATAISYMAS: Naudojame trading_statistics vietoj stats
         try:
@@ -244,19 +587,236 @@ class SimulatorEngine:
             logger.error("Nerastas trading_statistics atributas")
             self.performance_metrics = {}
         
-        # Išsaugome rezultatus į failą
-        self._save_simulation_results(results, self.performance_metrics)
+        profiler = self.profiler
         
-        logger.info(f"Simuliacija baigta. Įvykdyta {step_count} žingsnių, {len(self.trade_history)} sandorių.")
+        # Operacijas ir portfelio būseną įrašome į saugyklą vienu paketu
+        if persist_trades and self.sink is not None:
+            if profiler is not None:
+                profiler.start()
+            self.sink.write(self.portfolio, self.order_executor.journal)
+            if profiler is not None:
+                profiler.lap('persist')
+        
+        # Išsaugome rezultatus į failą (parametrų perrinkime kiekvienas procesas to nedaro)
+        if save_results:
+            if profiler is not None:
+                profiler.start()
+            self._save_simulation_results(self._step_results, self.performance_metrics)
+            if profiler is not None:
+                profiler.lap('save_results')
+        
+        if profiler is not None:
+            logger.info(f"Simuliacijos žingsnio profilis:\n{profiler.report()}")
+        
+        logger.info(f"Simuliacija baigta ({status}). Įvykdyta {self._step_count} žingsnių "
+                    f"(praleista {self._skipped_count}), {len(self.trade_history)} sandorių.")
         
         return {
-            'results': results,
+            'results': self._step_results,
             'portfolio_history': portfolio_df,
             'trade_history': self.trade_history,
-            'performance_metrics': self.performance_metrics
+            'performance_metrics': self.performance_metrics,
+            'online_metrics': self.live_metrics(),
+            'status': status,
+            'prune_reason': prune_reason,
+            'profile': profiler.summary() if profiler is not None else None
         }
     
-    def step(self, signal_generators, strategies, risk_parameters=None):
+    def live_metrics(self):
+        """
+        Grąžina einamąsias veiklos metrikas (galima kviesti simuliacijos metu, pvz. iš step() ciklo).
+        
+        Returns:
+            dict: Portfelio vertės kreivės ir sandorių metrikos iki dabartinio žingsnio
+        """
+        return self.trading_statistics.live_metrics()
+    
+    def save_checkpoint(self, path):
+        """
+        Įrašo visą simuliacijos būseną į kontrolinio taško failą: žymeklį, portfelį, pozicijas,
+        operacijų žurnalą, statistiką, rizikos valdymo ir strategijų būsenas bei atsitiktinių skaičių generatorių.
+        
+        Args:
+            path (str): Failo kelias
+        
+        Returns:
+            str: Failo kelias
+        """
+        state = {
+            'data_fingerprint': data_fingerprint(self.data, self.data_digest()),
+            'current_index': self.current_index,
+            'current_time': self.current_time,
+            'current_timestamp': self.current_timestamp,
+            'portfolio': self.portfolio,
+            'active_positions': self.active_positions,
+            'stop_events': self._stop_events,
+            'next_stop_index': self._next_stop_index,
+            'pending_orders': self._pending_orders,
+            'order_book': self.order_book,
+            'latency_queue': self.latency_queue,
+            'latency_model': self.latency_model,
+            'funding_settled': self._funding_settled,
+            'journal': self.order_executor.journal,
+            'slippage_stream': self.order_executor.slippage_stream,
+            'trade_history': self.trade_history,
+            'results': self.results,
+            'trading_statistics': self.trading_statistics,
+            'risk_manager': self.risk_manager,
+            'dynamic_risk_adjuster': self.dynamic_risk_adjuster,
+            'components': self._run_components,
+            'portfolio_values': self._portfolio_values[:self._recorded_until],
+            'step_results': self._step_results,
+            'step_count': self._step_count,
+            'skipped_count': self._skipped_count,
+            'random_state': (random.getstate(), np.random.get_state())
+        }
+        
+        logger.info(f"Įrašomas kontrolinis taškas ({self.current_index}/{len(self.data)} žingsnis): {path}")
+        return write_checkpoint(state, path)
+    
+    def restore_checkpoint(self, path):
+        """
+        Atkuria simuliacijos būseną iš kontrolinio taško. Duomenys turi būti įkelti per load_data().
+        
+        Args:
+            path (str): Failo kelias
+        
+        Returns:
+            dict: Kontroliniame taške įrašyti komponentai (generators, strategies, risk_params, event_driven)
+        """
+        if self.data is None:
+            raise ValueError("Nėra įkeltų duomenų. Naudokite load_data() prieš atkurdami kontrolinį tašką.")
+        
+        state = read_checkpoint(path)
+        if state['data_fingerprint'] != data_fingerprint(self.data, self.data_digest()):
+            raise ValueError("Kontrolinis taškas sukurtas kitiems duomenims")
+        
+        self.current_index = state['current_index']
+        self.current_time = state['current_time']
+        self.current_timestamp = state['current_timestamp']
+        self.portfolio = state['portfolio']
+        self.active_positions = state['active_positions']
+        self._stop_events = state['stop_events']
+        self._next_stop_index = state['next_stop_index']
+        self._pending_orders = state['pending_orders']
+        self.order_book = state['order_book']
+        self.latency_queue = state['latency_queue']
+        self.latency_model = state['latency_model']
+        self._funding_settled = state['funding_settled']
+        self.order_executor.journal = state['journal']
+        self.order_executor.slippage_stream = state['slippage_stream']
+        self.trade_history = state['trade_history']
+        self.results = state['results']
+        self.trading_statistics = state['trading_statistics']
+        self.stats = self.trading_statistics
+        self.risk_manager = state['risk_manager']
+        self.dynamic_risk_adjuster = state['dynamic_risk_adjuster']
+        self._run_components = state['components']
+        
+        recorded = state['portfolio_values']
+        self._portfolio_values = np.full(len(self.data), np.nan)
+        self._portfolio_values[:len(recorded)] = recorded
+        self._recorded_until = len(recorded)
+        self._step_results = state['step_results']
+        self._step_count = state['step_count']
+        self._skipped_count = state['skipped_count']
+        
+        python_state, numpy_state = state['random_state']
+        random.setstate(python_state)
+        np.random.set_state(numpy_state)
+        
+        logger.info(f"Atkurtas kontrolinis taškas ({self.current_index}/{len(self.data)} žingsnis): {path}")
+        return self._run_components
+    
+    def _plan_wakeups(self, signal_generators, strategies):
+        """
+        Iš anksto vektoriškai suranda žingsnius, kuriuose bent viena strategija gali priimti sprendimą.
+        
+        Args:
+            signal_generators (list): SignalGenerator objektų sąrašas
+            strategies (list): TradingStrategy objektų sąrašas
+        
+        Returns:
+            numpy.ndarray: Surikiuoti žingsnių indeksai arba None, jei žingsnių praleisti negalima
+        """
+        return self._wake_indices(strategies, self._signal_bound(signal_generators))
+    
+    def _signal_bound(self, signal_generators):
+        """
+        Apskaičiuoja didžiausią galimą signalų |value| ribą kiekvienam žingsniui (NaN signalas sprendimo nesukelia).
+        
+        Args:
+            signal_generators (list): SignalGenerator objektų sąrašas
+        
+        Returns:
+            numpy.ndarray: Ribos arba None, jei kuris nors generatorius jų neapskaičiuoja
+        """
+        signal_bound = np.zeros(len(self.data))
+        for generator in signal_generators:
+            generator_bound = generator.signal_bound(self.data)
+            if generator_bound is None:
+                return None
+            signal_bound = np.maximum(signal_bound, generator_bound)
+        
+        return signal_bound
+    
+    def _wake_indices(self, strategies, signal_bound):
+        """
+        Suranda žingsnius, kuriuose bent viena strategija gali priimti sprendimą.
+        
+        Args:
+            strategies (list): TradingStrategy objektų sąrašas
+            signal_bound (numpy.ndarray): Signalų |value| ribos (None - nežinomos)
+        
+        Returns:
+            numpy.ndarray: Surikiuoti žingsnių indeksai arba None, jei žingsnių praleisti negalima
+        """
+        n = len(self.data)
+        wake = np.zeros(n, dtype=bool)
+        for strategy in strategies:
+            mask = strategy.wake_mask(self.data, signal_bound)
+            if mask is None:
+                logger.info(f"Strategija {strategy.name} nepalaiko žingsnių praleidimo - vykdomas kiekvienas žingsnis")
+                return None
+            wake |= mask
+        
+        wake_indices = np.flatnonzero(wake)
+        logger.info(f"Įvykiais grindžiama simuliacija: {len(wake_indices)} iš {n} žingsnių su galimais sprendimais")
+        
+        return wake_indices
+    
+    def _next_wakeup(self, wake_indices):
+        """
+        Grąžina sekančio vykdytino žingsnio indeksą (strategijų arba pozicijų uždarymo įvykis).
+        
+        Args:
+            wake_indices (numpy.ndarray): Surikiuoti žingsnių su galimais sprendimais indeksai
+        
+        Returns:
+            int: Sekančio žingsnio indeksas (len(data) - įvykių nebėra)
+        """
+        start = self.current_index + 1
+        pos = np.searchsorted(wake_indices, start)
+        target = int(wake_indices[pos]) if pos < len(wake_indices) else len(self.data)
+        
+        if self._next_stop_index is not None:
+            target = min(target, self._next_stop_index)
+        
+        # Neįvykdyti likučiai vykdomi sekančiame žingsnyje
+        if self._pending_orders:
+            target = start
+        
+        # Laukiantys limit/stop užsakymai
+        if len(self.order_book):
+            target = min(target, self.order_book.next_event_index(start, self._high, self._low))
+        
+        # Vėluojantys sprendimai
+        if len(self.latency_queue):
+            target = min(target, self.latency_queue.next_index())
+        
+        return max(target, start)
+    
+    def step(self, signal_generators, strategies, risk_parameters=None, shared_bar=None):
         """
         Vykdo vieną simuliacijos žingsnį.
         
@@ -264,6 +824,8 @@ class SimulatorEngine:
             signal_generators (list): SignalGenerator objektų sąrašas
             strategies (list): TradingStrategy objektų sąrašas
             risk_parameters (dict, optional): Rizikos parametrai
+            shared_bar (tuple, optional): Jau apskaičiuoti sekančio žingsnio (duomenų eilutė, signalai),
+                bendri keliems vienu metu simuliuojamiems variantams (žr. MultiStrategyRunner)
         
         Returns:
             dict: Žingsnio rezultatai
@@ -282,57 +844,29 @@ class SimulatorEngine:
                 step_result['status'] = 'finished'
                 return step_result
             
-            # Užtikriname, kad current_time yra Timestamp tipo
-            if not isinstance(self.current_time, pd.Timestamp):
-                self.current_time = pd.Timestamp(self.current_time)
-            
-            # Tiesiogiai gauname sekančią laiko žymą be .tolist() konvertavimo
-            try:
-                # Randame visas laiko žymas po einamojo laiko
-                future_times = self.data.index[self.data.index > self.current_time]
-                
-                # Jei nėra laiko žymų po einamojo laiko, baigėme simuliaciją
-                if len(future_times) == 0:
-                    logger.info("Pasiekta duomenų pabaiga.")
-                    step_result['status'] = 'finished'
-                    return step_result
-                
-                # Gauname pirmą laiko žymą po einamojo laiko
-                self.current_timestamp = future_times[0]
-                self.current_time = self.current_timestamp  # Sinchronizuojame abu laiko kintamuosius
-                
-            except Exception as e:
-                logger.error(f"Klaida ieškant sekančios laiko žymos: {e}")
-                step_result['error'] = f'Error finding next timestamp: {e}'
+            # Pereiname prie sekančio žingsnio pagal indekso žymeklį
+            next_index = self.current_index + 1
+            if next_index >= len(self.data):
+                logger.info("Pasiekta duomenų pabaiga.")
                 step_result['status'] = 'finished'
                 return step_result
             
-            # Gauname dabartinius duomenis pagal laiko žymą
-            try:
-                current_data = self.data.loc[self.current_timestamp]
-            except KeyError:
-                logger.warning(f"Nėra duomenų laiko žymai {self.current_timestamp}")
-                step_result['error'] = f'No data for timestamp {self.current_timestamp}'
-                return step_result
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.start()
+            
+            self.current_index = next_index
+            self.current_timestamp = self.data.index[next_index]
+            self.current_time = self.current_timestamp  # Sinchronizuojame abu laiko kintamuosius
+            
+            if shared_bar is not None:
+                current_data, signals = shared_bar
+            else:
+                current_data, signals = self.bar_signals(signal_generators, next_index)
             
             # Pridedame laiko žymą ir kainą į rezultatą
             step_result['timestamp'] = self.current_timestamp
             step_result['btc_price'] = current_data.get('Close', 0)
-            
-            # Gauname istorinius duomenis
-            historical_data = self.data.loc[:self.current_timestamp].tail(100)  # Paskutinės 100 eilučių
-            
-            # Generuojame signalus
-            signals = []
-            for generator in signal_generators:
-                try:
-                    signal = generator.generate_signal(current_data, historical_data, self.current_timestamp)
-                    if signal:  # Pridedame tik jei signalas nėra None
-                        signals.append(signal)
-                except Exception as e:
-                    logger.error(f"Klaida generuojant signalą: {e}")
-                    # Nepridedame signal į sąrašą jei kyla klaida, bet tęsiame darbą
-            
             step_result['signals'] = signals
             
             # Generuojame prekybos sprendimus
@@ -345,16 +879,41 @@ class SimulatorEngine:
                 except Exception as e:
                     logger.error(f"Klaida generuojant prekybos sprendimą: {e}")
                     # Nepridedame decision į sąrašą jei kyla klaida, bet tęsiame darbą
+                if profiler is not None:
+                    profiler.lap(f"strategy.{strategy.name}")
             
             step_result['decisions'] = decisions
             
             try:
+                # Sumokame finansavimo mokesčius už laikytas pozicijas
+                self._settle_funding()
+                if profiler is not None:
+                    profiler.lap('funding')
+                
                 # Atnaujiname aktyvias pozicijas
                 self._update_active_positions(current_data)
+                if profiler is not None:
+                    profiler.lap('positions')
+                
+                # Vykdome ankstesniuose žingsniuose neįvykdytus likučius
+                self._execute_pending_orders(current_data)
+                
+                # Tikriname laukiančius limit/stop užsakymus
+                self._match_order_book(current_data)
+                
+                # Vykdome sprendimus, kurių vėlinimas baigėsi šiame žingsnyje
+                self._execute_due_orders(current_data)
+                if profiler is not None:
+                    profiler.lap('queued_orders')
                 
-                # Vykdome sprendimus
+                # Vykdome sprendimus (esant vėlinimui - įtraukiame į eilę)
                 for decision in decisions:
-                    self._execute_trade_decision(decision, current_data)
+                    if self.latency_model is not None:
+                        self.latency_queue.push(decision, self.latency_model.activation(self.current_index))
+                    else:
+                        self._execute_trade_decision(decision, current_data)
+                if profiler is not None:
+                    profiler.lap('execution')
                 
                 # Apskaičiuojame portfelio vertę
                 btc_price = current_data.get('Close', 0)
@@ -364,6 +923,8 @@ class SimulatorEngine:
                 step_result['portfolio_value'] = portfolio_value
                 step_result['balance'] = self.portfolio.balance
                 step_result['btc_amount'] = self.portfolio.btc_amount
+                if profiler is not None:
+                    profiler.lap('valuation')
             except Exception as e:
                 logger.error(f"Klaida vykdant simuliacijos žingsnį: {e}")
                 step_result['error'] = str(e)
@@ -374,46 +935,198 @@ class SimulatorEngine:
         
         return step_result
     
+    def bar_signals(self, signal_generators, index):
+        """
+        Sugeneruoja žingsnio signalus.
+        
+        Args:
+            signal_generators (list): SignalGenerator objektų sąrašas
+            index (int): Žingsnio indeksas
+        
+        Returns:
+            tuple: (žingsnio duomenų eilutė, signalų sąrašas)
+        """
+        profiler = self.profiler
+        
+        current_data = self.data.iloc[index]
+        timestamp = self.data.index[index]
+        
+        # Gauname istorinius duomenis
+        historical_data = self.data.iloc[max(0, index - 99):index + 1]  # Paskutinės 100 eilučių
+        if profiler is not None:
+            profiler.lap('bar_data')
+        
+        # Generuojame signalus
+        signals = []
+        for generator in signal_generators:
+            try:
+                signal = generator.generate_signal(current_data, historical_data, timestamp)
+                if signal:  # Pridedame tik jei signalas nėra None
+                    signals.append(signal)
+            except Exception as e:
+                logger.error(f"Klaida generuojant signalą: {e}")
+                # Nepridedame signal į sąrašą jei kyla klaida, bet tęsiame darbą
+            if profiler is not None:
+                profiler.lap(f"signal.{generator.name}")
+        
+        return current_data, signals
+    
+    def share_data(self, source):
+        """
+        Naudoja kito variklio jau įkeltus ir paruoštus duomenis (be pakartotinės diagnostikos ir kopijavimo).
+        
+        Args:
+            source (SimulatorEngine): Variklis su įkeltais duomenimis
+        
+        Returns:
+            bool: True, jei duomenys prijungti
+        """
+        if source.data is None:
+            logger.error("Šaltinio variklyje nėra įkeltų duomenų")
+            return False
+        
+        self.data = source.data
+        self.current_time = self.data.index[0]
+        self._data_hash = source._data_hash
+        
+        self._prepare_models()
+        
+        return True
+    
+    def _settle_funding(self):
+        """
+        Sumoka finansavimo mokesčius už grynąją poziciją nuo paskutinio apmokėto žingsnio iki dabartinio
+        (įskaitant įvykiais grindžiamoje simuliacijoje praleistus žingsnius).
+        """
+        i = self.current_index
+        if self.margin_model is not None and self.portfolio.btc_amount != 0:
+            payment = self.margin_model.funding(self.portfolio.btc_amount, self._funding_settled, i)
+            self.portfolio.balance -= payment
+            self.results["funding_paid"] += payment
+        self._funding_settled = i
+    
+    def _mark_to_market(self, start, end):
+        """
+        Vektoriškai apskaičiuoja portfelio vertę žingsniams [start, end), kuriuose sandorių nebuvo.
+        
+        Args:
+            start (int): Pirmas žingsnis
+            end (int): Žingsnis po paskutinio
+        
+        Returns:
+            numpy.ndarray: Portfelio vertės
+        """
+        btc_amount = self.portfolio.btc_amount
+        values = self.portfolio.balance + btc_amount * self._close[start:end]
+        
+        # Nesumokėti finansavimo mokesčiai mažina vertę
+        if self.margin_model is not None and btc_amount != 0:
+            funding_index = self.margin_model.funding_index
+            values -= btc_amount * (funding_index[start:end] - funding_index[self._funding_settled])
+        
+        return values
+    
     def _update_active_positions(self, current_data):
         """
-        Atnaujina aktyvias pozicijas, tikrina stop-loss ir take-profit sąlygas.
+        Tikrina aktyvių pozicijų stop-loss, take-profit ir slankiojo stop-loss sąlygas.
+        Pozicijos tikrinamos tik žingsniuose, kuriuos iš anksto surado vektorinė paieška;
+        pozicijos stop-loss ir aukščiausia kaina atnaujinamos šių įvykių metu.
         
         Args:
             current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
         """
-        if not self.active_positions:
+        if not self.active_positions or self._next_stop_index is None:
             return
         
-        positions_to_close = []
-        current_price = current_data["Close"]
-        
-        # Tikriname kiekvieną aktyvią poziciją
-        for symbol, position in self.active_positions.items():
-            # Tikriname, ar reikia atnaujinti trailing stop
-            if position["trailing_stop_enabled"] and position["position_type"] == "long":
-                # Ilgoji pozicija: jei kaina pakilo, atnaujiname trailing stop
-                if current_price > position["entry_price"] and current_price > position["highest_price"]:
-                    position["highest_price"] = current_price
-                    # Atnaujiname trailing stop kainą
-                    new_stop_loss = current_price * (1 - position["trailing_stop_percent"])
-                    if new_stop_loss > position["stop_loss"]:
-                        position["stop_loss"] = new_stop_loss
-                        logger.info(f"Atnaujintas trailing stop: {position['stop_loss']}")
-            
-            # Tikriname stop-loss sąlygą ilgajai pozicijai
-            if position["position_type"] == "long" and current_price <= position["stop_loss"]:
-                logger.info(f"Aktyvuotas stop-loss ({position['stop_loss']}) ilgajai pozicijai")
-                positions_to_close.append((symbol, "stop_loss", position["stop_loss"]))
-            
-            # Tikriname take-profit sąlygą ilgajai pozicijai
-            elif position["position_type"] == "long" and current_price >= position["take_profit"]:
-                logger.info(f"Aktyvuotas take-profit ({position['take_profit']}) ilgajai pozicijai")
-                positions_to_close.append((symbol, "take_profit", position["take_profit"]))
-        
-        # Uždarome pozicijas, kurios pasiekė stop-loss arba take-profit
-        for symbol, reason, price in positions_to_close:
+        i = self.current_index
+        if i < self._next_stop_index:
+            return
+        
+        # Apdorojame visų pozicijų įvykius šiame žingsnyje
+        for symbol in [s for s, event in self._stop_events.items() if event[0] == i]:
+            _, reason, price, highest_price, stop_loss = self._stop_events.pop(symbol)
             position = self.active_positions[symbol]
+            
+            if stop_loss != position.stop_loss:
+                logger.info("Atnaujintas trailing stop: %s", stop_loss)
+            position.highest_price = highest_price
+            position.stop_loss = stop_loss
+            
+            if reason is None:
+                # Paieškos langas baigėsi be įvykio - ieškome toliau nuo šio žingsnio
+                self._schedule_stop_scan(symbol, i)
+                continue
+            
+            logger.info("Aktyvuotas %s (%s) %s pozicijai", reason, price,
+                        'ilgajai' if position.position_type == 'long' else 'trumpajai')
+            
+            if reason == "liquidation":
+                # Likvidavimo mokestis išskaičiuojamas iš balanso
+                self.portfolio.balance -= self.margin_model.liquidation_fee * position.amount * price
+                self.results["liquidations"] += 1
+            
             self._close_position(symbol, price, reason)
+        
+        self._refresh_next_stop_index()
+    
+    def _schedule_stop_scan(self, symbol, start, window=256):
+        """
+        Vektoriškai suranda artimiausią žingsnį, kuriame pozicija pasiekia stop-loss, take-profit arba likvidavimo kainą.
+        Paieška vykdoma didėjančiais langais, kad ilgai laikomos pozicijos nebūtų skenuojamos iki duomenų pabaigos iš karto.
+        
+        Args:
+            symbol (str): Prekybos simbolis
+            start (int): Pirmas tikrinamas žingsnis
+            window (int): Pradinis paieškos lango ilgis
+        """
+        position = self.active_positions.get(symbol)
+        n = len(self.data)
+        if position is None or start >= n:
+            self._stop_events.pop(symbol, None)
+            self._refresh_next_stop_index()
+            return
+        
+        is_long = position.position_type == "long"
+        scan_exit = scan_long_exit if is_long else scan_short_exit
+        trailing = position.trailing_stop_percent if position.trailing_stop_enabled else None
+        end = min(n, start + window)
+        offset, reason, price, highest_price, stop_loss = scan_exit(
+            self._open[start:end], self._high[start:end], self._low[start:end],
+            position.entry_price, position.stop_loss, position.take_profit, position.highest_price,
+            trailing, self.intrabar_policy
+        )
+        
+        # Likvidavimo kaina tikrinama iki stop-loss/take-profit žingsnio imtinai
+        liquidation_price = position.liquidation_price
+        if liquidation_price is not None:
+            scan_end = start + offset + 1 if offset is not None else end
+            liquidation = self.margin_model.liquidation_offset(
+                position.position_type, liquidation_price, self._high[start:scan_end], self._low[start:scan_end])
+            
+            # Tame pačiame žingsnyje stop-loss suveikia pirmas, jei jis arčiau įėjimo kainos nei likvidavimo kaina
+            stop_first = reason == "stop_loss" and (stop_loss > liquidation_price if is_long
+                                                    else stop_loss < liquidation_price)
+            if liquidation is not None and (offset is None or liquidation < offset or not stop_first):
+                bar_open = self._open[start + liquidation]
+                offset = liquidation
+                reason = "liquidation"
+                price = min(bar_open, liquidation_price) if is_long else max(bar_open, liquidation_price)
+        
+        if offset is not None:
+            self._stop_events[symbol] = (start + offset, reason, price, highest_price, stop_loss)
+        elif end < n:
+            # Lange įvykio nėra: lango pabaigoje atnaujinsime pozicijos būseną ir ieškosime toliau
+            self._stop_events[symbol] = (end, None, None, highest_price, stop_loss)
+        else:
+            self._stop_events.pop(symbol, None)
+        
+        self._refresh_next_stop_index()
+    
+    def _refresh_next_stop_index(self):
+        """
+        Atnaujina artimiausio stop-loss/take-profit įvykio žingsnį.
+        """
+        self._next_stop_index = min((event[0] for event in self._stop_events.values()), default=None)
     
     def _close_position(self, symbol, price, reason):
         """
@@ -431,114 +1144,389 @@ class SimulatorEngine:
         position = self.active_positions[symbol]
         
         # Sukuriame prekybos operaciją
-        trade_decision = {
-            "action": "sell" if position["position_type"] == "long" else "buy",
-            "symbol": symbol,
-            "price": price,
-            "amount": position["amount"],
-            "reason": reason
-        }
+        trade_decision = Order(
+            action="sell" if position.position_type == "long" else "buy",
+            symbol=symbol,
+            price=price,
+            amount=position.amount,
+            reason=reason
+        )
         
         # Vykdome prekybos operaciją
         self._execute_trade_decision(trade_decision, None)
         
-        # Pašaliname poziciją iš aktyvių
-        del self.active_positions[symbol]
+        # Pašaliname poziciją iš aktyvių (jei jos nepašalino įvykdytas pardavimas ir nėra neįvykdyto likučio)
+        if symbol not in self._pending_orders:
+            self.active_positions.pop(symbol, None)
+    
+    def _match_order_book(self, current_data):
+        """
+        Įvykdo laukiančius limit/stop užsakymus, kurių kaina pasiekta žingsnio [Low, High] intervale.
+        
+        Args:
+            current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
+        """
+        if not len(self.order_book):
+            return
+        
+        i = self.current_index
+        for order, price in self.order_book.match(i, self._open[i], self._high[i], self._low[i]):
+            logger.info("Įvykdytas %s užsakymas: %s po %s", order.get('order_type'), order.get('action'), price)
+            self._execute_trade_decision(self._market_order(order, price, order.get("order_type")), current_data)
+    
+    def _execute_due_orders(self, current_data):
+        """
+        Vykdo sprendimus, kurių vėlinimas baigėsi šiame žingsnyje. Rinkos užsakymo kaina interpoliuojama
+        tarp žingsnio Open ir Close pagal aktyvavimo momento vietą žingsnyje; limit/stop užsakymai
+        tik tada patenka į užsakymų knygą.
+        
+        Args:
+            current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
+        """
+        if not len(self.latency_queue):
+            return
+        
+        i = self.current_index
+        open_price = self._open[i]
+        close_price = self._close[i]
+        for order, activation in self.latency_queue.pop_due(i):
+            if order.get("order_type", "market") != "market":
+                self._execute_trade_decision(order, current_data)
+                continue
+            
+            fraction = min(max(activation - i, 0.0), 1.0)
+            price = open_price + fraction * (close_price - open_price)
+            self._execute_trade_decision(self._market_order(order, price), current_data)
+    
+    def _market_order(self, order, price, reason=None):
+        """
+        Sukuria rinkos užsakymą, vykdomą nurodyta kaina, iš laukusio užsakymo. Limit ir stop-limit
+        užsakymų ribinė kaina perduodama toliau, kad praslydimas jos neperžengtų.
+        
+        Args:
+            order (Order): Laukęs užsakymas
+            price (float): Įvykdymo kaina
+            reason (str, optional): Priežastis, jei užsakyme ji nenurodyta
+        
+        Returns:
+            Order: Rinkos užsakymas
+        """
+        return Order(
+            action=order.get("action"),
+            amount=order.get("amount"),
+            price=price,
+            timestamp=self.current_time,
+            strategy=order.get("strategy"),
+            symbol=order.get("symbol"),
+            reason=order.get("reason", reason),
+            signal_value=order.get("signal_value"),
+            limit_price=order.get("limit_price") if order.get("order_type") in ("limit", "stop_limit") else None
+        )
+    
+    def _execute_pending_orders(self, current_data):
+        """
+        Vykdo ankstesniuose žingsniuose dėl likvidumo ribos neįvykdytus užsakymų likučius dabartine kaina.
+        
+        Args:
+            current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
+        """
+        if not self._pending_orders:
+            return
+        
+        pending = self._pending_orders
+        self._pending_orders = {}
+        
+        for symbol, order in pending.items():
+            position = self.active_positions.get(symbol)
+            
+            # Atidarymo likutis papildo jau atidarytą poziciją (jei ji dar neuždaryta)
+            if position is None:
+                if order.action == "buy" or self.margin_model is not None:
+                    continue
+            elif (order.action == "buy") == (position.position_type == "long"):
+                self._add_to_position(symbol, position, order, current_data)
+                continue
+            
+            # Uždarymo likutis
+            self._execute_trade_decision(order, current_data)
+    
+    def _add_to_position(self, symbol, position, order, current_data):
+        """
+        Papildo poziciją neįvykdytu atidarymo užsakymo likučiu.
+        
+        Args:
+            symbol (str): Prekybos simbolis
+            position (Position): Atidaryta pozicija
+            order (Order): Atidarymo užsakymo likutis
+            current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
+        """
+        fill = self.order_executor.execute_order(
+            self.portfolio,
+            order.action,
+            order.amount,
+            current_data["Close"],
+            self.current_time,
+            stop_loss=position.stop_loss,
+            take_profit=position.take_profit,
+            bar_index=self.current_index,
+            margin=self.margin_model is not None
+        )
+        
+        if fill.get("status") == "success":
+            self._record_trade(fill, order)
+            position.amount += fill.amount
+            if position.position_type == "long":
+                position.entry_cost += fill.value + fill.fees
+            else:
+                position.entry_cost += fill.value - fill.fees
+            if position.margin is not None:
+                position.margin += fill.value / position.leverage
+            if fill.remaining > 0:
+                self._pending_orders[symbol] = Order(action=order.action, symbol=symbol, amount=fill.remaining,
+                                                     reason="partial_fill")
     
     def _execute_trade_decision(self, decision, current_data):
         """
-        Vykdo prekybos sprendimą.
+        Vykdo prekybos sprendimą. Pirkimas uždaro trumpąją poziciją arba atidaro ilgąją; pardavimas uždaro
+        ilgąją poziciją arba (naudojant maržos modelį) atidaro trumpąją.
         
         Args:
-            decision (dict): Prekybos sprendimo informacija
+            decision (Order): Prekybos sprendimas
             current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
         """
         action = decision["action"]
         symbol = decision.get("symbol", "BTC")
+        
+        # Limit/stop užsakymai laukia knygoje ir vykdomi, kai pasiekiama jų kaina
+        if decision.get("order_type", "market") != "market":
+            try:
+                self.order_book.submit(decision, self.current_index)
+            except ValueError as e:
+                logger.error(f"Neteisingas užsakymas: {e}")
+            return
+        
         price = decision.get("price", current_data["Close"] if current_data is not None else None)
         
         if price is None:
             logger.error("Nenurodyta prekybos kaina ir nėra dabartinių duomenų")
             return
         
+        position = self.active_positions.get(symbol)
+        is_short = position is not None and position.position_type == "short"
+        
         if action == "buy":
-            # Skaičiuojame pozicijos dydį
-            amount_to_spend = self.portfolio.balance * self.risk_manager.risk_per_trade
-            amount_to_spend = min(amount_to_spend, self.portfolio.balance * 0.95)  # Neišleidžiame daugiau nei 95% balanso
-            
-            # Skaičiuojame stop-loss ir take-profit
-            stop_loss, take_profit = self.risk_manager.calculate_stop_loss_take_profit(
-                price, "long", current_data.get("ATR_14", None)
-            )
-            
-            # Skaičiuojame BTC kiekį
-            btc_amount = amount_to_spend / price
-            
-            # Vykdome pirkimo operaciją
-            trade_result = self.order_executor.execute_order(
-                self.portfolio.id,
-                "buy",
-                btc_amount,
-                price,
-                self.current_time
-            )
-            
-            if trade_result:
-                # Atnaujiname portfelio būseną
-                self.portfolio = trade_result["portfolio"]
-                
-                # Pridedame operaciją į rezultatus
-                self.results["trades"].append(trade_result["trade_info"])
-                
-                # Sukuriame naują aktyvią poziciją
-                self.active_positions[symbol] = {
-                    "position_type": "long",
-                    "entry_price": price,
-                    "amount": btc_amount,
-                    "stop_loss": stop_loss,
-                    "take_profit": take_profit,
-                    "entry_time": self.current_time,
-                    "highest_price": price,
-                    "trailing_stop_enabled": True,
-                    "trailing_stop_percent": 0.02  # 2% nuo aukščiausios kainos
-                }
-                
-                logger.info(f"Atidaryta ilgoji pozicija: {btc_amount} BTC po {price} (stop-loss: {stop_loss}, take-profit: {take_profit})")
+            if is_short:
+                self._exit_position(symbol, position, price, decision)
+            else:
+                self._open_position(symbol, "long", price, decision, current_data)
         
         elif action == "sell":
-            # Jei turime aktyvią poziciją, uždarome ją
-            if symbol in self.active_positions:
-                position = self.active_positions[symbol]
-                btc_amount = position["amount"]
+            if is_short:
+                logger.warning("Trumpoji pozicija jau atidaryta")
+            elif position is None and self.margin_model is not None and self.margin_model.allow_short:
+                self._open_position(symbol, "short", price, decision, current_data)
+            else:
+                self._exit_position(symbol, position, price, decision)
+    
+    def _free_margin(self, price):
+        """
+        Apskaičiuoja laisvą maržą: portfelio vertė atėmus atidarytoms pozicijoms skirtą pradinę maržą.
+        
+        Args:
+            price (float): Dabartinė kaina
+        
+        Returns:
+            float: Laisva marža
+        """
+        used_margin = sum(position.margin for position in self.active_positions.values() if position.margin is not None)
+        return self.portfolio.balance + self.portfolio.btc_amount * price - used_margin
+    
+    def _open_position(self, symbol, position_type, price, decision, current_data):
+        """
+        Atidaro ilgąją arba trumpąją poziciją.
+        
+        Args:
+            symbol (str): Prekybos simbolis
+            position_type (str): 'long' arba 'short'
+            price (float): Įėjimo kaina
+            decision (Order): Prekybos sprendimas
+            current_data (pandas.Series): Dabartinė kainų ir indikatorių eilutė
+        """
+        margin_model = self.margin_model
+        is_long = position_type == "long"
+        action = "buy" if is_long else "sell"
+        
+        # Skaičiuojame pozicijos dydį (su marža - pagal laisvą maržą ir svertą)
+        capital = self.portfolio.balance if margin_model is None else self._free_margin(price)
+        amount_to_spend = capital * self.risk_manager.risk_per_trade
+        amount_to_spend = min(amount_to_spend, capital * 0.95)  # Neišleidžiame daugiau nei 95% balanso
+        if margin_model is not None and amount_to_spend <= 0:
+            logger.warning(f"Nepakanka maržos: laisva marža ${capital:.2f}")
+            return
+        
+        leverage = margin_model.leverage if margin_model is not None else 1.0
+        
+        # Skaičiuojame BTC kiekį
+        btc_amount = amount_to_spend * leverage / price
+        
+        # Pozicija su stop-loss ir take-profit kainomis
+        atr = current_data.get("ATR_14", None) if current_data is not None else None
+        position = self.risk_manager.create_position(price, btc_amount, self.current_time,
+                                                     position_type=position_type, atr=atr)
+        
+        # Vykdome atidarymo operaciją
+        fill = self.order_executor.execute_order(
+            self.portfolio,
+            action,
+            btc_amount,
+            price,
+            self.current_time,
+            stop_loss=position.stop_loss,
+            take_profit=position.take_profit,
+            bar_index=self.current_index,
+            margin=margin_model is not None,
+            limit_price=decision.get("limit_price")
+        )
+        
+        if fill.get("status") != "success":
+            return
+        
+        # Pridedame operaciją į rezultatus
+        self._record_trade(fill, decision)
+        
+        # Išsaugome naują aktyvią poziciją (stop-loss/take-profit tikrinami nuo sekančio žingsnio)
+        position.amount = fill.amount
+        position.entry_cost = fill.value + fill.fees if is_long else fill.value - fill.fees
+        if margin_model is not None:
+            position.leverage = leverage
+            position.margin = fill.value / leverage
+            position.liquidation_price = margin_model.liquidation_price(position_type, fill.execution_price)
+        self.active_positions[symbol] = position
+        self._schedule_stop_scan(symbol, self.current_index + 1)
+        
+        # Neįvykdytas likutis perkeliamas į sekantį žingsnį
+        if fill.remaining > 0:
+            self._pending_orders[symbol] = Order(action=action, symbol=symbol, amount=fill.remaining,
+                                                 reason="partial_fill")
+        
+        logger.info("Atidaryta %s pozicija: %s BTC po %s (stop-loss: %s, take-profit: %s, likvidavimo kaina: %s)",
+                    'ilgoji' if is_long else 'trumpoji', btc_amount, price, position.stop_loss, position.take_profit,
+                    position.liquidation_price)
+    
+    def _exit_position(self, symbol, position, price, decision):
+        """
+        Uždaro (arba dalinai uždaro) poziciją; be pozicijos parduodamas visas turimas BTC kiekis.
+        
+        Args:
+            symbol (str): Prekybos simbolis
+            position (Position): Aktyvi pozicija arba None
+            price (float): Uždarymo kaina
+            decision (Order): Prekybos sprendimas
+        """
+        is_short = position is not None and position.position_type == "short"
+        if is_short:
+            action = "buy"
+            btc_amount = position.amount
+        else:
+            action = "sell"
+            if position is not None:
+                btc_amount = min(position.amount, self.portfolio.btc_amount)
             else:
                 # Parduodame visą turimą BTC
                 btc_amount = self.portfolio.btc_amount
+        
+        if btc_amount <= 0:
+            logger.warning("Bandoma parduoti, bet nėra BTC")
+            return
+        
+        # Vykdome uždarymo operaciją
+        fill = self.order_executor.execute_order(
+            self.portfolio,
+            action,
+            btc_amount,
+            price,
+            self.current_time,
+            bar_index=self.current_index,
+            margin=self.margin_model is not None,
+            limit_price=decision.get("limit_price")
+        )
+        
+        if fill.get("status") != "success":
+            return
+        
+        # Pridedame operaciją į rezultatus
+        trade_info = self._record_trade(fill, decision)
+        
+        # Jei buvo aktyvi pozicija, užfiksuojame užbaigto sandorio rezultatą ir pašaliname ją
+        if position is not None:
+            fraction = fill.amount / position.amount
+            entry_cost = position.entry_cost * fraction
+            if is_short:
+                trade_info["profit"] = entry_cost - fill.value - fill.fees
+            else:
+                trade_info["profit"] = fill.value - fill.fees - entry_cost
             
-            if btc_amount <= 0:
-                logger.warning("Bandoma parduoti, bet nėra BTC")
-                return
-            
-            # Vykdome pardavimo operaciją
-            trade_result = self.order_executor.execute_order(
-                self.portfolio.id,
-                "sell",
-                btc_amount,
-                price,
-                self.current_time
-            )
+            self.trading_statistics.add_trade({
+                "entry_time": position.entry_time,
+                "exit_time": self.current_time,
+                "position_type": position.position_type,
+                "entry_price": position.entry_price,
+                "exit_price": fill.execution_price,
+                "amount": fill.amount,
+                "profit_loss": trade_info["profit"],
+                "fees": fill.fees,
+                "slippage": fill.slippage,
+                "exit_reason": decision.get("reason", "signal")
+            })
             
-            if trade_result:
-                # Atnaujiname portfelio būseną
-                self.portfolio = trade_result["portfolio"]
-                
-                # Pridedame operaciją į rezultatus
-                self.results["trades"].append(trade_result["trade_info"])
-                
-                # Jei buvo aktyvi pozicija, pašaliname ją
-                if symbol in self.active_positions:
-                    del self.active_positions[symbol]
-                
-                logger.info(f"Parduota: {btc_amount} BTC po {price}")
+            if fill.remaining > 0:
+                # Dalinis uždarymas: likusi pozicijos dalis uždaroma sekančiame žingsnyje
+                position.entry_cost -= entry_cost
+                position.amount -= fill.amount
+                if position.margin is not None:
+                    position.margin *= 1 - fraction
+            else:
+                del self.active_positions[symbol]
+            self._stop_events.pop(symbol, None)
+            self._refresh_next_stop_index()
+        
+        if fill.remaining > 0:
+            self._pending_orders[symbol] = Order(action=action, symbol=symbol, amount=fill.remaining,
+                                                 reason=decision.get("reason", "partial_fill"))
+        
+        if is_short:
+            logger.info("Uždaryta trumpoji pozicija: %s BTC po %s", fill.amount, price)
+        else:
+            logger.info("Parduota: %s BTC po %s", fill.amount, price)
+    
+    def _record_trade(self, fill, decision):
+        """
+        Įrašo įvykdytą operaciją į simuliacijos rezultatus ir prekybos istoriją.
+        
+        Args:
+            fill (Fill): OrderExecutor.execute_order() rezultatas
+            decision (Order): Prekybos sprendimas
+        
+        Returns:
+            dict: Operacijos informacija
+        """
+        trade_info = {
+            "timestamp": self.current_time,
+            "action": fill.action,
+            "amount": fill.amount,
+            "price": fill.execution_price,
+            "value": fill.value,
+            "fees": fill.fees,
+            "slippage": fill.slippage,
+            "trade_id": fill.trade_id,
+            "reason": decision.get("reason")
+        }
+        
+        self.results["trades"].append(trade_info)
+        self.trade_history.append(trade_info)
+        self.trading_statistics.record_fill(fill.value)
+        
+        return trade_info
     
     def _calculate_performance_metrics(self):
         """
@@ -9,6 +9,8 @@ class Portfolio:
     """
     Virtualaus prekybos portfelio klasė.
     """
+    __slots__ = ('initial_balance', 'balance', 'btc_amount', 'btc_value', 'total_value')
+    
     def __init__(self, initial_balance=10000.0):
         """
         Inicializuoja portfelį.
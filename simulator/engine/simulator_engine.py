@@ -11,6 +11,8 @@ import logging
 from datetime import datetime, timedelta
 import os
 from simulator.engine.portfolio import Portfolio
+from simulator.utils.event_recorder import EventRecorder
+from simulator.utils.log_config import configure_logging
 
 # Sukuriame logerį
 logger = logging.getLogger(__name__)
@@ -49,13 +51,20 @@ class SimulatorEngine:
         self.current_time = self.data.index[0]
         self.commission_rate = commission_rate
         
+        # Laiko žymos ir kainos masyvuose, kad žingsnyje nereikėtų kurti pandas eilučių
+        self._times = np.asarray(self.data.index, dtype='datetime64[ns]')
+        self._close = self.data['Close'].to_numpy(dtype=np.float64)
+        
         # Sukuriame portfelį
         self.portfolio = Portfolio(initial_balance=initial_balance)
         
         # Sukuriame įrašų (logs) direktoriją
         self._setup_logging_directory()
         
-        # Įvykių žurnalas
+        # Portfelio būsenų ir operacijų žurnalas (iš anksto išskirti masyvai)
+        self.recorder = EventRecorder(len(self.data))
+        
+        # Kitų įvykių žurnalas
         self.events_log = []
         
         logger.info(f"Simuliatoriaus variklis inicializuotas. Pradinis balansas: {initial_balance}, "
@@ -63,19 +72,10 @@ class SimulatorEngine:
     
     def _setup_logging_directory(self):
         """
-        Sukuria simuliacijos įrašų (logs) direktoriją.
+        Prijungia simuliacijos įrašų (logs) failą. Failo tvarkytuvas vienas procesui,
+        todėl kuriant daug variklių (pvz. parametrų perrinkime) tvarkytuvai nesikaupia.
         """
-        log_dir = "logs/simulator"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
-        # Sukuriame failo tvarkytuvą simuliatoriaus įrašams
-        handler = logging.FileHandler(f"{log_dir}/simulator_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        
-        # Pridedame tvarkytuvą prie šio klasės logerio
-        class_logger = logging.getLogger(__name__)
-        class_logger.addHandler(handler)
+        self.log_path = configure_logging(log_dir="logs/simulator")
     
     def step(self):
         """
@@ -107,13 +107,14 @@ class SimulatorEngine:
         self.portfolio.update_btc_value(current_price)
         
         # Įrašome portfelio vertę į įvykių žurnalą
-        self.log_event("portfolio_update", {
-            "time": self.current_time,
-            "balance": self.portfolio.balance,
-            "btc_amount": self.portfolio.btc_amount,
-            "btc_value": self.portfolio.btc_value,
-            "total_value": self.portfolio.total_value
-        })
+        self.recorder.record_bar(
+            self._times[self.current_index],
+            self.portfolio.balance,
+            self.portfolio.btc_amount,
+            self.portfolio.btc_value,
+            self.portfolio.total_value,
+            current_price
+        )
     
     def reset(self):
         """
@@ -122,6 +123,7 @@ class SimulatorEngine:
         self.current_index = 0
         self.current_time = self.data.index[0]
         self.portfolio.reset()
+        self.recorder.reset()
         self.events_log = []
         
         logger.info("Simuliatorius atstatytas į pradinę būseną")
@@ -176,7 +178,7 @@ class SimulatorEngine:
         Returns:
             float: Dabartinė kaina
         """
-        return self.get_current_data()['Close']
+        return self._close[self.current_index]
     
     def execute_trade(self, decision):
         """
@@ -213,20 +215,19 @@ class SimulatorEngine:
             
             if success:
                 # Įrašome operaciją į įvykių žurnalą
-                self.log_event("trade", {
-                    "time": self.current_time,
-                    "action": "buy",
-                    "btc_amount": btc_amount,
-                    "price": price,
-                    "value": btc_amount * price,
-                    "commission": btc_amount * price * self.commission_rate,
-                    "balance_after": self.portfolio.balance,
-                    "btc_amount_after": self.portfolio.btc_amount,
-                    "total_value_after": self.portfolio.total_value
-                })
+                self.recorder.record_trade(
+                    self._times[self.current_index],
+                    "buy",
+                    btc_amount,
+                    price,
+                    btc_amount * price * self.commission_rate,
+                    self.portfolio.balance,
+                    self.portfolio.btc_amount,
+                    self.portfolio.total_value
+                )
                 
-                logger.info(f"Įvykdyta pirkimo operacija: {btc_amount} BTC po {price}, "
-                          f"vertė: {btc_amount * price}, komisiniai: {btc_amount * price * self.commission_rate}")
+                logger.info("Įvykdyta pirkimo operacija: %s BTC po %s, vertė: %s, komisiniai: %s",
+                            btc_amount, price, btc_amount * price, btc_amount * price * self.commission_rate)
                 
                 return True
             else:
@@ -245,20 +246,19 @@ class SimulatorEngine:
             
             if success:
                 # Įrašome operaciją į įvykių žurnalą
-                self.log_event("trade", {
-                    "time": self.current_time,
-                    "action": "sell",
-                    "btc_amount": btc_amount,
-                    "price": price,
-                    "value": btc_amount * price,
-                    "commission": btc_amount * price * self.commission_rate,
-                    "balance_after": self.portfolio.balance,
-                    "btc_amount_after": self.portfolio.btc_amount,
-                    "total_value_after": self.portfolio.total_value
-                })
+                self.recorder.record_trade(
+                    self._times[self.current_index],
+                    "sell",
+                    btc_amount,
+                    price,
+                    btc_amount * price * self.commission_rate,
+                    self.portfolio.balance,
+                    self.portfolio.btc_amount,
+                    self.portfolio.total_value
+                )
                 
-                logger.info(f"Įvykdyta pardavimo operacija: {btc_amount} BTC po {price}, "
-                          f"vertė: {btc_amount * price}, komisiniai: {btc_amount * price * self.commission_rate}")
+                logger.info("Įvykdyta pardavimo operacija: %s BTC po %s, vertė: %s, komisiniai: %s",
+                            btc_amount, price, btc_amount * price, btc_amount * price * self.commission_rate)
                 
                 return True
             else:
@@ -286,6 +286,15 @@ class SimulatorEngine:
         
         self.events_log.append(event)
     
+    def get_trades(self):
+        """
+        Grąžina įvykdytas prekybos operacijas.
+        
+        Returns:
+            pandas.DataFrame: Prekybos operacijų DataFrame
+        """
+        return self.recorder.trades_frame()
+    
     def get_results(self):
         """
         Grąžina simuliacijos rezultatus.
@@ -293,42 +302,11 @@ class SimulatorEngine:
         Returns:
             pandas.DataFrame: Simuliacijos rezultatų DataFrame
         """
-        # Filtruojame tik portfelio atnaujinimo įvykius
-        portfolio_events = [event for event in self.events_log if event["event_type"] == "portfolio_update"]
-        
-        # Konvertuojame į DataFrame
-        if not portfolio_events:
+        # Portfelio būsenos jau laikomos stulpeliuose - DataFrame kuriamas be kopijavimo
+        if self.recorder.bar_count == 0:
             return pd.DataFrame()
-            
-        results_data = []
-        for event in portfolio_events:
-            data = event["data"]
-            results_data.append({
-                "time": data["time"],
-                "balance": data["balance"],
-                "btc_amount": data["btc_amount"],
-                "btc_value": data["btc_value"],
-                "total_value": data["total_value"]
-            })
-        
-        results_df = pd.DataFrame(results_data)
-        
-        # Nustatome time kaip indeksą
-        if "time" in results_df.columns:
-            results_df.set_index("time", inplace=True)
-        
-        # Pridedame kainos duomenis
-        price_data = self.data[["Close"]].copy()
-        price_data.columns = ["price"]
-        
-        # Sujungiame duomenis
-        final_results = pd.merge(
-            results_df,
-            price_data,
-            left_index=True,
-            right_index=True,
-            how="left"
-        )
+        
+        final_results = self.recorder.bars_frame()
         
         # Apskaičiuojame pradinę ir galutinę portfelio vertę
         initial_value = final_results["total_value"].iloc[0]
@@ -0,0 +1,83 @@
+"""
+Simuliacijos rezultatų įrašymas į duomenų bazę
+-----------------------------
+Šis modulis realizuoja neprivalomą simuliacijos rezultatų saugyklą:
+portfelio būsena ir sukauptos prekybos operacijos į duomenų bazę
+įrašomos tik simuliacijos pabaigoje, viena transakcija.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DatabaseSink:
+    """
+    Įrašo simuliacijos portfelį ir prekybos operacijas į duomenų bazę.
+    """
+    def __init__(self, db_session, portfolio_name="Simulator Portfolio"):
+        """
+        Inicializuoja duomenų bazės saugyklą.
+        
+        Args:
+            db_session: SQLAlchemy duomenų bazės sesija
+            portfolio_name (str): Portfelio pavadinimas duomenų bazėje
+        """
+        self.db_session = db_session
+        self.portfolio_name = portfolio_name
+    
+    def _get_or_create_portfolio(self, state):
+        """
+        Gauna arba sukuria portfelio įrašą duomenų bazėje.
+        
+        Args:
+            state (PortfolioState): Simuliacijos portfelio būsena
+        
+        Returns:
+            Portfolio: Portfelio ORM objektas
+        """
+        from database.models import Portfolio
+        
+        # Bandome rasti portfelį pagal pavadinimą
+        portfolio = self.db_session.query(Portfolio).filter_by(name=self.portfolio_name).first()
+        
+        # Jei nerastas, sukuriame naują
+        if not portfolio:
+            portfolio = Portfolio(
+                name=self.portfolio_name,
+                description=state.description,
+                create_time=state.create_time
+            )
+            self.db_session.add(portfolio)
+            logger.info(f"Sukurtas naujas portfelis: {self.portfolio_name}")
+        
+        return portfolio
+    
+    def write(self, state, journal):
+        """
+        Įrašo portfelio būseną ir neįrašytas žurnalo operacijas.
+        
+        Args:
+            state (PortfolioState): Simuliacijos portfelio būsena
+            journal (TradeJournal): Prekybos operacijų žurnalas
+        
+        Returns:
+            int: Portfelio ID duomenų bazėje
+        """
+        portfolio = self._get_or_create_portfolio(state)
+        portfolio.balance = state.balance
+        portfolio.btc_amount = state.btc_amount
+        portfolio.update_time = state.update_time
+        
+        # Portfelio ID reikalingas operacijų įrašams
+        self.db_session.flush()
+        state.id = portfolio.id
+        
+        # Žurnalas įvykdo commit kartu su portfelio atnaujinimu
+        written = journal.flush(self.db_session, portfolio.id)
+        if written == 0:
+            self.db_session.commit()
+        
+        logger.info(f"Simuliacijos rezultatai įrašyti į duomenų bazę: portfelis {self.portfolio_name}, "
+                   f"{written} operacijos")
+        
+        return portfolio.id
@@ -0,0 +1,150 @@
+"""
+Stop-loss ir take-profit vertinimas žingsnio viduje
+-----------------------------
+Šis modulis vektoriškai vertina pozicijų stop-loss, take-profit ir slankiojo
+stop-loss sąlygas pagal žingsnių High/Low kainas ir randa pirmą žingsnį,
+kuriame pozicija bus uždaryta. Variklis iki to žingsnio pozicijų netikrina.
+"""
+
+import numpy as np
+
+# Įvykdymo politikos, kai tame pačiame žingsnyje pasiekiamos abi ribos
+FILL_POLICIES = ('stop_first', 'take_profit_first', 'close')
+
+def scan_long_exit(open_, high, low, entry_price, stop_loss, take_profit, highest_price,
+                   trailing_percent=None, policy='stop_first'):
+    """
+    Randa pirmą žingsnį, kuriame ilgoji pozicija pasiekia stop-loss arba take-profit.
+    Slankusis stop-loss atnaujinamas pagal žingsnio High ir galioja nuo sekančio žingsnio.
+    
+    Args:
+        open_ (numpy.ndarray): Žingsnių Open kainos
+        high (numpy.ndarray): Žingsnių High kainos
+        low (numpy.ndarray): Žingsnių Low kainos
+        entry_price (float): Įėjimo kaina
+        stop_loss (float): Stop-loss kaina lango pradžioje
+        take_profit (float): Take-profit kaina
+        highest_price (float): Aukščiausia kaina lango pradžioje
+        trailing_percent (float, optional): Slankiojo stop-loss atstumas (None - išjungtas)
+        policy (str): Įvykdymo politika ('stop_first', 'take_profit_first' arba 'close')
+    
+    Returns:
+        tuple: (poslinkis, priežastis, įvykdymo kaina, aukščiausia kaina, stop-loss kaina).
+            Jei lange sąlyga nepasiekta, poslinkis ir priežastis yra None, o kainos -
+            pozicijos būsena po paskutinio lango žingsnio.
+    """
+    n = len(high)
+    
+    if trailing_percent:
+        # Aukščiausia kaina atnaujinama tik žingsniais, kurių High viršija įėjimo kainą
+        candidate = np.where(high > entry_price, high, highest_price)
+        running_high = np.maximum.accumulate(np.maximum(candidate, highest_price))
+        trailed = np.maximum(stop_loss, running_high * (1 - trailing_percent))
+        after = np.where(running_high > highest_price, trailed, stop_loss)
+    else:
+        running_high = np.maximum.accumulate(np.maximum(high, highest_price))
+        after = np.full(n, stop_loss)
+    
+    # Žingsnyje galioja ankstesnio žingsnio pabaigos stop-loss kaina
+    levels = np.empty(n)
+    levels[0] = stop_loss
+    levels[1:] = after[:-1]
+    
+    hits = np.flatnonzero((low <= levels) | (high >= take_profit))
+    if len(hits) == 0:
+        return None, None, None, running_high[-1], after[-1]
+    
+    j = hits[0]
+    level = levels[j]
+    highest = running_high[j - 1] if j > 0 else highest_price
+    stop_hit = low[j] <= level
+    tp_hit = high[j] >= take_profit
+    
+    if policy == 'close':
+        # Vertinama tik uždarymo kaina (open_, high ir low yra Close), įvykdoma ribos kaina
+        reason = 'stop_loss' if stop_hit else 'take_profit'
+        return j, reason, level if stop_hit else take_profit, highest, level
+    
+    # Kainos tarpas žingsnio pradžioje nulemia, kuri riba pasiekiama pirmiausia
+    if stop_hit and tp_hit:
+        if open_[j] <= level:
+            tp_hit = False
+        elif open_[j] >= take_profit:
+            stop_hit = False
+        elif policy == 'take_profit_first':
+            stop_hit = False
+        else:
+            tp_hit = False
+    
+    if stop_hit:
+        return j, 'stop_loss', min(open_[j], level), highest, level
+    
+    return j, 'take_profit', max(open_[j], take_profit), highest, level
+
+def scan_short_exit(open_, high, low, entry_price, stop_loss, take_profit, lowest_price,
+                    trailing_percent=None, policy='stop_first'):
+    """
+    Randa pirmą žingsnį, kuriame trumpoji pozicija pasiekia stop-loss arba take-profit.
+    Slankusis stop-loss atnaujinamas pagal žingsnio Low ir galioja nuo sekančio žingsnio.
+    
+    Args:
+        open_ (numpy.ndarray): Žingsnių Open kainos
+        high (numpy.ndarray): Žingsnių High kainos
+        low (numpy.ndarray): Žingsnių Low kainos
+        entry_price (float): Įėjimo kaina
+        stop_loss (float): Stop-loss kaina lango pradžioje (virš įėjimo kainos)
+        take_profit (float): Take-profit kaina (žemiau įėjimo kainos)
+        lowest_price (float): Žemiausia kaina lango pradžioje
+        trailing_percent (float, optional): Slankiojo stop-loss atstumas (None - išjungtas)
+        policy (str): Įvykdymo politika ('stop_first', 'take_profit_first' arba 'close')
+    
+    Returns:
+        tuple: (poslinkis, priežastis, įvykdymo kaina, žemiausia kaina, stop-loss kaina).
+            Jei lange sąlyga nepasiekta, poslinkis ir priežastis yra None, o kainos -
+            pozicijos būsena po paskutinio lango žingsnio.
+    """
+    n = len(low)
+    
+    if trailing_percent:
+        # Žemiausia kaina atnaujinama tik žingsniais, kurių Low žemiau įėjimo kainos
+        candidate = np.where(low < entry_price, low, lowest_price)
+        running_low = np.minimum.accumulate(np.minimum(candidate, lowest_price))
+        trailed = np.minimum(stop_loss, running_low * (1 + trailing_percent))
+        after = np.where(running_low < lowest_price, trailed, stop_loss)
+    else:
+        running_low = np.minimum.accumulate(np.minimum(low, lowest_price))
+        after = np.full(n, stop_loss)
+    
+    # Žingsnyje galioja ankstesnio žingsnio pabaigos stop-loss kaina
+    levels = np.empty(n)
+    levels[0] = stop_loss
+    levels[1:] = after[:-1]
+    
+    hits = np.flatnonzero((high >= levels) | (low <= take_profit))
+    if len(hits) == 0:
+        return None, None, None, running_low[-1], after[-1]
+    
+    j = hits[0]
+    level = levels[j]
+    lowest = running_low[j - 1] if j > 0 else lowest_price
+    stop_hit = high[j] >= level
+    tp_hit = low[j] <= take_profit
+    
+    if policy == 'close':
+        reason = 'stop_loss' if stop_hit else 'take_profit'
+        return j, reason, level if stop_hit else take_profit, lowest, level
+    
+    if stop_hit and tp_hit:
+        if open_[j] >= level:
+            tp_hit = False
+        elif open_[j] <= take_profit:
+            stop_hit = False
+        elif policy == 'take_profit_first':
+            stop_hit = False
+        else:
+            tp_hit = False
+    
+    if stop_hit:
+        return j, 'stop_loss', max(open_[j], level), lowest, level
+    
+    return j, 'take_profit', min(open_[j], take_profit), lowest, level
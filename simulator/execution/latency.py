@@ -0,0 +1,142 @@
+"""
+Užsakymų vėlinimo modulis
+-----------------------------
+Šis modulis realizuoja užsakymų vėlinimo modelį ir eilę. Sprendimas,
+priimtas žingsnio pabaigoje, įvykdomas tik po nurodyto vėlinimo
+(žingsniais arba laiku), o eilė realizuota kaip prioritetinė eilė pagal
+aktyvavimo momentą.
+"""
+
+import heapq
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Vėlinimo atsitiktinumo srauto numeris, kai sėkla gaunama iš variklio sėklos
+LATENCY_SEED_STREAM = 0x6C6174
+
+class LatencyModel:
+    """
+    Užsakymų vėlinimo modelis. Vėlinimas matuojamas žingsniais (gali būti trupmeninis)
+    nuo sekančio žingsnio pradžios: 0 - sekančio žingsnio Open, 0.5 - sekančio žingsnio vidurys.
+    """
+    def __init__(self, delay_bars=0.0, delay=None, jitter_bars=0.0, seed=None):
+        """
+        Inicializuoja vėlinimo modelį.
+        
+        Args:
+            delay_bars (float): Vėlinimas žingsniais
+            delay (str | pandas.Timedelta, optional): Vėlinimas laiku (pvz. '90s'); jei nurodytas,
+                perskaičiuojamas į žingsnius pagal duomenų žingsnio ilgį
+            jitter_bars (float): Didžiausias atsitiktinis papildomas vėlinimas žingsniais
+            seed (int | numpy.random.SeedSequence, optional): Atsitiktinumo sėkla (None - naudojama
+                SimulatorEngine sėkla, jei ji nurodyta)
+        """
+        if delay_bars < 0 or jitter_bars < 0:
+            raise ValueError("Vėlinimas negali būti neigiamas")
+        
+        self.delay_bars = float(delay_bars)
+        self.delay = pd.Timedelta(delay) if delay is not None else None
+        self.jitter_bars = float(jitter_bars)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+    
+    def seed_from(self, seed):
+        """
+        Išveda atsitiktinumo generatorių iš variklio sėklos atskiru srautu, jei modeliui sėkla nenurodyta
+        (praslydimo srautas, naudojantis tą pačią sėklą, nepakinta).
+        
+        Args:
+            seed (int | numpy.random.SeedSequence, optional): Variklio sėkla
+        """
+        if self.seed is not None or seed is None:
+            return
+        
+        sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        spawn_key = tuple(sequence.spawn_key) + (LATENCY_SEED_STREAM,)
+        self.seed = np.random.SeedSequence(sequence.entropy, spawn_key=spawn_key)
+        self.rng = np.random.default_rng(self.seed)
+    
+    def prepare(self, data):
+        """
+        Perskaičiuoja vėlinimą laiku į žingsnius pagal duomenų žingsnio ilgį.
+        
+        Args:
+            data (pandas.DataFrame): Simuliacijos duomenys su DatetimeIndex
+        """
+        if self.delay is None or len(data) < 2:
+            return
+        
+        bar_length = pd.Series(data.index).diff().median()
+        self.delay_bars = self.delay / bar_length
+        
+        logger.info(f"Vėlinimas {self.delay} atitinka {self.delay_bars:.3f} žingsnio")
+    
+    def activation(self, index):
+        """
+        Apskaičiuoja užsakymo, priimto žingsnyje index, aktyvavimo momentą.
+        
+        Args:
+            index (int): Sprendimo žingsnis
+        
+        Returns:
+            float: Aktyvavimo momentas žingsniais (sveikoji dalis - žingsnis, trupmeninė - dalis žingsnio)
+        """
+        delay = self.delay_bars
+        if self.jitter_bars:
+            delay += self.jitter_bars * self.rng.random()
+        return index + 1 + delay
+
+class LatencyQueue:
+    """
+    Vėluojančių užsakymų prioritetinė eilė pagal aktyvavimo momentą.
+    """
+    def __init__(self):
+        """
+        Inicializuoja tuščią eilę.
+        """
+        self._heap = []
+        self._sequence = itertools.count()
+    
+    def __len__(self):
+        return len(self._heap)
+    
+    def push(self, order, activation):
+        """
+        Įtraukia užsakymą į eilę.
+        
+        Args:
+            order (Order): Užsakymas
+            activation (float): Aktyvavimo momentas žingsniais
+        """
+        heapq.heappush(self._heap, (activation, next(self._sequence), order))
+    
+    def pop_due(self, index):
+        """
+        Išima visus užsakymus, kurių aktyvavimo momentas patenka į žingsnį index arba ankstesnį.
+        
+        Args:
+            index (int): Dabartinis žingsnis
+        
+        Returns:
+            list: (Order, aktyvavimo momentas) porų sąrašas aktyvavimo tvarka
+        """
+        due = []
+        while self._heap and self._heap[0][0] < index + 1:
+            activation, _, order = heapq.heappop(self._heap)
+            due.append((order, activation))
+        return due
+    
+    def next_index(self):
+        """
+        Grąžina artimiausio aktyvavimo žingsnį.
+        
+        Returns:
+            int: Žingsnio indeksas arba None, jei eilė tuščia
+        """
+        if not self._heap:
+            return None
+        return int(self._heap[0][0])
@@ -0,0 +1,110 @@
+"""
+Rinkos poveikio modulis
+-----------------------------
+Šis modulis realizuoja nuo prekybos apimties priklausantį užsakymų vykdymo
+modelį: viename žingsnyje galima įvykdyti tik dalį žingsnio apimties
+(dalyvavimo riba), o kainos poveikis auga kaip kvadratinė šaknis iš
+užsakymo dydžio santykio su slenkančiu vidutiniu apimties dydžiu.
+Visi koeficientai apskaičiuojami iš anksto kiekvienam žingsniui.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class MarketImpactModel:
+    """
+    Dalyvavimo ribos ir kvadratinės šaknies kainos poveikio modelis.
+    """
+    def __init__(self, participation_rate=0.1, impact_coefficient=1.0, volume_window=20, atr_column='ATR_14',
+                 atr_window=14):
+        """
+        Inicializuoja rinkos poveikio modelį.
+        
+        Args:
+            participation_rate (float): Didžiausia žingsnio apimties dalis, kurią galima įvykdyti per vieną žingsnį
+            impact_coefficient (float): Kvadratinės šaknies poveikio koeficientas
+            volume_window (int): Slenkančio vidutinio apimties lango ilgis
+            atr_column (str): ATR stulpelio pavadinimas (jei jo nėra, ATR apskaičiuojamas iš High/Low)
+            atr_window (int): ATR lango ilgis, kai jis apskaičiuojamas
+        """
+        if participation_rate <= 0:
+            raise ValueError("participation_rate turi būti teigiamas")
+        
+        self.participation_rate = participation_rate
+        self.impact_coefficient = impact_coefficient
+        self.volume_window = volume_window
+        self.atr_column = atr_column
+        self.atr_window = atr_window
+        
+        # Žingsnių masyvai, apskaičiuojami prepare() metu
+        self.capacity = None
+        self.impact_scale = None
+    
+    def prepare(self, data):
+        """
+        Apskaičiuoja kiekvieno žingsnio dalyvavimo ribą ir poveikio mastelį.
+        
+        Args:
+            data (pandas.DataFrame): Simuliacijos duomenys (Close, Volume, pasirinktinai ATR arba High/Low)
+        """
+        n = len(data)
+        if 'Volume' not in data.columns:
+            logger.warning("Duomenyse nėra Volume stulpelio - rinkos poveikis netaikomas")
+            self.capacity = np.full(n, np.inf)
+            self.impact_scale = np.zeros(n)
+            return
+        
+        close = data['Close'].to_numpy(dtype=np.float64)
+        volume = data['Volume'].to_numpy(dtype=np.float64)
+        rolling_volume = pd.Series(volume).rolling(self.volume_window, min_periods=1).mean().to_numpy()
+        
+        if self.atr_column in data.columns:
+            atr = data[self.atr_column].to_numpy(dtype=np.float64)
+        elif {'High', 'Low'}.issubset(data.columns):
+            bar_range = (data['High'] - data['Low']).to_numpy(dtype=np.float64)
+            atr = pd.Series(bar_range).rolling(self.atr_window, min_periods=1).mean().to_numpy()
+        else:
+            atr = np.zeros(n)
+        
+        # Nežinoma apimtis neriboja vykdymo
+        self.capacity = np.where(np.isnan(volume), np.inf, self.participation_rate * np.maximum(volume, 0.0))
+        
+        # Poveikis = koeficientas * (ATR / kaina) * sqrt(kiekis / vidutinė apimtis)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = self.impact_coefficient * (atr / close) / np.sqrt(rolling_volume)
+        self.impact_scale = np.where(np.isfinite(scale), scale, 0.0)
+        
+        logger.info(f"Rinkos poveikio modelis paruoštas: participation_rate={self.participation_rate}, "
+                    f"impact_coefficient={self.impact_coefficient}, volume_window={self.volume_window}")
+    
+    def fill(self, index, amount):
+        """
+        Apskaičiuoja, kiek užsakymo įvykdoma žingsnyje ir koks kainos poveikis.
+        
+        Args:
+            index (int): Žingsnio indeksas
+            amount (float): Užsakymo kiekis
+        
+        Returns:
+            tuple: (įvykdytas kiekis, kainos poveikis dalimis)
+        """
+        filled = float(min(amount, self.capacity[index]))
+        return filled, float(self.impact_scale[index] * np.sqrt(filled))
+    
+    def fills(self, indices, amounts):
+        """
+        Vektoriškai apskaičiuoja užsakymų paketo įvykdytus kiekius ir kainos poveikį.
+        
+        Args:
+            indices (numpy.ndarray): Žingsnių indeksai
+            amounts (numpy.ndarray): Užsakymų kiekiai
+        
+        Returns:
+            tuple: (įvykdyti kiekiai, kainos poveikiai dalimis)
+        """
+        indices = np.asarray(indices)
+        filled = np.minimum(np.asarray(amounts, dtype=np.float64), self.capacity[indices])
+        return filled, self.impact_scale[indices] * np.sqrt(filled)
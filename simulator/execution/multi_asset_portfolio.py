@@ -0,0 +1,103 @@
+"""
+Kelių aktyvų portfelio modulis
+-----------------------------
+Šis modulis apibrėžia portfelį su bendru grynųjų pinigų balansu ir
+simboliais indeksuotu turimų kiekių vektoriumi. Portfelio vertė
+apskaičiuojama viena skaliarine sandauga, o perbalansavimas vykdomas
+vektoriškai visiems aktyvams iš karto.
+"""
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class MultiAssetPortfolio:
+    """
+    Kelių aktyvų portfelis (tik ilgos pozicijos).
+    """
+    def __init__(self, symbols, initial_balance=10000.0):
+        """
+        Inicializuoja portfelį.
+        
+        Args:
+            symbols (list): Aktyvų simboliai (kiekių vektoriaus tvarka)
+            initial_balance (float): Pradinis USD balansas
+        """
+        self.symbols = list(symbols)
+        self.initial_balance = initial_balance
+        self.cash = float(initial_balance)
+        self.holdings = np.zeros(len(self.symbols))
+    
+    def reset(self):
+        """
+        Atstato portfelį į pradinę būseną.
+        """
+        self.cash = float(self.initial_balance)
+        self.holdings = np.zeros(len(self.symbols))
+    
+    def value(self, prices):
+        """
+        Apskaičiuoja portfelio vertę.
+        
+        Args:
+            prices (numpy.ndarray): Aktyvų kainos (NaN - aktyvas dar neprekiaujamas)
+        
+        Returns:
+            float: Grynieji pinigai + turimų kiekių ir kainų sandauga
+        """
+        return self.cash + float(self.holdings @ np.nan_to_num(prices))
+    
+    def rebalance(self, target_weights, prices, fee_percentage=0.001, slippage=None, tolerance=0.0):
+        """
+        Perbalansuoja portfelį iki tikslinių svorių.
+        Pirmiausia vykdomi pardavimai, o pirkimai proporcingai sumažinami, jei grynųjų pinigų nepakanka.
+        
+        Args:
+            target_weights (numpy.ndarray): Tiksliniai aktyvų svoriai (portfelio vertės dalimis)
+            prices (numpy.ndarray): Aktyvų kainos
+            fee_percentage (float): Komisinis mokestis (0.001 = 0.1%)
+            slippage (numpy.ndarray, optional): Praslydimo dalys kiekvienam aktyvui (pridedamos pirkimams,
+                atimamos pardavimams)
+            tolerance (float): Mažiausias sandorio dydis portfelio vertės dalimis (mažesni pokyčiai ignoruojami)
+        
+        Returns:
+            tuple: (aktyvų indeksai, įvykdyti kiekiai su ženklu, įvykdymo kainos, mokesčiai)
+        """
+        tradable = np.isfinite(prices) & (prices > 0)
+        safe_prices = np.where(tradable, prices, 1.0)
+        equity = self.value(prices)
+        
+        target_holdings = np.where(tradable, np.asarray(target_weights) * equity / safe_prices, self.holdings)
+        delta = target_holdings - self.holdings
+        delta[np.abs(delta) * safe_prices <= tolerance * equity] = 0.0
+        
+        execution_prices = safe_prices.copy()
+        if slippage is not None:
+            execution_prices *= 1 + np.sign(delta) * slippage
+        
+        sells = delta < 0
+        buys = delta > 0
+        
+        # Pardavimai
+        proceeds = -delta[sells] @ execution_prices[sells]
+        self.cash += proceeds * (1 - fee_percentage)
+        
+        # Pirkimai (sumažinami, jei trūksta grynųjų pinigų)
+        cost = delta[buys] @ execution_prices[buys] * (1 + fee_percentage)
+        if cost > self.cash:
+            delta[buys] *= max(self.cash, 0.0) / cost
+            cost = max(self.cash, 0.0)
+        self.cash -= cost
+        
+        self.holdings += delta
+        
+        traded = np.flatnonzero(delta)
+        quantities = delta[traded]
+        fill_prices = execution_prices[traded]
+        fees = np.abs(quantities) * fill_prices * fee_percentage
+        
+        return traded, quantities, fill_prices, fees
+    
+    def __repr__(self):
+        return f"<MultiAssetPortfolio(symbols={len(self.symbols)}, cash={self.cash:.2f})>"
@@ -0,0 +1,222 @@
+"""
+Einamųjų veiklos metrikų modulis
+-----------------------------
+Šis modulis realizuoja portfelio vertės kreivės metrikų kaupiklį, kuris
+atnaujinamas kiekviename žingsnyje ir po kiekvieno sandorio: grąžų vidurkis
+ir dispersija skaičiuojami Welford'o metodu, o didžiausias kritimas, jo
+trukmė, pozicijos dalis ir apyvarta kaupiami einamuosiuose skaitikliuose.
+Metrikas galima gauti bet kuriuo simuliacijos metu per O(1) laiką, todėl
+jas gali naudoti stebėjimo skydeliai ir parametrų perrinkimo ankstyvasis stabdymas.
+"""
+
+import math
+import numpy as np
+
+class OnlineMetrics:
+    """
+    Portfelio vertės kreivės metrikų kaupiklis.
+    """
+    def __init__(self, initial_equity=None, periods_per_year=252):
+        """
+        Inicializuoja kaupiklį.
+        
+        Args:
+            initial_equity (float, optional): Pradinė portfelio vertė grąžai skaičiuoti
+                (None - pirmoji užfiksuota vertė)
+            periods_per_year (int): Žingsnių skaičius per metus Sharpe rodiklio anualizavimui
+        """
+        self.initial_equity = initial_equity
+        self.periods_per_year = periods_per_year
+        self.reset()
+    
+    def reset(self):
+        """
+        Išvalo sukauptas metrikas.
+        """
+        self.bars = 0
+        self.first_equity = None
+        self.equity = None
+        self.equity_sum = 0.0
+        
+        # Welford'o grąžų statistika
+        self.return_count = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+        
+        # Kritimai
+        self.peak = None
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.drawdown_duration = 0
+        self.max_drawdown_duration = 0
+        
+        # Pozicijos dalis ir apyvarta
+        self.exposure_sum = 0.0
+        self.bars_in_market = 0
+        self.traded_value = 0.0
+        self.fills = 0
+    
+    def update(self, equity, exposure=0.0):
+        """
+        Atnaujina metrikas vienu žingsniu.
+        
+        Args:
+            equity (float): Portfelio vertė žingsnio pabaigoje
+            exposure (float): Atidarytų pozicijų vertė (absoliuti)
+        """
+        equity = float(equity)
+        
+        if self.equity is not None and self.equity != 0:
+            ret = equity / self.equity - 1
+            self.return_count += 1
+            delta = ret - self.return_mean
+            self.return_mean += delta / self.return_count
+            self.return_m2 += delta * (ret - self.return_mean)
+        
+        if self.peak is None or equity >= self.peak:
+            self.peak = equity
+            self.drawdown_duration = 0
+        else:
+            self.drawdown_duration += 1
+            if self.drawdown_duration > self.max_drawdown_duration:
+                self.max_drawdown_duration = self.drawdown_duration
+        
+        self.drawdown = equity / self.peak - 1 if self.peak else 0.0
+        if self.drawdown < self.max_drawdown:
+            self.max_drawdown = self.drawdown
+        
+        self._add_exposure(equity, exposure)
+        
+        if self.first_equity is None:
+            self.first_equity = equity
+        self.equity = equity
+        self.equity_sum += equity
+        self.bars += 1
+    
+    def update_range(self, values, exposures=None):
+        """
+        Vektoriškai atnaujina metrikas keliais iš eilės einančiais žingsniais (pvz. praleistais
+        įvykiais grindžiamoje simuliacijoje). Grąžų statistika sujungiama Chan'o lygiagrečiu Welford'o metodu.
+        
+        Args:
+            values (numpy.ndarray): Portfelio vertės
+            exposures (numpy.ndarray, optional): Atidarytų pozicijų vertės (absoliučios)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        count = len(values)
+        if count == 0:
+            return
+        if count == 1:
+            self.update(values[0], 0.0 if exposures is None else exposures[0])
+            return
+        
+        # Grąžos (įskaitant perėjimą nuo paskutinės užfiksuotos vertės)
+        if self.equity is not None and self.equity != 0:
+            chain = np.concatenate(([self.equity], values))
+        else:
+            chain = values
+        returns = chain[1:] / chain[:-1] - 1
+        if len(returns):
+            batch_mean = returns.mean()
+            batch_m2 = float(((returns - batch_mean) ** 2).sum())
+            total = self.return_count + len(returns)
+            delta = batch_mean - self.return_mean
+            self.return_m2 += batch_m2 + delta * delta * self.return_count * len(returns) / total
+            self.return_mean += delta * len(returns) / total
+            self.return_count = total
+        
+        # Kritimai ir jų trukmė
+        initial_peak = values[0] if self.peak is None else max(self.peak, values[0])
+        peaks = np.maximum.accumulate(np.concatenate(([initial_peak], values[1:])))
+        drawdowns = values / peaks - 1
+        self.max_drawdown = min(self.max_drawdown, float(drawdowns.min()))
+        
+        positions = np.arange(count)
+        last_peak = np.maximum.accumulate(np.where(values >= peaks, positions, -1))
+        durations = np.where(last_peak >= 0, positions - last_peak, self.drawdown_duration + positions + 1)
+        self.max_drawdown_duration = max(self.max_drawdown_duration, int(durations.max()))
+        self.drawdown_duration = int(durations[-1])
+        self.drawdown = float(drawdowns[-1])
+        self.peak = float(peaks[-1])
+        
+        if exposures is not None:
+            exposures = np.abs(np.asarray(exposures, dtype=np.float64))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fractions = np.where(values > 0, exposures / values, 0.0)
+            self.exposure_sum += float(fractions.sum())
+            self.bars_in_market += int(np.count_nonzero(exposures))
+        
+        if self.first_equity is None:
+            self.first_equity = float(values[0])
+        self.equity = float(values[-1])
+        self.equity_sum += float(values.sum())
+        self.bars += count
+    
+    def _add_exposure(self, equity, exposure):
+        exposure = abs(float(exposure))
+        if exposure > 0:
+            self.bars_in_market += 1
+            if equity > 0:
+                self.exposure_sum += exposure / equity
+    
+    def record_fill(self, value):
+        """
+        Užfiksuoja įvykdyto sandorio vertę apyvartai.
+        
+        Args:
+            value (float): Sandorio vertė
+        """
+        self.traded_value += abs(float(value))
+        self.fills += 1
+    
+    @property
+    def return_std(self):
+        """
+        float: Grąžų standartinis nuokrypis (populiacijos).
+        """
+        if self.return_count == 0:
+            return 0.0
+        return math.sqrt(max(self.return_m2, 0.0) / self.return_count)
+    
+    @property
+    def sharpe_ratio(self):
+        """
+        float: Anualizuotas Sharpe rodiklis (NaN, jei grąžų per mažai arba jos nekinta).
+        """
+        std = self.return_std
+        if self.return_count < 2 or std <= 0:
+            return float('nan')
+        return math.sqrt(self.periods_per_year) * self.return_mean / std
+    
+    def snapshot(self):
+        """
+        Grąžina dabartines metrikas.
+        
+        Returns:
+            dict: Metrikos
+        """
+        base = self.initial_equity if self.initial_equity is not None else self.first_equity
+        mean_equity = self.equity_sum / self.bars if self.bars else 0.0
+        
+        return {
+            'bars': self.bars,
+            'equity': self.equity,
+            'total_return': self.equity / base - 1 if self.equity is not None and base else 0.0,
+            'mean_return': self.return_mean,
+            'return_std': self.return_std,
+            'sharpe_ratio': self.sharpe_ratio,
+            'peak_equity': self.peak,
+            'drawdown': self.drawdown,
+            'max_drawdown': self.max_drawdown,
+            'drawdown_duration': self.drawdown_duration,
+            'max_drawdown_duration': self.max_drawdown_duration,
+            'exposure': self.exposure_sum / self.bars if self.bars else 0.0,
+            'time_in_market': self.bars_in_market / self.bars if self.bars else 0.0,
+            'traded_value': self.traded_value,
+            'turnover': self.traded_value / mean_equity if mean_equity > 0 else 0.0,
+            'fills': self.fills
+        }
+    
+    def __repr__(self):
+        return (f"<OnlineMetrics(bars={self.bars}, equity={self.equity}, "
+                f"max_drawdown={self.max_drawdown:.4f})>")
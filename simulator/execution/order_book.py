@@ -0,0 +1,287 @@
+"""
+Laukiančių užsakymų knygos modulis
+-----------------------------
+Šis modulis realizuoja ribotų (limit), stop ir stop-limit užsakymų knygą.
+Užsakymai laikomi kainų krūvose (heap), todėl kiekviename žingsnyje
+tikrinami tik tie užsakymai, kurių kaina patenka į žingsnio [Low, High]
+intervalą, o likę užsakymai iš naujo neperžiūrimi.
+"""
+
+import heapq
+import itertools
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Palaikomi užsakymų tipai ir galiojimo sąlygos
+ORDER_TYPES = ('market', 'limit', 'stop', 'stop_limit')
+TIME_IN_FORCE = ('GTC', 'IOC', 'GTD')
+
+class BookOrder:
+    """
+    Knygoje laukiantis užsakymas.
+    """
+    __slots__ = ('order_id', 'order', 'action', 'order_type', 'limit_price', 'stop_price', 'placed_index',
+                 'expire_index', 'active')
+    
+    def __init__(self, order_id, order, placed_index, expire_index):
+        """
+        Args:
+            order_id (int): Užsakymo numeris knygoje
+            order (Order): Strategijos užsakymas
+            placed_index (int): Žingsnis, kuriame užsakymas pateiktas
+            expire_index (int): Paskutinis žingsnis, kuriame užsakymas galioja (None - kol atšauktas)
+        """
+        self.order_id = order_id
+        self.order = order
+        self.action = order.get('action')
+        self.order_type = order.get('order_type')
+        self.limit_price = order.get('limit_price')
+        self.stop_price = order.get('stop_price')
+        self.placed_index = placed_index
+        self.expire_index = expire_index
+        self.active = True
+
+class OrderBook:
+    """
+    Ribotų ir stop užsakymų knyga su kainų krūvomis.
+    Užsakymai pradedami tikrinti nuo sekančio žingsnio po pateikimo.
+    """
+    def __init__(self):
+        """
+        Inicializuoja tuščią užsakymų knygą.
+        """
+        # Krūvų įrašai: (raktas, eilės numeris, užsakymo numeris); viršuje - artimiausias suveikimui užsakymas
+        self._buy_limits = []   # suveikia, kai Low <= kaina (didžiausia kaina pirma)
+        self._sell_limits = []  # suveikia, kai High >= kaina (mažiausia kaina pirma)
+        self._buy_stops = []    # suveikia, kai High >= kaina (mažiausia kaina pirma)
+        self._sell_stops = []   # suveikia, kai Low <= kaina (didžiausia kaina pirma)
+        self._expiries = []     # (galiojimo pabaigos žingsnis, užsakymo numeris)
+        
+        self._orders = {}
+        self._activated = []    # stop-limit užsakymai, tampantys ribotais nuo sekančio žingsnio
+        self._ids = itertools.count(1)
+    
+    def __len__(self):
+        return len(self._orders)
+    
+    def submit(self, order, index):
+        """
+        Įtraukia užsakymą į knygą.
+        
+        Args:
+            order (Order | dict): Užsakymas su order_type, limit_price, stop_price, time_in_force (ir good_for, jei 'GTD')
+            index (int): Pateikimo žingsnis
+        
+        Returns:
+            int: Užsakymo numeris knygoje
+        """
+        order_type = order.get('order_type')
+        if order_type not in ORDER_TYPES or order_type == 'market':
+            raise ValueError(f"Knygoje negalimas užsakymo tipas: {order_type}")
+        if order.get('action') not in ('buy', 'sell'):
+            raise ValueError(f"Nežinomas veiksmas: {order.get('action')}")
+        if order_type in ('limit', 'stop_limit') and order.get('limit_price') is None:
+            raise ValueError(f"{order_type} užsakymui būtina limit_price")
+        if order_type in ('stop', 'stop_limit') and order.get('stop_price') is None:
+            raise ValueError(f"{order_type} užsakymui būtina stop_price")
+        
+        time_in_force = order.get('time_in_force') or 'GTC'
+        if time_in_force not in TIME_IN_FORCE:
+            raise ValueError(f"Nežinoma galiojimo sąlyga: {time_in_force}")
+        
+        expire_index = None
+        if time_in_force == 'IOC':
+            expire_index = index + 1
+        elif time_in_force == 'GTD':
+            expire_index = index + max(1, order.get('good_for') or 1)
+        
+        order_id = next(self._ids)
+        book_order = BookOrder(order_id, order, index, expire_index)
+        self._orders[order_id] = book_order
+        
+        if order_type == 'limit':
+            self._push_limit(book_order)
+        else:
+            self._push_stop(book_order)
+        
+        if expire_index is not None:
+            heapq.heappush(self._expiries, (expire_index, order_id))
+        
+        logger.debug(f"Užsakymas #{order_id} įtrauktas į knygą: {order.get('action')} {order_type} "
+                     f"(limit={order.get('limit_price')}, stop={order.get('stop_price')}, {time_in_force})")
+        return order_id
+    
+    def cancel(self, order_id):
+        """
+        Atšaukia užsakymą (iš krūvos jis pašalinamas, kai pasiekia viršūnę).
+        
+        Args:
+            order_id (int): Užsakymo numeris knygoje
+        
+        Returns:
+            bool: True, jei užsakymas buvo knygoje
+        """
+        book_order = self._orders.pop(order_id, None)
+        if book_order is None:
+            return False
+        
+        book_order.active = False
+        return True
+    
+    def cancel_all(self, symbol=None):
+        """
+        Atšaukia visus (arba nurodyto simbolio) užsakymus.
+        
+        Args:
+            symbol (str, optional): Prekybos simbolis
+        """
+        for order_id, book_order in list(self._orders.items()):
+            if symbol is None or book_order.order.get('symbol', 'BTC') == symbol:
+                self.cancel(order_id)
+    
+    def _push_limit(self, book_order):
+        price = book_order.limit_price
+        if book_order.action == 'buy':
+            heapq.heappush(self._buy_limits, (-price, book_order.order_id, book_order.order_id))
+        else:
+            heapq.heappush(self._sell_limits, (price, book_order.order_id, book_order.order_id))
+    
+    def _push_stop(self, book_order):
+        price = book_order.stop_price
+        if book_order.action == 'buy':
+            heapq.heappush(self._buy_stops, (price, book_order.order_id, book_order.order_id))
+        else:
+            heapq.heappush(self._sell_stops, (-price, book_order.order_id, book_order.order_id))
+    
+    def _top(self, heap):
+        """
+        Grąžina aktyvų užsakymą krūvos viršūnėje (atšauktus pašalina).
+        """
+        while heap:
+            book_order = self._orders.get(heap[0][2])
+            if book_order is not None and book_order.active:
+                return book_order
+            heapq.heappop(heap)
+        return None
+    
+    def match(self, index, open_price, high, low):
+        """
+        Suranda užsakymus, įvykdomus žingsnyje.
+        Kainos tarpas žingsnio pradžioje įvykdomas Open kaina, jei ji geresnė (limit) arba blogesnė (stop) už nurodytą.
+        
+        Args:
+            index (int): Žingsnio indeksas
+            open_price (float): Žingsnio Open kaina
+            high (float): Žingsnio High kaina
+            low (float): Žingsnio Low kaina
+        
+        Returns:
+            list: (Order, įvykdymo kaina) porų sąrašas
+        """
+        # Stop-limit užsakymai, suveikę ankstesniame žingsnyje, tampa ribotais
+        if self._activated:
+            for book_order in self._activated:
+                if book_order.active:
+                    self._push_limit(book_order)
+            self._activated = []
+        
+        fills = []
+        
+        # Ribotiniai užsakymai
+        for book_order in self._pop_triggered(self._buy_limits, lambda o: low <= o.limit_price):
+            fills.append(self._fill(book_order, min(open_price, book_order.limit_price)))
+        for book_order in self._pop_triggered(self._sell_limits, lambda o: high >= o.limit_price):
+            fills.append(self._fill(book_order, max(open_price, book_order.limit_price)))
+        
+        # Stop užsakymai (stop-limit tampa ribotu nuo sekančio žingsnio)
+        for book_order in self._pop_triggered(self._buy_stops, lambda o: high >= o.stop_price):
+            if book_order.order_type == 'stop_limit':
+                self._activated.append(book_order)
+            else:
+                fills.append(self._fill(book_order, max(open_price, book_order.stop_price)))
+        for book_order in self._pop_triggered(self._sell_stops, lambda o: low <= o.stop_price):
+            if book_order.order_type == 'stop_limit':
+                self._activated.append(book_order)
+            else:
+                fills.append(self._fill(book_order, min(open_price, book_order.stop_price)))
+        
+        # Pasibaigusio galiojimo užsakymai
+        while self._expiries and self._expiries[0][0] <= index:
+            _, order_id = heapq.heappop(self._expiries)
+            if self.cancel(order_id):
+                logger.debug(f"Užsakymo #{order_id} galiojimas baigėsi")
+        
+        return fills
+    
+    def _pop_triggered(self, heap, triggered):
+        """
+        Išima iš krūvos viršaus visus užsakymus, kurių sąlyga tenkinama.
+        
+        Args:
+            heap (list): Užsakymų krūva
+            triggered (callable): Sąlyga BookOrder -> bool
+        
+        Returns:
+            list: Suveikę užsakymai
+        """
+        result = []
+        while True:
+            book_order = self._top(heap)
+            if book_order is None or not triggered(book_order):
+                return result
+            heapq.heappop(heap)
+            result.append(book_order)
+    
+    def _fill(self, book_order, price):
+        """
+        Pašalina įvykdytą užsakymą iš knygos.
+        
+        Returns:
+            tuple: (Order, įvykdymo kaina)
+        """
+        self._orders.pop(book_order.order_id, None)
+        book_order.active = False
+        return book_order.order, price
+    
+    def next_event_index(self, start, high, low, window=256):
+        """
+        Vektoriškai suranda pirmą žingsnį nuo start, kuriame kuris nors užsakymas gali suveikti arba baigtis.
+        Paieška ribojama langu: jei jame įvykio nėra, grąžinama lango pabaiga (knyga patikrinama iš naujo).
+        
+        Args:
+            start (int): Pirmas tikrinamas žingsnis
+            high (numpy.ndarray): Visų žingsnių High kainos
+            low (numpy.ndarray): Visų žingsnių Low kainos
+            window (int): Paieškos lango ilgis
+        
+        Returns:
+            int: Žingsnio indeksas (len(high), jei knyga tuščia)
+        """
+        n = len(high)
+        if not self._orders:
+            return n
+        if self._activated:
+            return start
+        
+        # Aukščiausia kaina, kurią pasiekus kainai krentant, ir žemiausia, kurią pasiekus kylant, suveikia užsakymas
+        low_trigger = -np.inf
+        high_trigger = np.inf
+        for heap, sign in ((self._buy_limits, -1), (self._sell_stops, -1)):
+            if self._top(heap) is not None:
+                low_trigger = max(low_trigger, sign * heap[0][0])
+        for heap, sign in ((self._sell_limits, 1), (self._buy_stops, 1)):
+            if self._top(heap) is not None:
+                high_trigger = min(high_trigger, sign * heap[0][0])
+        
+        end = min(n, start + window)
+        while self._expiries and self._expiries[0][1] not in self._orders:
+            heapq.heappop(self._expiries)
+        if self._expiries:
+            end = max(start, min(end, self._expiries[0][0]))
+        
+        hits = np.flatnonzero((low[start:end] <= low_trigger) | (high[start:end] >= high_trigger))
+        if len(hits):
+            return start + int(hits[0])
+        return end
@@ -6,10 +6,11 @@ Užsakymų vykdymo modulis
 """
 
 import logging
-import random
 import numpy as np
 from datetime import datetime
-from database.models import Trade
+from simulator.execution.slippage import ACTION_SIGNS, SlippageStream, apply_slippage
+from simulator.execution.trade_journal import TradeJournal
+from simulator.records import Fill
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +19,9 @@ class OrderExecutor:
     Užsakymų vykdymo klasė, kuri simuliuoja užsakymų vykdymą 
     su komisiniu mokesčiu ir kainos praslydimu.
     """
-    def __init__(self, db_session, fee_model='percentage', fee_percentage=0.001, 
-                 slippage_model='random', slippage_range=(0.0001, 0.002)):
+    def __init__(self, db_session=None, fee_model='percentage', fee_percentage=0.001, 
+                 slippage_model='random', slippage_range=(0.0001, 0.002), journal=None,
+                 seed=None, market_impact=None):
         """
         Inicializuoja užsakymų vykdytoją.
         
@@ -29,9 +31,15 @@ class OrderExecutor:
             fee_percentage (float): Komisinio mokesčio procentas (0.001 = 0.1%)
             slippage_model (str): Praslydimo modelis ('random', 'fixed', 'proportional', 'none')
             slippage_range (tuple): Praslydimo diapazono ribos (min, max) procentiniu formatu
+            journal (TradeJournal, optional): Prekybos operacijų žurnalas (numatyta - naujas žurnalas)
+            seed (int | numpy.random.SeedSequence, optional): Praslydimo atsitiktinumo sėkla (None - atsitiktinė)
+            market_impact (MarketImpactModel, optional): Rinkos poveikio ir dalinio vykdymo modelis
         """
         self.db_session = db_session
         
+        # Operacijos kaupiamos žurnale ir į duomenų bazę įrašomos paketu (žr. flush_trades)
+        self.journal = journal if journal is not None else TradeJournal()
+        
         # Komisiniai mokesčiai
         self.fee_model = fee_model
         self.fee_percentage = fee_percentage
@@ -39,14 +47,20 @@ class OrderExecutor:
         # Kainos praslydimas
         self.slippage_model = slippage_model
         self.slippage_range = slippage_range
+        self.slippage_stream = SlippageStream(seed)
+        
+        # Rinkos poveikis (taikomas, kai užsakymui nurodytas žingsnio indeksas)
+        self.market_impact = market_impact
         
         logger.info(f"Inicializuotas užsakymų vykdytojas: fee_model={fee_model}, fee_percentage={fee_percentage*100}%, "
                    f"slippage_model={slippage_model}, slippage_range={slippage_range}")
     
     def execute_order(self, portfolio, action, amount, target_price, timestamp, 
-                     stop_loss=None, take_profit=None):
+                     stop_loss=None, take_profit=None, bar_index=None, margin=False, limit_price=None):
         """
         Vykdo prekybos užsakymą su mokesčiais ir praslydimu.
+        Jei naudojamas rinkos poveikio modelis, įvykdoma tik žingsnio dalyvavimo ribą atitinkanti dalis,
+        o neįvykdytas likutis grąžinamas Fill.remaining lauke.
         
         Args:
             portfolio: Portfelio objektas
@@ -56,13 +70,41 @@ class OrderExecutor:
             timestamp: Užsakymo laikas
             stop_loss (float, optional): Stop-loss kaina
             take_profit (float, optional): Take-profit kaina
+            bar_index (int, optional): Žingsnio indeksas rinkos poveikio modeliui
+            margin (bool): Maržinė prekyba - balansas gali tapti neigiamas (skolinimasis), o BTC kiekis -
+                neigiamas (trumpoji pozicija); maržos pakankamumą tikrina variklis
+            limit_price (float, optional): Ribinė kaina (įvykdytam limit užsakymui) - pirkimo kaina
+                po praslydimo ir rinkos poveikio neviršija jos, pardavimo - nebūna mažesnė
         
         Returns:
-            dict: Užsakymo vykdymo rezultatas
+            Fill | dict: Įvykdymo rezultatas (Fill) arba klaidos žodynas su status='error'
         """
         try:
-            # Apskaičiuojame kainą su praslydimu
+            # Ribojame kiekį žingsnio likvidumu
+            requested_amount = amount
+            impact = 0.0
+            if self.market_impact is not None and bar_index is not None:
+                amount, impact = self.market_impact.fill(bar_index, amount)
+                if amount <= 0:
+                    logger.warning(f"Žingsnyje nėra likvidumo: neįvykdyta {requested_amount:.6f} BTC")
+                    return {
+                        'status': 'error',
+                        'message': 'No liquidity',
+                        'required': requested_amount,
+                        'available': 0.0
+                    }
+            
+            # Apskaičiuojame kainą su praslydimu ir rinkos poveikiu
             execution_price = self._apply_slippage(target_price, action)
+            if impact:
+                execution_price *= 1 + ACTION_SIGNS.get(action, -1.0) * impact
+            
+            # Limit užsakymas negali būti įvykdytas blogesne nei ribinė kaina
+            if limit_price is not None:
+                if action == 'buy':
+                    execution_price = min(execution_price, limit_price)
+                else:
+                    execution_price = max(execution_price, limit_price)
             
             # Apskaičiuojame mokesčius
             fees = self._calculate_fees(amount, execution_price)
@@ -75,7 +117,7 @@ class OrderExecutor:
                 # Patikriname, ar užtenka lėšų
                 total_cost = trade_value + fees
                 
-                if portfolio.balance < total_cost:
+                if not margin and portfolio.balance < total_cost:
                     logger.warning(f"Nepakanka lėšų: turima ${portfolio.balance:.2f}, reikia ${total_cost:.2f}")
                     return {
                         'status': 'error',
@@ -89,12 +131,12 @@ class OrderExecutor:
                 portfolio.btc_amount += amount
                 
                 # Išsaugome į log
-                logger.info(f"Įvykdytas PIRKIMO užsakymas: {amount:.6f} BTC po ${execution_price:.2f} "
-                           f"(praslydimas: ${execution_price-target_price:.2f}, mokesčiai: ${fees:.2f})")
+                logger.debug("Įvykdytas PIRKIMO užsakymas: %.6f BTC po $%.2f (praslydimas: $%.2f, mokesčiai: $%.2f)",
+                             amount, execution_price, execution_price - target_price, fees)
                 
             elif action == 'sell':
                 # Patikriname, ar užtenka BTC
-                if portfolio.btc_amount < amount:
+                if not margin and portfolio.btc_amount < amount:
                     logger.warning(f"Nepakanka BTC: turima {portfolio.btc_amount:.6f}, reikia {amount:.6f}")
                     return {
                         'status': 'error',
@@ -108,8 +150,8 @@ class OrderExecutor:
                 portfolio.balance += (trade_value - fees)
                 
                 # Išsaugome į log
-                logger.info(f"Įvykdytas PARDAVIMO užsakymas: {amount:.6f} BTC po ${execution_price:.2f} "
-                           f"(praslydimas: ${target_price-execution_price:.2f}, mokesčiai: ${fees:.2f})")
+                logger.debug("Įvykdytas PARDAVIMO užsakymas: %.6f BTC po $%.2f (praslydimas: $%.2f, mokesčiai: $%.2f)",
+                             amount, execution_price, target_price - execution_price, fees)
                 
             else:
                 logger.error(f"Nežinomas veiksmas: {action}")
@@ -121,9 +163,9 @@ class OrderExecutor:
             # Atnaujiname portfelio atnaujinimo laiką
             portfolio.update_time = datetime.now()
             
-            # Sukuriame prekybos operacijos įrašą
-            trade = Trade(
-                portfolio_id=portfolio.id,
+            # Įrašome operaciją į žurnalą (be duomenų bazės užklausų)
+            trade_id = self.journal.record(
+                timestamp=timestamp,
                 trade_type=action,
                 btc_amount=amount,
                 price=execution_price,
@@ -131,27 +173,21 @@ class OrderExecutor:
                 fees=fees,
                 slippage=abs(execution_price - target_price),
                 stop_loss=stop_loss,
-                take_profit=take_profit,
-                timestamp=timestamp
+                take_profit=take_profit
             )
             
-            # Išsaugome operaciją duomenų bazėje
-            self.db_session.add(trade)
-            self.db_session.commit()
-            
             # Grąžiname sėkmės rezultatą
-            return {
-                'status': 'success',
-                'action': action,
-                'amount': amount,
-                'target_price': target_price,
-                'execution_price': execution_price,
-                'value': trade_value,
-                'fees': fees,
-                'slippage': abs(execution_price - target_price),
-                'slippage_percentage': abs(execution_price - target_price) / target_price * 100,
-                'trade_id': trade.id
-            }
+            return Fill(
+                action=action,
+                amount=amount,
+                target_price=target_price,
+                execution_price=execution_price,
+                value=trade_value,
+                fees=fees,
+                slippage=abs(execution_price - target_price),
+                trade_id=trade_id,
+                remaining=requested_amount - amount
+            )
             
         except Exception as e:
             logger.error(f"Klaida vykdant užsakymą: {e}")
@@ -160,6 +196,24 @@ class OrderExecutor:
                 'message': str(e)
             }
     
+    def flush_trades(self, portfolio_id, db_session=None):
+        """
+        Įrašo sukauptas žurnalo operacijas į duomenų bazę vienu paketiniu įterpimu.
+        
+        Args:
+            portfolio_id (int): Portfelio ID
+            db_session (optional): Duomenų bazės sesija (numatyta - vykdytojo sesija)
+        
+        Returns:
+            int: Įrašytų operacijų skaičius
+        """
+        session = db_session or self.db_session
+        if session is None:
+            logger.warning("Nėra duomenų bazės sesijos - operacijos lieka tik žurnale")
+            return 0
+        
+        return self.journal.flush(session, portfolio_id)
+    
     def _apply_slippage(self, target_price, action):
         """
         Pritaiko kainos praslydimą prie tikslinės kainos.
@@ -174,29 +228,32 @@ class OrderExecutor:
         if self.slippage_model == 'none':
             return target_price
         
-        slippage_percentage = 0.0
-        
-        if self.slippage_model == 'fixed':
-            # Fiksuotas praslydimas
-            slippage_percentage = self.slippage_range[0]
-            
-        elif self.slippage_model == 'random':
-            # Atsitiktinis praslydimas nurodytame diapazone
-            slippage_percentage = random.uniform(self.slippage_range[0], self.slippage_range[1])
-            
-        elif self.slippage_model == 'proportional':
-            # Praslydimas proporcingas kainai (didesnis praslydimas, kai kaina aukštesnė)
-            base_slippage = np.mean(self.slippage_range)
-            volatility_factor = min(1.0, target_price / 10000)  # Paprastas volatility modelis
-            slippage_percentage = base_slippage * (1 + volatility_factor)
+        uniform = self.slippage_stream.next() if self.slippage_model == 'random' else None
         
         # Perkant kaina yra didesnė, parduodant - mažesnė
-        if action == 'buy':
-            execution_price = target_price * (1 + slippage_percentage)
-        else:  # sell
-            execution_price = target_price * (1 - slippage_percentage)
+        sign = ACTION_SIGNS.get(action, -1.0)
+        return float(apply_slippage(target_price, sign, self.slippage_model, self.slippage_range, uniform))
+    
+    def price_orders(self, target_prices, actions):
+        """
+        Vektoriškai apskaičiuoja užsakymų paketo įvykdymo kainas su praslydimu.
+        Praslydimo imtys imamos iš to paties srauto kaip ir pavieniams užsakymams.
+        
+        Args:
+            target_prices (numpy.ndarray): Norimos įvykdymo kainos
+            actions (numpy.ndarray): Užsakymų veiksmai ('buy' arba 'sell')
+        
+        Returns:
+            numpy.ndarray: Įvykdymo kainos
+        """
+        target_prices = np.asarray(target_prices, dtype=np.float64)
+        if self.slippage_model == 'none':
+            return target_prices.copy()
+        
+        signs = np.where(np.asarray(actions) == 'buy', 1.0, -1.0)
+        uniforms = self.slippage_stream.take(len(target_prices)) if self.slippage_model == 'random' else None
         
-        return execution_price
+        return apply_slippage(target_prices, signs, self.slippage_model, self.slippage_range, uniforms)
     
     def _calculate_fees(self, amount, execution_price):
         """
@@ -0,0 +1,49 @@
+"""
+Simuliacijos portfelio būsena
+-----------------------------
+Šis modulis apibrėžia lengvą, tik atmintyje laikomą portfelio objektą,
+kurį simuliatorius naudoja vietoje duomenų bazės Portfolio įrašo.
+Jo laukai sutampa su database.models.Portfolio, todėl vykdytojai
+ir strategijos gali dirbti su bet kuriuo iš jų.
+"""
+
+from datetime import datetime
+
+class PortfolioState:
+    """
+    Simuliacijos portfelio būsena (be duomenų bazės).
+    """
+    __slots__ = ('id', 'name', 'balance', 'btc_amount', 'description', 'create_time', 'update_time')
+    
+    def __init__(self, name="Simulator Portfolio", balance=10000.0, btc_amount=0.0,
+                 description="Prekybos simuliatoriaus portfelis"):
+        """
+        Inicializuoja portfelio būseną.
+        
+        Args:
+            name (str): Portfelio pavadinimas
+            balance (float): USD balansas
+            btc_amount (float): BTC kiekis
+            description (str): Portfelio aprašymas
+        """
+        self.id = None  # Nustatomas, kai portfelis įrašomas į duomenų bazę
+        self.name = name
+        self.balance = balance
+        self.btc_amount = btc_amount
+        self.description = description
+        self.create_time = datetime.now()
+        self.update_time = self.create_time
+    
+    def reset(self, balance):
+        """
+        Atstato portfelį į pradinę būseną.
+        
+        Args:
+            balance (float): Pradinis USD balansas
+        """
+        self.balance = balance
+        self.btc_amount = 0.0
+        self.update_time = datetime.now()
+    
+    def __repr__(self):
+        return f"<PortfolioState(name='{self.name}', balance={self.balance:.2f}, btc_amount={self.btc_amount:.6f})>"
@@ -0,0 +1,121 @@
+"""
+Kainos praslydimo modelių modulis
+-----------------------------
+Šis modulis realizuoja praslydimo modelius kaip masyvų funkcijas ir
+atkartojamą atsitiktinių skaičių srautą, iš kurio praslydimo imtys
+traukiamos iš anksto sugeneruotais blokais.
+"""
+
+import numpy as np
+
+# Palaikomi praslydimo modeliai
+SLIPPAGE_MODELS = ('random', 'fixed', 'proportional', 'none')
+
+# Užsakymo kryptis: pirkimo kaina didinama, pardavimo - mažinama
+ACTION_SIGNS = {'buy': 1.0, 'sell': -1.0}
+
+class SlippageStream:
+    """
+    Atkartojamas tolygiųjų [0, 1) imčių srautas praslydimui.
+    Imtys generuojamos blokais, todėl vienam užsakymui nereikia atskiro generatoriaus kvietimo.
+    """
+    def __init__(self, seed=None, block_size=4096):
+        """
+        Inicializuoja srautą.
+        
+        Args:
+            seed (int | numpy.random.SeedSequence, optional): Atsitiktinumo sėkla (None - atsitiktinė)
+            block_size (int): Iš anksto generuojamų imčių skaičius
+        """
+        self.rng = np.random.default_rng(seed)
+        self.block_size = max(1, block_size)
+        self._block = self.rng.random(self.block_size)
+        self._position = 0
+    
+    def take(self, n):
+        """
+        Grąžina n sekančių srauto imčių.
+        
+        Args:
+            n (int): Imčių skaičius
+        
+        Returns:
+            numpy.ndarray: Tolygiosios imtys intervale [0, 1)
+        """
+        samples = np.empty(n)
+        filled = 0
+        while filled < n:
+            if self._position == len(self._block):
+                self._block = self.rng.random(self.block_size)
+                self._position = 0
+            
+            count = min(n - filled, len(self._block) - self._position)
+            samples[filled:filled + count] = self._block[self._position:self._position + count]
+            self._position += count
+            filled += count
+        
+        return samples
+    
+    def next(self):
+        """
+        Grąžina vieną sekančią srauto imtį.
+        
+        Returns:
+            float: Tolygioji imtis intervale [0, 1)
+        """
+        if self._position == len(self._block):
+            self._block = self.rng.random(self.block_size)
+            self._position = 0
+        
+        sample = self._block[self._position]
+        self._position += 1
+        return float(sample)
+
+def slippage_fractions(model, target_prices, slippage_range, uniforms=None):
+    """
+    Apskaičiuoja praslydimo dalis (0.001 = 0.1%) užsakymų masyvui.
+    
+    Args:
+        model (str): Praslydimo modelis ('random', 'fixed', 'proportional', 'none')
+        target_prices (numpy.ndarray): Norimos įvykdymo kainos
+        slippage_range (tuple): Praslydimo diapazono ribos (min, max)
+        uniforms (numpy.ndarray, optional): Tolygiosios [0, 1) imtys (reikalingos 'random' modeliui)
+    
+    Returns:
+        numpy.ndarray: Praslydimo dalys
+    """
+    target_prices = np.asarray(target_prices, dtype=np.float64)
+    low, high = slippage_range
+    
+    if model == 'fixed':
+        # Fiksuotas praslydimas
+        return np.full(target_prices.shape, float(low))
+    
+    if model == 'random':
+        # Atsitiktinis praslydimas nurodytame diapazone
+        return low + (high - low) * np.asarray(uniforms, dtype=np.float64)
+    
+    if model == 'proportional':
+        # Praslydimas proporcingas kainai (didesnis praslydimas, kai kaina aukštesnė)
+        volatility_factor = np.minimum(1.0, target_prices / 10000)  # Paprastas volatility modelis
+        return (low + high) / 2 * (1 + volatility_factor)
+    
+    return np.zeros(target_prices.shape)
+
+def apply_slippage(target_prices, signs, model, slippage_range, uniforms=None):
+    """
+    Pritaiko praslydimą užsakymų masyvui.
+    
+    Args:
+        target_prices (numpy.ndarray): Norimos įvykdymo kainos
+        signs (numpy.ndarray): Užsakymų kryptys (1 - pirkimas, -1 - pardavimas)
+        model (str): Praslydimo modelis
+        slippage_range (tuple): Praslydimo diapazono ribos (min, max)
+        uniforms (numpy.ndarray, optional): Tolygiosios [0, 1) imtys (reikalingos 'random' modeliui)
+    
+    Returns:
+        numpy.ndarray: Įvykdymo kainos
+    """
+    target_prices = np.asarray(target_prices, dtype=np.float64)
+    fractions = slippage_fractions(model, target_prices, slippage_range, uniforms)
+    return target_prices * (1 + np.asarray(signs, dtype=np.float64) * fractions)
@@ -0,0 +1,175 @@
+"""
+Prekybos operacijų žurnalas
+-----------------------------
+Šis modulis realizuoja stulpelinį prekybos operacijų žurnalą simuliacijoms.
+Operacijos kaupiamos atmintyje NumPy masyvuose ir į duomenų bazės
+'trades' lentelę įrašomos vienu paketiniu įterpimu simuliacijos pabaigoje.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Operacijos tipo kodavimas masyve
+TRADE_TYPE_CODES = {'buy': 1, 'sell': -1}
+TRADE_TYPE_NAMES = {code: name for name, code in TRADE_TYPE_CODES.items()}
+
+class TradeJournal:
+    """
+    Stulpelinis prekybos operacijų žurnalas su iš anksto išskirta atmintimi.
+    """
+    FLOAT_COLUMNS = ('btc_amount', 'price', 'value', 'fees', 'slippage', 'stop_loss', 'take_profit')
+    
+    def __init__(self, capacity=1024):
+        """
+        Inicializuoja prekybos operacijų žurnalą.
+        
+        Args:
+            capacity (int): Pradinė talpa (operacijų skaičius), esant poreikiui dvigubinama
+        """
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._flushed = 0
+        self._allocate(self._capacity)
+    
+    def _allocate(self, capacity):
+        """
+        Išskiria tuščius stulpelių masyvus.
+        
+        Args:
+            capacity (int): Masyvų ilgis
+        """
+        self.timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        self.trade_types = np.zeros(capacity, dtype=np.int8)
+        for column in self.FLOAT_COLUMNS:
+            setattr(self, column, np.full(capacity, np.nan))
+    
+    def _grow(self):
+        """
+        Padvigubina masyvų talpą, išsaugodama jau įrašytas operacijas.
+        """
+        new_capacity = self._capacity * 2
+        
+        timestamps = np.empty(new_capacity, dtype='datetime64[ns]')
+        timestamps[:self._size] = self.timestamps[:self._size]
+        self.timestamps = timestamps
+        
+        trade_types = np.zeros(new_capacity, dtype=np.int8)
+        trade_types[:self._size] = self.trade_types[:self._size]
+        self.trade_types = trade_types
+        
+        for column in self.FLOAT_COLUMNS:
+            values = np.full(new_capacity, np.nan)
+            values[:self._size] = getattr(self, column)[:self._size]
+            setattr(self, column, values)
+        
+        self._capacity = new_capacity
+    
+    def __len__(self):
+        return self._size
+    
+    def record(self, timestamp, trade_type, btc_amount, price, value, fees, slippage,
+               stop_loss=None, take_profit=None):
+        """
+        Įrašo prekybos operaciją į žurnalą.
+        
+        Args:
+            timestamp: Operacijos laikas
+            trade_type (str): 'buy' arba 'sell'
+            btc_amount (float): BTC kiekis
+            price (float): Įvykdymo kaina
+            value (float): Operacijos vertė
+            fees (float): Mokesčiai
+            slippage (float): Praslydimas (absoliutus, USD)
+            stop_loss (float, optional): Stop-loss kaina
+            take_profit (float, optional): Take-profit kaina
+        
+        Returns:
+            int: Operacijos numeris žurnale
+        """
+        if self._size == self._capacity:
+            self._grow()
+        
+        i = self._size
+        self.timestamps[i] = np.datetime64(pd.Timestamp(timestamp), 'ns') if timestamp is not None else np.datetime64('NaT')
+        self.trade_types[i] = TRADE_TYPE_CODES[trade_type]
+        self.btc_amount[i] = btc_amount
+        self.price[i] = price
+        self.value[i] = value
+        self.fees[i] = fees
+        self.slippage[i] = slippage
+        self.stop_loss[i] = np.nan if stop_loss is None else stop_loss
+        self.take_profit[i] = np.nan if take_profit is None else take_profit
+        
+        self._size += 1
+        return i
+    
+    def clear(self):
+        """
+        Išvalo žurnalą (talpa išlaikoma).
+        """
+        self._size = 0
+        self._flushed = 0
+    
+    def to_dataframe(self):
+        """
+        Grąžina žurnalo operacijas kaip DataFrame.
+        
+        Returns:
+            pandas.DataFrame: Prekybos operacijos
+        """
+        n = self._size
+        data = {
+            'timestamp': self.timestamps[:n],
+            'trade_type': [TRADE_TYPE_NAMES[code] for code in self.trade_types[:n]]
+        }
+        for column in self.FLOAT_COLUMNS:
+            data[column] = getattr(self, column)[:n]
+        
+        return pd.DataFrame(data)
+    
+    def _mappings(self, start, portfolio_id):
+        """
+        Paruošia neįrašytas operacijas paketiniam įterpimui į 'trades' lentelę.
+        
+        Args:
+            start (int): Pirmosios operacijos numeris
+            portfolio_id (int): Portfelio ID
+        
+        Returns:
+            list: Eilučių žodynų sąrašas
+        """
+        df = self.to_dataframe().iloc[start:]
+        df['timestamp'] = df['timestamp'].dt.to_pydatetime()
+        df['portfolio_id'] = portfolio_id
+        
+        # NaN stop-loss/take-profit reikšmes saugome kaip NULL
+        df = df.astype(object).where(df.notna(), None)
+        return df.to_dict('records')
+    
+    def flush(self, db_session, portfolio_id):
+        """
+        Įrašo dar neįrašytas operacijas į duomenų bazę vienu paketiniu įterpimu.
+        
+        Args:
+            db_session: SQLAlchemy duomenų bazės sesija
+            portfolio_id (int): Portfelio ID
+        
+        Returns:
+            int: Įrašytų operacijų skaičius
+        """
+        from database.models import Trade
+        
+        pending = self._size - self._flushed
+        if pending <= 0:
+            return 0
+        
+        db_session.bulk_insert_mappings(Trade, self._mappings(self._flushed, portfolio_id))
+        db_session.commit()
+        
+        self._flushed = self._size
+        logger.info(f"Į duomenų bazę įrašyta {pending} prekybos operacijų")
+        
+        return pending
@@ -9,6 +9,7 @@ import pandas as pd
 import numpy as np
 import logging
 from datetime import datetime
+from simulator.execution.online_metrics import OnlineMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -17,27 +18,114 @@ class TradingStatistics:
     Prekybos statistikos klasė, kuri skaičiuoja ir analizuoja
     prekybos rezultatus.
     """
-    def __init__(self):
+    def __init__(self, initial_balance=None, periods_per_year=252):
         """
         Inicializuoja prekybos statistikos klasę.
+        
+        Args:
+            initial_balance (float, optional): Pradinis balansas einamųjų metrikų grąžai skaičiuoti
+            periods_per_year (int): Žingsnių skaičius per metus Sharpe rodiklio anualizavimui
         """
         self.trades = []
         self.metrics = {}
+        
+        # Einamosios portfelio vertės kreivės metrikos (atnaujinamos kiekviename žingsnyje)
+        self.online = OnlineMetrics(initial_balance, periods_per_year)
+        
+        # Einamieji užbaigtų sandorių skaitikliai
+        self._columns = set()
+        self._profitable_trades = 0
+        self._losing_trades = 0
+        self._total_profit = 0.0
+        self._total_loss = 0.0
+        self._exit_reasons = {}
+        self._total_fees = 0.0
+        self._fee_count = 0
+        self._total_slippage = 0.0
+        self._slippage_count = 0
+        
         logger.info("Inicializuota prekybos statistikos klasė")
     
     def add_trade(self, trade_info):
         """
-        Prideda prekybos operaciją į statistikos skaičiavimą.
+        Prideda prekybos operaciją į statistikos skaičiavimą ir atnaujina einamuosius skaitiklius.
         
         Args:
             trade_info (dict): Prekybos operacijos informacija
         """
         self.trades.append(trade_info)
-        logger.debug(f"Pridėta prekybos operacija į statistiką: {trade_info}")
+        self._columns.update(trade_info)
+        
+        profit_loss = trade_info.get('profit_loss')
+        if profit_loss is not None and profit_loss == profit_loss:
+            if profit_loss > 0:
+                self._profitable_trades += 1
+                self._total_profit += profit_loss
+            else:
+                self._losing_trades += 1
+                self._total_loss += profit_loss
+        
+        reason = trade_info.get('exit_reason')
+        if reason is not None:
+            self._exit_reasons[reason] = self._exit_reasons.get(reason, 0) + 1
+        
+        if trade_info.get('fees') is not None:
+            self._total_fees += trade_info['fees']
+            self._fee_count += 1
+        
+        if trade_info.get('slippage') is not None:
+            self._total_slippage += trade_info['slippage']
+            self._slippage_count += 1
+        
+        logger.debug("Pridėta prekybos operacija į statistiką: %s", trade_info)
+    
+    def update_equity(self, equity, exposure=0.0):
+        """
+        Atnaujina einamąsias portfelio vertės metrikas vienu žingsniu.
+        
+        Args:
+            equity (float): Portfelio vertė
+            exposure (float): Atidarytų pozicijų vertė
+        """
+        self.online.update(equity, exposure)
+    
+    def update_equity_range(self, values, exposures=None):
+        """
+        Atnaujina einamąsias portfelio vertės metrikas keliais žingsniais iš karto.
+        
+        Args:
+            values (numpy.ndarray): Portfelio vertės
+            exposures (numpy.ndarray, optional): Atidarytų pozicijų vertės
+        """
+        self.online.update_range(values, exposures)
+    
+    def record_fill(self, value):
+        """
+        Užfiksuoja įvykdytos operacijos vertę apyvartai.
+        
+        Args:
+            value (float): Operacijos vertė
+        """
+        self.online.record_fill(value)
+    
+    def live_metrics(self):
+        """
+        Grąžina einamąsias metrikas bet kuriuo simuliacijos metu (O(1)).
+        
+        Returns:
+            dict: Portfelio vertės kreivės metrikos ir užbaigtų sandorių skaitikliai
+        """
+        metrics = self.online.snapshot()
+        closed = self._profitable_trades + self._losing_trades
+        metrics['total_trades'] = len(self.trades)
+        metrics['win_rate'] = self._profitable_trades / len(self.trades) if self.trades else 0
+        metrics['net_profit'] = self._total_profit + self._total_loss
+        metrics['closed_trades'] = closed
+        return metrics
     
     def calculate_metrics(self):
         """
-        Apskaičiuoja prekybos statistikos metrikas.
+        Apskaičiuoja prekybos statistikos metrikas iš einamųjų skaitiklių.
         
         Returns:
             dict: Metrikos
@@ -46,51 +134,48 @@ class TradingStatistics:
             logger.warning("Nėra prekybos operacijų metrikų skaičiavimui")
             return {}
         
-        trades_df = pd.DataFrame(self.trades)
+        total_trades = len(self.trades)
         
         # Bazinius metrikas
         metrics = {
-            'total_trades': len(self.trades),
+            'total_trades': total_trades,
             'calculation_time': datetime.now()
         }
         
         # Jei turime užbaigtas operacijas su įėjimo ir išėjimo informacija
-        if 'exit_price' in trades_df.columns and 'entry_price' in trades_df.columns:
+        if 'exit_price' in self._columns and 'entry_price' in self._columns:
             # Skaičiuojame pelną/nuostolį
-            profitable_trades = trades_df[trades_df['profit_loss'] > 0]
-            losing_trades = trades_df[trades_df['profit_loss'] <= 0]
+            metrics['profitable_trades'] = self._profitable_trades
+            metrics['losing_trades'] = self._losing_trades
+            metrics['win_rate'] = self._profitable_trades / total_trades
             
-            metrics['profitable_trades'] = len(profitable_trades)
-            metrics['losing_trades'] = len(losing_trades)
-            metrics['win_rate'] = len(profitable_trades) / len(trades_df) if len(trades_df) > 0 else 0
-            
-            metrics['total_profit'] = profitable_trades['profit_loss'].sum() if len(profitable_trades) > 0 else 0
-            metrics['total_loss'] = losing_trades['profit_loss'].sum() if len(losing_trades) > 0 else 0
+            metrics['total_profit'] = self._total_profit
+            metrics['total_loss'] = self._total_loss
             metrics['net_profit'] = metrics['total_profit'] + metrics['total_loss']
             
-            metrics['average_profit'] = profitable_trades['profit_loss'].mean() if len(profitable_trades) > 0 else 0
-            metrics['average_loss'] = losing_trades['profit_loss'].mean() if len(losing_trades) > 0 else 0
+            metrics['average_profit'] = self._total_profit / self._profitable_trades if self._profitable_trades > 0 else 0
+            metrics['average_loss'] = self._total_loss / self._losing_trades if self._losing_trades > 0 else 0
             
             metrics['profit_factor'] = abs(metrics['total_profit'] / metrics['total_loss']) if metrics['total_loss'] != 0 else float('inf')
             
             # Rizikos metrikos
-            if 'exit_reason' in trades_df.columns:
-                stop_loss_exits = trades_df[trades_df['exit_reason'] == 'stop_loss']
-                take_profit_exits = trades_df[trades_df['exit_reason'] == 'take_profit']
+            if 'exit_reason' in self._columns:
+                stop_loss_exits = self._exit_reasons.get('stop_loss', 0)
+                take_profit_exits = self._exit_reasons.get('take_profit', 0)
                 
-                metrics['stop_loss_exits'] = len(stop_loss_exits)
-                metrics['take_profit_exits'] = len(take_profit_exits)
-                metrics['stop_loss_rate'] = len(stop_loss_exits) / len(trades_df) if len(trades_df) > 0 else 0
-                metrics['take_profit_rate'] = len(take_profit_exits) / len(trades_df) if len(trades_df) > 0 else 0
+                metrics['stop_loss_exits'] = stop_loss_exits
+                metrics['take_profit_exits'] = take_profit_exits
+                metrics['stop_loss_rate'] = stop_loss_exits / total_trades
+                metrics['take_profit_rate'] = take_profit_exits / total_trades
             
             # Mokesčių ir praslydimo metrikos
-            if 'fees' in trades_df.columns:
-                metrics['total_fees'] = trades_df['fees'].sum()
-                metrics['average_fees'] = trades_df['fees'].mean()
+            if 'fees' in self._columns:
+                metrics['total_fees'] = self._total_fees
+                metrics['average_fees'] = self._total_fees / self._fee_count if self._fee_count else np.nan
             
-            if 'slippage' in trades_df.columns:
-                metrics['total_slippage'] = trades_df['slippage'].sum()
-                metrics['average_slippage'] = trades_df['slippage'].mean()
+            if 'slippage' in self._columns:
+                metrics['total_slippage'] = self._total_slippage
+                metrics['average_slippage'] = self._total_slippage / self._slippage_count if self._slippage_count else np.nan
         
         # Saugome metrikas
         self.metrics = metrics
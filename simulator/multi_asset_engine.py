@@ -0,0 +1,205 @@
+"""
+Kelių aktyvų simuliatoriaus variklis
+-----------------------------
+Šis modulis realizuoja kelių aktyvų simuliaciją su bendru grynųjų pinigų
+balansu. Signalai ir tiksliniai svoriai apskaičiuojami iš anksto visiems
+žingsniams ir aktyvams (matricomis), o ciklas eina tik per perbalansavimo
+žingsnius: tarp jų turimi kiekiai nesikeičia, todėl portfelio vertė
+kiekvienam žingsniui yra viena skaliarinė sandauga.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from simulator.execution.multi_asset_portfolio import MultiAssetPortfolio
+from simulator.execution.slippage import SlippageStream, slippage_fractions
+from simulator.utils.asset_panel import AssetPanel
+
+logger = logging.getLogger(__name__)
+
+class MultiAssetEngine:
+    """
+    Kelių aktyvų simuliatoriaus variklis.
+    """
+    def __init__(self, initial_balance=10000.0, fee_percentage=0.001, slippage_model='random',
+                 slippage_range=(0.0001, 0.002), rebalance_tolerance=0.0, seed=None):
+        """
+        Inicializuoja variklį.
+        
+        Args:
+            initial_balance (float): Pradinis USD balansas
+            fee_percentage (float): Komisinis mokestis (0.001 = 0.1%)
+            slippage_model (str): Praslydimo modelis ('random', 'fixed', 'proportional', 'none')
+            slippage_range (tuple): Praslydimo diapazono ribos (min, max)
+            rebalance_tolerance (float): Mažiausias sandorio dydis portfelio vertės dalimis
+            seed (int | numpy.random.SeedSequence, optional): Praslydimo atsitiktinumo sėkla
+        """
+        self.initial_balance = initial_balance
+        self.fee_percentage = fee_percentage
+        self.slippage_model = slippage_model
+        self.slippage_range = slippage_range
+        self.rebalance_tolerance = rebalance_tolerance
+        self.seed = seed
+        
+        self.panel = None
+        self.portfolio = None
+        self.trade_history = None
+        self.performance_metrics = {}
+        
+        logger.info(f"Inicializuotas kelių aktyvų simuliatorius: initial_balance={initial_balance}, "
+                    f"fee_percentage={fee_percentage}, slippage_model={slippage_model}")
+    
+    def load_data(self, data):
+        """
+        Įkelia kelių aktyvų duomenis.
+        
+        Args:
+            data (AssetPanel | dict): Panelė arba simbolis -> DataFrame žodynas
+        
+        Returns:
+            bool: True, jei duomenys įkelti
+        """
+        self.panel = data if isinstance(data, AssetPanel) else AssetPanel.from_frames(data)
+        self._close = self.panel['Close'].to_numpy(dtype=np.float64)
+        self.portfolio = MultiAssetPortfolio(self.panel.symbols, self.initial_balance)
+        
+        logger.info(f"Įkelti {len(self.panel.symbols)} aktyvų duomenys: {len(self.panel)} žingsnių")
+        return True
+    
+    def signal_matrix(self, generators):
+        """
+        Apskaičiuoja visų generatorių vidutinę signalų matricą.
+        
+        Args:
+            generators (list): Signalų generatoriai (turi palaikyti signal_values)
+        
+        Returns:
+            numpy.ndarray: Signalų matrica (žingsniai, aktyvai); NaN pakeičiami nuliais
+        """
+        signals = np.zeros(self.panel.value_shape)
+        for generator in generators:
+            values = generator.signal_values(self.panel)
+            if values is None:
+                raise ValueError(f"Generatorius {generator.name} nepalaiko vektorinių signalų")
+            signals += values
+        
+        if generators:
+            signals /= len(generators)
+        
+        return np.nan_to_num(signals)
+    
+    def run_simulation(self, generators, strategy):
+        """
+        Paleidžia kelių aktyvų simuliaciją.
+        Sprendimas, priimtas pagal žingsnio duomenis, vykdomas to paties žingsnio Close kaina.
+        
+        Args:
+            generators (list): Signalų generatoriai
+            strategy (SignalWeightStrategy): Kelių aktyvų strategija (target_weights)
+        
+        Returns:
+            dict: Simuliacijos rezultatai
+        """
+        if self.panel is None:
+            logger.error("Nėra įkeltų duomenų simuliacijai")
+            return {'error': 'No data loaded'}
+        
+        self.portfolio.reset()
+        close = self._close
+        n, m = close.shape
+        tradable = np.isfinite(close) & (close > 0)
+        
+        signals = self.signal_matrix(generators)
+        weights = np.where(tradable, strategy.target_weights(signals), 0.0)
+        
+        # Perbalansuojama tik tuose žingsniuose, kuriuose pasikeitė tiksliniai svoriai
+        rebalance = np.empty(n, dtype=bool)
+        rebalance[0] = np.any(weights[0] != 0)
+        rebalance[1:] = np.any(weights[1:] != weights[:-1], axis=1)
+        rebalance_points = np.flatnonzero(rebalance)
+        
+        stream = SlippageStream(self.seed)
+        valuation_prices = np.nan_to_num(close)
+        portfolio_values = np.empty(n)
+        cash_values = np.empty(n)
+        holdings_history = np.empty((n, m))
+        
+        trade_steps, trade_assets, trade_quantities, trade_prices, trade_fees = [], [], [], [], []
+        
+        boundaries = np.unique(np.r_[0, rebalance_points, n])
+        for segment_start, segment_end in zip(boundaries[:-1], boundaries[1:]):
+            if rebalance[segment_start]:
+                prices = close[segment_start]
+                uniforms = stream.take(m) if self.slippage_model == 'random' else None
+                slippage = slippage_fractions(self.slippage_model, np.nan_to_num(prices), self.slippage_range, uniforms)
+                assets, quantities, fill_prices, fees = self.portfolio.rebalance(
+                    weights[segment_start], prices, self.fee_percentage, slippage, self.rebalance_tolerance)
+                
+                trade_steps.append(np.full(len(assets), segment_start))
+                trade_assets.append(assets)
+                trade_quantities.append(quantities)
+                trade_prices.append(fill_prices)
+                trade_fees.append(fees)
+            
+            # Tarp perbalansavimų kiekiai pastovūs: vertė = grynieji + kainos @ kiekiai
+            holdings = self.portfolio.holdings
+            portfolio_values[segment_start:segment_end] = (
+                self.portfolio.cash + valuation_prices[segment_start:segment_end] @ holdings)
+            cash_values[segment_start:segment_end] = self.portfolio.cash
+            holdings_history[segment_start:segment_end] = holdings
+        
+        self.trade_history = self._trade_frame(trade_steps, trade_assets, trade_quantities, trade_prices, trade_fees)
+        portfolio_df = pd.DataFrame({'portfolio_value': portfolio_values, 'cash': cash_values},
+                                    index=self.panel.index.rename('timestamp'))
+        holdings_df = pd.DataFrame(holdings_history, index=portfolio_df.index, columns=self.panel.symbols)
+        
+        self.performance_metrics = self._calculate_performance_metrics(portfolio_values)
+        
+        logger.info(f"Kelių aktyvų simuliacija baigta: {n} žingsnių, {len(rebalance_points)} perbalansavimų, "
+                    f"{len(self.trade_history)} sandorių")
+        
+        return {
+            'portfolio_history': portfolio_df,
+            'holdings': holdings_df,
+            'weights': pd.DataFrame(weights, index=portfolio_df.index, columns=self.panel.symbols),
+            'trade_history': self.trade_history,
+            'performance_metrics': self.performance_metrics
+        }
+    
+    def _trade_frame(self, steps, assets, quantities, prices, fees):
+        """
+        Sujungia perbalansavimų sandorius į vieną DataFrame.
+        """
+        if not steps:
+            return pd.DataFrame(columns=['timestamp', 'symbol', 'action', 'amount', 'price', 'fees'])
+        
+        steps = np.concatenate(steps)
+        assets = np.concatenate(assets)
+        quantities = np.concatenate(quantities)
+        
+        return pd.DataFrame({
+            'timestamp': self.panel.index[steps],
+            'symbol': np.asarray(self.panel.symbols, dtype=object)[assets],
+            'action': np.where(quantities > 0, 'buy', 'sell'),
+            'amount': np.abs(quantities),
+            'price': np.concatenate(prices),
+            'fees': np.concatenate(fees)
+        })
+    
+    def _calculate_performance_metrics(self, portfolio_values):
+        """
+        Apskaičiuoja pagrindines portfelio metrikas iš vertės kreivės.
+        """
+        peaks = np.maximum.accumulate(portfolio_values)
+        drawdowns = (peaks - portfolio_values) / peaks
+        returns = np.diff(portfolio_values) / portfolio_values[:-1]
+        
+        return {
+            'initial_balance': self.initial_balance,
+            'final_value': float(portfolio_values[-1]),
+            'total_return': float(portfolio_values[-1] / self.initial_balance - 1),
+            'max_drawdown': float(drawdowns.max()),
+            'volatility': float(returns.std()) if len(returns) else 0.0,
+            'total_trades': len(self.trade_history),
+            'total_fees': float(self.trade_history['fees'].sum()) if len(self.trade_history) else 0.0
+        }
@@ -0,0 +1,181 @@
+"""
+Kelių strategijų simuliacija vienu duomenų perėjimu
+-----------------------------
+Šis modulis leidžia palyginti daug strategijų variantų vienu metu:
+kiekvienas variantas turi savo variklį (portfelį, pozicijas, statistiką),
+tačiau duomenys, signalai ir žymeklis yra bendri - kiekvieno žingsnio
+signalai apskaičiuojami vieną kartą ir perduodami visiems variantams.
+"""
+
+import logging
+import pandas as pd
+from simulator.engine import SimulatorEngine
+
+logger = logging.getLogger(__name__)
+
+class MultiStrategyRunner:
+    """
+    Kelių strategijų variantų simuliacija su atskirais portfeliais ir bendru duomenų perėjimu.
+    """
+    def __init__(self, initial_balance=10000.0, engine_factory=None, **engine_kwargs):
+        """
+        Inicializuoja vykdytoją.
+        
+        Args:
+            initial_balance (float): Kiekvieno varianto pradinis balansas
+            engine_factory (callable, optional): Funkcija (varianto pavadinimas) -> SimulatorEngine; naudotina,
+                kai variantams reikia atskirų modelių (pvz. vėlinimo modelis su savo atsitiktinumo generatoriumi)
+            **engine_kwargs: SimulatorEngine parametrai, kai engine_factory nenurodyta
+        """
+        self.initial_balance = initial_balance
+        self.engine_kwargs = engine_kwargs
+        self.engine_factory = engine_factory or self._default_engine
+        
+        # Duomenis įkelia ir signalus generuoja vienas bendras variklis
+        self.lead = SimulatorEngine(initial_balance=initial_balance)
+        self.engines = {}
+    
+    def _default_engine(self, name):
+        return SimulatorEngine(initial_balance=self.initial_balance, portfolio_name=f"Simulator Portfolio {name}",
+                               **self.engine_kwargs)
+    
+    def load_data(self, data):
+        """
+        Įkelia ir paruošia duomenis (vieną kartą visiems variantams).
+        
+        Args:
+            data (pandas.DataFrame): Duomenų rinkinys su kainomis ir indikatoriais
+        
+        Returns:
+            bool: True, jei duomenys sėkmingai įkelti
+        """
+        return self.lead.load_data(data)
+    
+    def run(self, generators, variants, risk_params=None, event_driven=False, save_results=False,
+            persist_trades=False, pruners=None, prune_every=1):
+        """
+        Simuliuoja visus variantus vienu duomenų perėjimu.
+        
+        Args:
+            generators (list): Bendri SignalGenerator objektai
+            variants (dict): Varianto pavadinimas -> strategija arba strategijų sąrašas
+                (kiekvienas variantas turi turėti atskirus strategijų objektus)
+            risk_params (dict, optional): Rizikos parametrai
+            event_driven (bool): Ar praleisti žingsnius, kuriuose variantai nieko nedarytų
+            save_results (bool): Ar išsaugoti kiekvieno varianto rezultatus į failą
+            persist_trades (bool): Ar įrašyti kiekvieno varianto operacijas į saugyklą
+            pruners (list, optional): Nutraukimo taisyklės (žr. SimulatorEngine.run_simulation); nutraukti variantai
+                toliau nesimuliuojami
+            prune_every (int): Kas kiek duomenų eilučių tikrinti nutraukimo taisykles
+        
+        Returns:
+            dict: Varianto pavadinimas -> simuliacijos rezultatai (kaip SimulatorEngine.run_simulation)
+        """
+        if self.lead.data is None:
+            logger.error("Nėra įkeltų duomenų. Naudokite load_data() prieš vykdydami simuliaciją.")
+            return {'error': 'No data loaded'}
+        
+        generators = generators or []
+        n = len(self.lead.data)
+        
+        self.engines = {}
+        for name, strategies in variants.items():
+            engine = self.engine_factory(name)
+            engine.share_data(self.lead)
+            engine._start_run(generators, strategies if isinstance(strategies, (list, tuple)) else [strategies],
+                              risk_params, event_driven)
+            self.engines[name] = engine
+        
+        # Signalų ribos apskaičiuojamos vieną kartą, žingsniai su galimais sprendimais - kiekvienam variantui
+        wake_indices = {}
+        if event_driven:
+            signal_bound = self.lead._signal_bound(generators)
+            for name, engine in self.engines.items():
+                wake_indices[name] = engine._wake_indices(engine._run_components['strategies'], signal_bound)
+        
+        active = dict(self.engines)
+        next_prune_check = {name: prune_every for name in self.engines} if pruners else {}
+        prune_reasons = {}
+        shared_steps = 0
+        while active:
+            targets = {}
+            for name, engine in active.items():
+                if wake_indices.get(name) is not None:
+                    targets[name] = engine._next_wakeup(wake_indices[name])
+                else:
+                    targets[name] = engine.current_index + 1
+            
+            index = min(targets.values())
+            if index >= n:
+                break
+            
+            # Žingsnio duomenys ir signalai - vieną kartą visiems variantams
+            shared_bar = self.lead.bar_signals(generators, index)
+            shared_steps += 1
+            
+            for name, target in targets.items():
+                if target != index:
+                    continue
+                
+                engine = active[name]
+                strategies = engine._run_components['strategies']
+                engine._skip_to(index, strategies)
+                step_result = engine.step(generators, strategies, engine._run_components['risk_params'],
+                                          shared_bar=shared_bar)
+                
+                if 'error' in step_result or step_result.get('status') == 'finished':
+                    del active[name]
+                    continue
+                
+                engine._record_step(step_result)
+                
+                if name in next_prune_check and engine.current_index >= next_prune_check[name]:
+                    reason = engine._check_pruners(pruners)
+                    if reason is not None:
+                        prune_reasons[name] = reason
+                        del active[name]
+                        continue
+                    next_prune_check[name] = engine.current_index + prune_every
+        
+        results = {}
+        for name, engine in self.engines.items():
+            if name in active:
+                engine._skip_to(n, engine._run_components['strategies'])
+            if name in prune_reasons:
+                results[name] = engine._finish_run(save_results, persist_trades, 'pruned', prune_reasons[name])
+            else:
+                results[name] = engine._finish_run(save_results, persist_trades)
+        
+        logger.info(f"Simuliuota {len(self.engines)} variantų vienu perėjimu: {shared_steps} bendrų žingsnių iš {n}")
+        
+        return results
+    
+    def compare(self, results):
+        """
+        Sudaro variantų palyginimo lentelę.
+        
+        Args:
+            results (dict): run() rezultatai
+        
+        Returns:
+            pandas.DataFrame: Variantų rodikliai, surikiuoti pagal galutinę portfelio vertę
+        """
+        rows = []
+        for name, result in results.items():
+            history = result['portfolio_history']['portfolio_value']
+            final_value = history.iloc[-1] if len(history) else self.initial_balance
+            metrics = result.get('performance_metrics') or {}
+            online = result.get('online_metrics') or {}
+            rows.append({
+                'variant': name,
+                'final_value': final_value,
+                'total_return': final_value / self.initial_balance - 1,
+                'max_drawdown': -online.get('max_drawdown', 0.0),
+                'sharpe_ratio': online.get('sharpe_ratio', float('nan')),
+                'exposure': online.get('exposure', 0.0),
+                'trades': len(result['trade_history']),
+                'win_rate': metrics.get('win_rate', 0.0),
+                'status': result.get('status', 'finished')
+            })
+        
+        return pd.DataFrame(rows).set_index('variant').sort_values('final_value', ascending=False)
@@ -0,0 +1,529 @@
+"""
+Parametrų perrinkimo modulis
+-----------------------------
+Šis modulis realizuoja lygiagretų simuliacijos parametrų tinklelio perrinkimą:
+konfigūracijos paskirstomos per procesų telkinį, visi procesai skaito tą patį
+memmap failą, o metrikos surenkamos į vieną rezultatų lentelę.
+"""
+
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Numatytasis parametrų tinklelis, atitinkantis run_simulator.py komponentus
+DEFAULT_PARAM_GRID = {
+    'technical.threshold': [0.3],
+    'model.threshold': [0.6],
+    'hybrid.threshold': [0.3],
+    'hybrid.technical_weight': [1.0],
+    'hybrid.model_weight': [1.0],
+    'risk.risk_per_trade': [0.02],
+    'risk.max_risk_multiplier': [3.0],
+    'risk.stop_loss_atr_multiplier': [2.0],
+    'risk.take_profit_risk_ratio': [2.0],
+    'trend.cooldown_periods': [5],
+    'mean_reversion.z_score_threshold': [2.0],
+    'mean_reversion.lookback_period': [20],
+    'execution.participation_rate': [None],  # None - be apimties ribos ir rinkos poveikio
+    'execution.impact_coefficient': [1.0],
+    'execution.latency_bars': [None]  # None - sprendimai vykdomi tame pačiame žingsnyje
+}
+
+class SharedDataset:
+    """
+    Tik skaitymui skirtas duomenų rinkinys, saugomas memmap faile,
+    kad visi procesai naudotų tą pačią atmintį be kopijavimo per pickle.
+    """
+    def __init__(self, data, directory=None):
+        """
+        Išsaugo skaitinius duomenų stulpelius į .npy failą. Duomenys vieną kartą surikiuojami ir
+        papildomi testiniais signalais (kaip SimulatorEngine.load_data()), todėl procesai jų nekopijuoja.
+        
+        Args:
+            data (pandas.DataFrame): Duomenys su DatetimeIndex
+            directory (str, optional): Katalogas laikiniems failams
+        """
+        from simulator.optimization.walk_forward import prepare_features
+        
+        numeric = prepare_features(data).select_dtypes(include=[np.number, bool])
+        dropped = [col for col in data.columns if col not in numeric.columns]
+        if dropped:
+            logger.warning(f"Neskaitiniai stulpeliai neperduodami procesams: {dropped}")
+        
+        self.directory = tempfile.mkdtemp(prefix="sweep_data_", dir=directory)
+        self.values_path = os.path.join(self.directory, "values.npy")
+        self.index_path = os.path.join(self.directory, "index.npy")
+        self.columns = list(numeric.columns)
+        self.index_name = numeric.index.name
+        
+        np.save(self.values_path, numeric.to_numpy(dtype=np.float64))
+        np.save(self.index_path, numeric.index.to_numpy(dtype='datetime64[ns]'))
+    
+    def descriptor(self):
+        """
+        Grąžina aprašą, pagal kurį procesas gali prisijungti prie duomenų.
+        
+        Returns:
+            dict: Failų keliai ir stulpelių pavadinimai
+        """
+        return {
+            'values_path': self.values_path,
+            'index_path': self.index_path,
+            'columns': self.columns,
+            'index_name': self.index_name
+        }
+    
+    @staticmethod
+    def attach(descriptor):
+        """
+        Atkuria DataFrame iš memmap failo be duomenų kopijavimo.
+        
+        Args:
+            descriptor (dict): SharedDataset.descriptor() rezultatas
+        
+        Returns:
+            pandas.DataFrame: Duomenys, paremti memmap masyvu
+        
+        Raises:
+            RuntimeError: Jei pandas nukopijavo duomenis iš memmap masyvo
+        """
+        values = np.load(descriptor['values_path'], mmap_mode='r')
+        
+        # Indeksas ir stulpeliai priskiriami po sukūrimo - perdavus juos konstruktoriui pandas gali kopijuoti masyvą
+        frame = pd.DataFrame(values, copy=False)
+        frame.index = pd.DatetimeIndex(np.load(descriptor['index_path']), name=descriptor['index_name'])
+        frame.columns = descriptor['columns']
+        
+        if len(frame.columns) and not np.shares_memory(frame.iloc[:, 0].to_numpy(), values):
+            raise RuntimeError("Bendri duomenys nukopijuoti į proceso atmintį - DataFrame neparemtas memmap masyvu")
+        return frame
+    
+    def close(self):
+        """
+        Pašalina laikinus failus.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def expand_grid(param_grid):
+    """
+    Išskleidžia parametrų tinklelį į konfigūracijų sąrašą.
+    
+    Args:
+        param_grid (dict): Parametro pavadinimas -> galimų reikšmių sąrašas
+    
+    Returns:
+        list: Konfigūracijų žodynų sąrašas
+    """
+    grid = dict(DEFAULT_PARAM_GRID)
+    grid.update(param_grid or {})
+    
+    keys = list(grid.keys())
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in grid.values()]
+    
+    return [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+
+def build_components(config):
+    """
+    Sukuria signalų generatorius, strategijas ir rizikos parametrus pagal konfigūraciją.
+    
+    Args:
+        config (dict): Viena parametrų konfigūracija
+    
+    Returns:
+        tuple: (generators, strategies, risk_kwargs)
+    """
+    from simulator.signals.technical_indicator_signal_generator import TechnicalIndicatorSignalGenerator
+    from simulator.signals.model_prediction_signal_generator import ModelPredictionSignalGenerator
+    from simulator.signals.hybrid_signal_generator import HybridSignalGenerator
+    from simulator.strategies.trend_following_strategy import TrendFollowingStrategy
+    from simulator.strategies.mean_reversion_strategy import MeanReversionStrategy
+    
+    ti_generator = TechnicalIndicatorSignalGenerator(threshold=config['technical.threshold'])
+    ml_generator = ModelPredictionSignalGenerator(
+        prediction_col='predicted_direction',
+        confidence_col='confidence',
+        threshold=config['model.threshold']
+    )
+    hybrid_generator = HybridSignalGenerator(
+        [ti_generator, ml_generator],
+        weights={
+            ti_generator.name: config['hybrid.technical_weight'],
+            ml_generator.name: config['hybrid.model_weight']
+        },
+        threshold=config['hybrid.threshold']
+    )
+    
+    strategies = [
+        TrendFollowingStrategy(cooldown_periods=config['trend.cooldown_periods']),
+        MeanReversionStrategy(
+            z_score_threshold=config['mean_reversion.z_score_threshold'],
+            lookback_period=config['mean_reversion.lookback_period']
+        )
+    ]
+    
+    risk_kwargs = {
+        key.split('.', 1)[1]: value
+        for key, value in config.items()
+        if key.startswith('risk.')
+    }
+    
+    return [hybrid_generator], strategies, risk_kwargs
+
+def summarize_results(results, initial_balance):
+    """
+    Apskaičiuoja suvestines simuliacijos metrikas iš portfelio vertės istorijos.
+    
+    Args:
+        results (dict): SimulatorEngine.run_simulation() rezultatai
+        initial_balance (float): Pradinis balansas
+    
+    Returns:
+        dict: Metrikos
+    """
+    summary = {
+        'final_value': initial_balance,
+        'total_return': 0.0,
+        'max_drawdown': 0.0,
+        'sharpe_ratio': np.nan,
+        'total_trades': len(results.get('trade_history') or [])
+    }
+    
+    history = results.get('portfolio_history')
+    if history is not None and not history.empty:
+        values = history['portfolio_value'].to_numpy(dtype=np.float64)
+        summary['final_value'] = values[-1]
+        summary['total_return'] = values[-1] / initial_balance - 1
+        
+        online = results.get('online_metrics')
+        if online:
+            # Simuliacijos metu sukauptos metrikos
+            summary['max_drawdown'] = online['max_drawdown']
+            summary['sharpe_ratio'] = online['sharpe_ratio']
+            for key in ('max_drawdown_duration', 'exposure', 'time_in_market', 'turnover'):
+                summary[key] = online[key]
+        else:
+            running_max = np.maximum.accumulate(values)
+            summary['max_drawdown'] = np.min(values / running_max - 1)
+            
+            returns = np.diff(values) / values[:-1]
+            if len(returns) > 1 and returns.std() > 0:
+                summary['sharpe_ratio'] = np.sqrt(252) * returns.mean() / returns.std()
+    
+    # Pridedame skaitines prekybos statistikos metrikas
+    for key, value in (results.get('performance_metrics') or {}).items():
+        if isinstance(value, (int, float, np.number)) and key not in summary:
+            summary[key] = value
+    
+    return summary
+
+def simulate_config(data, config, initial_balance=10000.0, db_session=None, seed=None, pruners=None,
+                    prune_every=1, until=None, checkpoint_path=None, registry=None):
+    """
+    Vykdo vieną simuliaciją su nurodyta konfigūracija ir grąžina pilnus rezultatus.
+    
+    Args:
+        data (pandas.DataFrame): Duomenys simuliacijai
+        config (dict): Parametrų konfigūracija
+        initial_balance (float): Pradinis balansas
+        db_session: SQLAlchemy duomenų bazės sesija (None - simuliacija tik atmintyje)
+        seed (int | numpy.random.SeedSequence, optional): Praslydimo atsitiktinumo sėkla
+        pruners (list, optional): Nutraukimo taisyklės (žr. simulator.optimization.pruning)
+        prune_every (int): Kas kiek duomenų eilučių tikrinti nutraukimo taisykles
+        until (int, optional): Žingsnis, prieš kurį simuliacija sustabdoma
+        checkpoint_path (str, optional): Sustabdytos simuliacijos kontrolinis taškas: jei failas yra,
+            simuliacija tęsiama nuo jo, o vėl sustabdyta simuliacija į jį įrašoma
+        registry (RunRegistry, optional): Paleidimų registras - jau apskaičiuotos konfigūracijos
+            paimamos iš jo, o naujos į jį įrašomos
+    
+    Returns:
+        dict: SimulatorEngine.run_simulation() rezultatai
+    """
+    from simulator.engine import SimulatorEngine
+    from simulator.execution.latency import LatencyModel
+    from simulator.execution.market_impact import MarketImpactModel
+    from simulator.risk.risk_manager import RiskManager
+    
+    generators, strategies, risk_kwargs = build_components(config)
+    
+    market_impact = None
+    if config.get('execution.participation_rate') is not None:
+        market_impact = MarketImpactModel(
+            participation_rate=config['execution.participation_rate'],
+            impact_coefficient=config.get('execution.impact_coefficient', 1.0)
+        )
+    
+    latency = None
+    if config.get('execution.latency_bars') is not None:
+        latency = LatencyModel(delay_bars=config['execution.latency_bars'])
+    
+    simulator = SimulatorEngine(
+        db_session,
+        initial_balance=initial_balance,
+        portfolio_name=f"Parameter Sweep {os.getpid()}",
+        seed=seed,
+        market_impact=market_impact,
+        latency=latency,
+        registry=registry
+    )
+    simulator.risk_manager = RiskManager(**risk_kwargs)
+    
+    if not simulator.load_data(data):
+        return {'error': 'No data loaded'}
+    
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        results = simulator.resume_simulation(
+            checkpoint_path,
+            save_results=False,
+            persist_trades=False,
+            until=until,
+            pruners=pruners,
+            prune_every=prune_every
+        )
+    else:
+        results = simulator.run_simulation(
+            generators=generators,
+            strategy_list=strategies,
+            save_results=False,
+            persist_trades=False,
+            event_driven=True,
+            until=until,
+            pruners=pruners,
+            prune_every=prune_every
+        )
+    
+    if checkpoint_path and results.get('status') == 'paused':
+        simulator.save_checkpoint(checkpoint_path)
+    
+    return results
+
+def run_single_config(data, config, initial_balance=10000.0, db_session=None, seed=None, **run_kwargs):
+    """
+    Vykdo vieną simuliaciją su nurodyta konfigūracija.
+    
+    Args:
+        data (pandas.DataFrame): Duomenys simuliacijai
+        config (dict): Parametrų konfigūracija
+        initial_balance (float): Pradinis balansas
+        db_session: SQLAlchemy duomenų bazės sesija
+        seed (int | numpy.random.SeedSequence, optional): Praslydimo atsitiktinumo sėkla
+        **run_kwargs: Papildomi simulate_config() parametrai (pruners, prune_every, until, checkpoint_path, registry)
+    
+    Returns:
+        dict: Simuliacijos metrikos ir būsena ('finished', 'paused' arba 'pruned')
+    """
+    results = simulate_config(data, config, initial_balance, db_session, seed, **run_kwargs)
+    
+    if 'error' in results:
+        return {'error': results['error']}
+    
+    summary = summarize_results(results, initial_balance)
+    summary['status'] = results.get('status', 'finished')
+    summary['prune_reason'] = results.get('prune_reason')
+    summary['run_id'] = results.get('run_id')
+    
+    return summary
+
+# Proceso globalus kintamasis, nustatomas _init_worker funkcijoje
+_worker_data = None
+
+def _init_worker(descriptor, log_level):
+    """
+    Inicializuoja procesą: prisijungia prie bendrų duomenų.
+    Simuliacijos procesuose vykdomos be duomenų bazės, todėl prisijungimo duomenų nereikia.
+    
+    Args:
+        descriptor (dict): SharedDataset aprašas
+        log_level (int): Logerio lygis procese
+    """
+    global _worker_data
+    
+    logging.getLogger().setLevel(log_level)
+    logging.getLogger('simulator').setLevel(log_level)
+    
+    _worker_data = SharedDataset.attach(descriptor)
+
+def _run_worker(task):
+    """
+    Vykdo vieną konfigūraciją procese.
+    
+    Args:
+        task (tuple): (config_id, config, initial_balance, seed, run_kwargs)
+    
+    Returns:
+        dict: Konfigūracijos parametrai ir metrikos
+    """
+    config_id, config, initial_balance, seed, run_kwargs = task
+    row = {'config_id': config_id}
+    row.update(config)
+    
+    try:
+        row.update(run_single_config(_worker_data, config, initial_balance, seed=seed, **run_kwargs))
+    except Exception as e:
+        logger.error(f"Klaida vykdant konfigūraciją {config_id}: {e}")
+        row['error'] = str(e)
+    
+    return row
+
+class ParameterSweep:
+    """
+    Lygiagretus parametrų tinklelio perrinkimas per procesų telkinį.
+    """
+    def __init__(self, param_grid=None, initial_balance=10000.0, processes=None, log_level=logging.WARNING,
+                 seed=None, pruners=None, prune_every=24, halving=None, registry=None):
+        """
+        Inicializuoja parametrų perrinkimą.
+        
+        Args:
+            param_grid (dict): Parametro pavadinimas -> reikšmių sąrašas (žr. DEFAULT_PARAM_GRID)
+            initial_balance (float): Pradinis balansas kiekvienai simuliacijai
+            processes (int, optional): Procesų skaičius (numatyta - visi branduoliai)
+            log_level (int): Logerio lygis procesuose
+            seed (int, optional): Atsitiktinumo sėkla; kiekviena konfigūracija gauna nepriklausomą,
+                atkartojamą praslydimo srautą
+            pruners (list, optional): Nutraukimo taisyklės, taikomos kiekvienai simuliacijai
+                (pvz. DrawdownPruner, EquityPruner iš simulator.optimization.pruning)
+            prune_every (int): Kas kiek duomenų eilučių tikrinti nutraukimo taisykles
+            halving (SuccessiveHalving, optional): Nuoseklaus skaidymo planas - po kiekvienos pakopos
+                tęsiamos tik geriausios konfigūracijos
+            registry (RunRegistry, optional): Paleidimų registras - jau apskaičiuotos konfigūracijos
+                nevykdomos iš naujo (naudojamas tik simuliacijoms be nutraukimo taisyklių ir pakopų)
+        """
+        unknown = set(param_grid or {}) - set(DEFAULT_PARAM_GRID)
+        if unknown:
+            raise ValueError(f"Nežinomi parametrai: {sorted(unknown)}")
+        
+        self.param_grid = param_grid or {}
+        self.initial_balance = initial_balance
+        self.processes = processes or os.cpu_count() or 1
+        self.log_level = log_level
+        self.seed = seed
+        self.pruners = pruners
+        self.prune_every = prune_every
+        self.halving = halving
+        self.registry = registry
+        
+        logger.info(f"Inicializuotas parametrų perrinkimas: {len(self.configurations())} konfigūracijos, "
+                   f"{self.processes} procesai")
+    
+    def configurations(self):
+        """
+        Grąžina visas tinklelio konfigūracijas.
+        
+        Returns:
+            list: Konfigūracijų sąrašas
+        """
+        return expand_grid(self.param_grid)
+    
+    def run(self, data):
+        """
+        Vykdo visas konfigūracijas lygiagrečiai.
+        
+        Args:
+            data (pandas.DataFrame): Duomenys simuliacijai
+        
+        Returns:
+            pandas.DataFrame: Rezultatų lentelė (viena eilutė - viena konfigūracija); status stulpelis rodo,
+                ar simuliacija baigta ('finished'), nutraukta taisyklės ('pruned') ar atmesta pakopoje ('halved'),
+                o nebaigtų simuliacijų metrikos apskaičiuotos iki jų sustabdymo
+        """
+        configs = self.configurations()
+        seeds = np.random.SeedSequence(self.seed).spawn(len(configs))
+        
+        dataset = SharedDataset(data)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(dataset.descriptor(), self.log_level)
+            ) as executor:
+                if self.halving is None:
+                    rows = self._run_tasks(executor, configs, seeds, range(len(configs)))
+                else:
+                    rows = self._run_halving(executor, configs, seeds, len(data))
+        finally:
+            dataset.close()
+        
+        results_df = pd.DataFrame(rows).set_index('config_id').sort_index()
+        
+        logger.info(f"Parametrų perrinkimas baigtas: {len(results_df)} konfigūracijos, "
+                    f"{int((results_df.get('status') == 'finished').sum())} iki pabaigos")
+        
+        return results_df
+    
+    def _run_tasks(self, executor, configs, seeds, config_ids, **run_kwargs):
+        """
+        Vykdo konfigūracijas procesų telkinyje.
+        
+        Args:
+            executor (ProcessPoolExecutor): Procesų telkinys
+            configs (list): Visos konfigūracijos
+            seeds (list): Konfigūracijų atsitiktinumo sėklos
+            config_ids (iterable): Vykdomų konfigūracijų ID
+            **run_kwargs: Papildomi simulate_config() parametrai
+        
+        Returns:
+            list: Rezultatų eilutės
+        """
+        run_kwargs = dict(run_kwargs, pruners=self.pruners, prune_every=self.prune_every, registry=self.registry)
+        tasks = []
+        for config_id in config_ids:
+            task_kwargs = dict(run_kwargs)
+            if run_kwargs.get('checkpoint_path'):
+                task_kwargs['checkpoint_path'] = os.path.join(run_kwargs['checkpoint_path'], f"{config_id}.ckpt")
+            tasks.append((config_id, configs[config_id], self.initial_balance, seeds[config_id], task_kwargs))
+        
+        # Didesni paketai sumažina tarpprocesinio ryšio kaštus, kai konfigūracijų tūkstančiai
+        chunksize = max(1, len(tasks) // (self.processes * 4))
+        
+        return list(executor.map(_run_worker, tasks, chunksize=chunksize))
+    
+    def _run_halving(self, executor, configs, seeds, n):
+        """
+        Vykdo konfigūracijas nuoseklaus skaidymo pakopomis. Sustabdytų simuliacijų būsena įrašoma
+        į kontrolinius taškus, todėl kitoje pakopoje tęsiama nuo sustabdymo vietos, o ne iš naujo.
+        
+        Args:
+            executor (ProcessPoolExecutor): Procesų telkinys
+            configs (list): Visos konfigūracijos
+            seeds (list): Konfigūracijų atsitiktinumo sėklos
+            n (int): Duomenų eilučių skaičius
+        
+        Returns:
+            list: Rezultatų eilutės (kiekvienai konfigūracijai - paskutinės jos pakopos metrikos)
+        """
+        checkpoint_dir = tempfile.mkdtemp(prefix="sweep_rungs_")
+        rows = {}
+        active = list(range(len(configs)))
+        
+        try:
+            for rung, until in enumerate(self.halving.boundaries(n)):
+                scores = {}
+                for row in self._run_tasks(executor, configs, seeds, active, until=until,
+                                           checkpoint_path=checkpoint_dir):
+                    row['rung'] = rung
+                    rows[row['config_id']] = row
+                    if row.get('status') == 'paused':
+                        scores[row['config_id']] = row.get(self.halving.metric, np.nan)
+                
+                if until is None:
+                    break
+                
+                active = self.halving.select(scores)
+                for config_id in set(scores) - set(active):
+                    rows[config_id]['status'] = 'halved'
+                
+                logger.info(f"Pakopa {rung} (iki {until}/{n} žingsnio): tęsiama {len(active)} iš {len(scores)} "
+                            f"konfigūracijų")
+                if not active:
+                    break
+        finally:
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+        
+        return list(rows.values())
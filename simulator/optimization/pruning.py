@@ -0,0 +1,138 @@
+"""
+Simuliacijų nutraukimo modulis
+-----------------------------
+Šis modulis apibrėžia parametrų perrinkimo ankstyvojo stabdymo taisykles.
+Nutraukimo taisyklės tikrina vienos simuliacijos einamąsias metrikas
+(didžiausią kritimą, portfelio vertę) ir nutraukia akivaizdžiai nuostolingas
+simuliacijas. SuccessiveHalving palygina konfigūracijas tarpusavyje: kiekvienoje
+pakopoje tęsiama tik geriausia konfigūracijų dalis, todėl skaičiavimai
+sutelkiami perspektyviose parametrų srityse.
+"""
+
+import logging
+import math
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class DrawdownPruner:
+    """
+    Nutraukia simuliaciją, kai didžiausias kritimas viršija ribą.
+    """
+    def __init__(self, max_drawdown=0.3, min_bars=0):
+        """
+        Inicializuoja taisyklę.
+        
+        Args:
+            max_drawdown (float): Didžiausias leidžiamas kritimas (0.3 = 30%)
+            min_bars (int): Kiek žingsnių taisyklė netikrinama simuliacijos pradžioje
+        """
+        self.max_drawdown = max_drawdown
+        self.min_bars = min_bars
+    
+    def __call__(self, metrics):
+        """
+        Args:
+            metrics (dict): SimulatorEngine.live_metrics() rezultatas
+        
+        Returns:
+            str: Nutraukimo priežastis arba None
+        """
+        if metrics['bars'] < self.min_bars:
+            return None
+        if -metrics['max_drawdown'] > self.max_drawdown:
+            return f"max_drawdown {-metrics['max_drawdown']:.2%} > {self.max_drawdown:.2%}"
+        return None
+
+class EquityPruner:
+    """
+    Nutraukia simuliaciją, kai portfelio vertė nukrenta žemiau pradinio balanso dalies.
+    """
+    def __init__(self, min_equity_ratio=0.8, min_bars=0):
+        """
+        Inicializuoja taisyklę.
+        
+        Args:
+            min_equity_ratio (float): Mažiausia leidžiama portfelio vertė pradinio balanso dalimis
+            min_bars (int): Kiek žingsnių taisyklė netikrinama simuliacijos pradžioje
+        """
+        self.min_equity_ratio = min_equity_ratio
+        self.min_bars = min_bars
+    
+    def __call__(self, metrics):
+        """
+        Args:
+            metrics (dict): SimulatorEngine.live_metrics() rezultatas
+        
+        Returns:
+            str: Nutraukimo priežastis arba None
+        """
+        if metrics['bars'] < self.min_bars:
+            return None
+        ratio = 1 + metrics['total_return']
+        if ratio < self.min_equity_ratio:
+            return f"equity {ratio:.2%} < {self.min_equity_ratio:.2%}"
+        return None
+
+class SuccessiveHalving:
+    """
+    Nuoseklaus skaidymo (successive halving) planas: konfigūracijos simuliuojamos pakopomis,
+    o po kiekvienos pakopos tęsiama tik geriausia 1/eta dalis.
+    """
+    def __init__(self, rungs=(0.25, 0.5), eta=2, metric='total_return', maximize=True, min_survivors=1):
+        """
+        Inicializuoja planą.
+        
+        Args:
+            rungs (tuple): Pakopų ribos duomenų dalimis (paskutinė pakopa - visi duomenys)
+            eta (float): Kelis kartus sumažinamas konfigūracijų skaičius po kiekvienos pakopos
+            metric (str): summarize_results() metrika, pagal kurią lyginamos konfigūracijos
+            maximize (bool): Ar didesnė metrikos reikšmė geresnė
+            min_survivors (int): Mažiausias tęsiamų konfigūracijų skaičius
+        """
+        if not all(0 < rung < 1 for rung in rungs) or list(rungs) != sorted(rungs):
+            raise ValueError("Pakopų ribos turi būti didėjančios ir tarp 0 ir 1")
+        if eta <= 1:
+            raise ValueError("eta turi būti didesnis už 1")
+        
+        self.rungs = tuple(rungs)
+        self.eta = eta
+        self.metric = metric
+        self.maximize = maximize
+        self.min_survivors = min_survivors
+    
+    def boundaries(self, n):
+        """
+        Apskaičiuoja pakopų sustabdymo žingsnius.
+        
+        Args:
+            n (int): Duomenų eilučių skaičius
+        
+        Returns:
+            list: Sustabdymo žingsniai (paskutinis None - iki duomenų pabaigos)
+        """
+        steps = sorted({max(2, int(n * rung)) for rung in self.rungs if int(n * rung) < n})
+        return steps + [None]
+    
+    def select(self, scores):
+        """
+        Atrenka tęsiamas konfigūracijas.
+        
+        Args:
+            scores (dict): Konfigūracijos ID -> metrikos reikšmė
+        
+        Returns:
+            list: Tęsiamų konfigūracijų ID
+        """
+        if not scores:
+            return []
+        
+        keep = max(self.min_survivors, math.ceil(len(scores) / self.eta))
+        ids = list(scores)
+        values = np.array([scores[i] for i in ids], dtype=np.float64)
+        
+        # NaN metrikos - blogiausios
+        values = np.where(np.isnan(values), -np.inf if self.maximize else np.inf, values)
+        order = np.argsort(-values if self.maximize else values, kind='stable')
+        
+        return [ids[i] for i in order[:keep]]
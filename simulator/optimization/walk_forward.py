@@ -0,0 +1,291 @@
+"""
+Walk-forward optimizavimo modulis
+-----------------------------
+Šis modulis realizuoja walk-forward optimizavimą: kiekvienam langui parametrai
+parenkami mokymosi intervale, o strategija vertinama sekančiame, nematytame
+intervale. Testavimo intervalų kapitalo kreivės sujungiamos į vieną.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from simulator.optimization import parameter_sweep as sweep
+from simulator.utils.data_diagnostics import add_test_signals, needs_test_signals
+
+logger = logging.getLogger(__name__)
+
+def prepare_features(data):
+    """
+    Vieną kartą apskaičiuoja simuliacijai reikalingus požymius visam duomenų rinkiniui,
+    kad langai juos tik išpjautų ir neperskaičiuotų.
+    
+    Args:
+        data (pandas.DataFrame): Pradiniai duomenys
+    
+    Returns:
+        pandas.DataFrame: Duomenys su požymiais
+    """
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index()
+    
+    # Ta pati sąlyga kaip SimulatorEngine.load_data(), kad variklis nebeperskaičiuotų požymių
+    if needs_test_signals(data):
+        data = add_test_signals(data)
+    
+    return data
+
+def retrain_prediction_model(train_data, test_data, forecast_horizon=1):
+    """
+    Apmoko prognozavimo modelį mokymosi lange ir sukuria prognozes nurodytiems duomenims.
+    Tinka kaip WalkForwardOptimizer model_fn argumentas (test_data - visas langas: mokymosi ir testavimo intervalai).
+    
+    Args:
+        train_data (pandas.DataFrame): Mokymosi lango duomenys
+        test_data (pandas.DataFrame): Duomenys, kuriems kuriamos prognozės
+        forecast_horizon (int): Kiek periodų į priekį prognozuoti
+    
+    Returns:
+        pandas.DataFrame: Testavimo duomenys su predicted_direction ir confidence stulpeliais
+    """
+    from sklearn.preprocessing import MinMaxScaler
+    from src.models.predictor import train_model
+    
+    feature_names = [col for col in train_data.columns if col not in ('predicted_direction', 'confidence')]
+    
+    train = train_data[feature_names].copy()
+    train['Target'] = train['Close'].shift(-forecast_horizon)
+    train = train.dropna()
+    
+    scaler = MinMaxScaler()
+    X_train = scaler.fit_transform(train[feature_names].to_numpy(dtype=np.float64))
+    model = train_model(X_train, train['Target'])
+    
+    # Testavimo lange NaN reikšmes užpildome, kad prognozė būtų kiekvienai eilutei
+    X_test = scaler.transform(test_data[feature_names].ffill().fillna(0).to_numpy(dtype=np.float64))
+    predicted_close = model.predict(X_test)
+    
+    result = test_data.copy()
+    expected_change = predicted_close / result['Close'].to_numpy() - 1
+    result['predicted_direction'] = np.where(expected_change > 0, 1, -1)
+    result['confidence'] = np.minimum(np.abs(expected_change) * 10, 1.0)
+    
+    return result
+
+def stitch_equity_curves(curves, initial_balance):
+    """
+    Sujungia testavimo langų kapitalo kreives į vieną ištisinę kreivę.
+    Kiekvienas langas pradedamas nuo ankstesnio lango galutinės vertės.
+    
+    Args:
+        curves (list): pandas.Series kapitalo kreivių sąrašas (chronologine tvarka)
+        initial_balance (float): Kiekvieno lango pradinis balansas
+    
+    Returns:
+        pandas.Series: Sujungta kapitalo kreivė
+    """
+    stitched = []
+    capital = initial_balance
+    
+    for curve in curves:
+        if curve is None or curve.empty:
+            continue
+        scaled = curve / initial_balance * capital
+        stitched.append(scaled)
+        capital = scaled.iloc[-1]
+    
+    if not stitched:
+        return pd.Series(dtype=np.float64, name='portfolio_value')
+    
+    return pd.concat(stitched).rename('portfolio_value')
+
+def _run_fold(task):
+    """
+    Vykdo vieną walk-forward langą procese: parenka parametrus ir įvertina testavimo intervale.
+    
+    Args:
+        task (dict): Lango aprašas
+    
+    Returns:
+        dict: Lango rezultatai
+    """
+    data = sweep._worker_data
+    initial_balance = task['initial_balance']
+    objective = task['objective']
+    
+    # Išpjauname langus iš bendro duomenų rinkinio (be požymių perskaičiavimo)
+    train_data = data.iloc[task['train_start']:task['train_end']]
+    test_data = data.iloc[task['test_start']:task['test_end']]
+    
+    if task['model_fn'] is not None:
+        # Modelis apmokomas tik mokymosi lange; jo prognozės naudojamos abiem intervalams, kad parametrai
+        # būtų parenkami pagal tas pačias (šiame lange - imties vidaus) prognozes, o ne pagal visos imties stulpelį
+        window = task['model_fn'](train_data, data.iloc[task['train_start']:task['test_end']])
+        split = task['train_end'] - task['train_start']
+        train_data = window.iloc[:split]
+        test_data = window.iloc[split:]
+    
+    # Parenkame geriausią konfigūraciją mokymosi intervale
+    best_config = None
+    best_score = -np.inf
+    for config in task['configs']:
+        metrics = sweep.run_single_config(train_data, config, initial_balance, seed=task['seed'])
+        score = metrics.get(objective, np.nan)
+        if score is not None and not np.isnan(score) and score > best_score:
+            best_score = score
+            best_config = config
+    
+    if best_config is None:
+        best_config = task['configs'][0]
+    
+    # Vertiname geriausią konfigūraciją testavimo intervale
+    results = sweep.simulate_config(test_data, best_config, initial_balance, seed=task['seed'])
+    
+    fold = {
+        'fold': task['fold'],
+        'train_start': data.index[task['train_start']],
+        'train_end': data.index[task['train_end'] - 1],
+        'test_start': data.index[task['test_start']],
+        'test_end': data.index[task['test_end'] - 1],
+        'train_score': best_score,
+        'best_config': best_config,
+        'equity_curve': None
+    }
+    
+    if 'error' in results:
+        fold['error'] = results['error']
+        return fold
+    
+    fold.update({f'test_{key}': value for key, value in sweep.summarize_results(results, initial_balance).items()})
+    
+    history = results.get('portfolio_history')
+    if history is not None and not history.empty:
+        fold['equity_curve'] = history['portfolio_value']
+    
+    return fold
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward optimizavimas su slenkančiais arba inkaruotais mokymosi langais.
+    """
+    def __init__(self, train_size, test_size, step_size=None, anchored=False, param_grid=None,
+                 objective='total_return', initial_balance=10000.0, model_fn=None,
+                 processes=None, log_level=logging.WARNING, seed=None):
+        """
+        Inicializuoja walk-forward optimizavimą.
+        
+        Args:
+            train_size (int): Mokymosi lango ilgis (žingsniais)
+            test_size (int): Testavimo lango ilgis (žingsniais)
+            step_size (int, optional): Lango postūmis (numatyta - test_size)
+            anchored (bool): Ar mokymosi langas visada prasideda nuo duomenų pradžios
+            param_grid (dict, optional): Parametrų tinklelis (žr. parameter_sweep.DEFAULT_PARAM_GRID)
+            objective (str): Metrika, pagal kurią renkama geriausia konfigūracija
+            initial_balance (float): Kiekvieno lango pradinis balansas
+            model_fn (callable, optional): Funkcija (train_data, data) -> data modeliui permokyti: apmokoma
+                mokymosi lange ir grąžina prognozes visam langui (mokymosi ir testavimo intervalams)
+            processes (int, optional): Procesų skaičius (numatyta - visi branduoliai)
+            log_level (int): Logerio lygis procesuose
+            seed (int, optional): Atsitiktinumo sėkla (kiekvienas langas gauna nepriklausomą praslydimo srautą,
+                bendrą visoms jo konfigūracijoms)
+        """
+        if train_size <= 0 or test_size <= 0:
+            raise ValueError("train_size ir test_size turi būti teigiami")
+        
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step_size = step_size or test_size
+        self.anchored = anchored
+        self.configs = sweep.expand_grid(param_grid)
+        self.objective = objective
+        self.initial_balance = initial_balance
+        self.model_fn = model_fn
+        self.processes = processes or os.cpu_count() or 1
+        self.log_level = log_level
+        self.seed = seed
+        
+        logger.info(f"Inicializuotas walk-forward optimizavimas: train_size={train_size}, test_size={test_size}, "
+                   f"step_size={self.step_size}, anchored={anchored}, {len(self.configs)} konfigūracijos")
+    
+    def split(self, n_samples):
+        """
+        Apskaičiuoja langų ribas.
+        
+        Args:
+            n_samples (int): Duomenų eilučių skaičius
+        
+        Returns:
+            list: (train_start, train_end, test_start, test_end) pozicijų sąrašas
+        """
+        folds = []
+        train_start = 0
+        train_end = self.train_size
+        
+        while train_end + self.test_size <= n_samples:
+            folds.append((train_start, train_end, train_end, train_end + self.test_size))
+            train_end += self.step_size
+            if not self.anchored:
+                train_start += self.step_size
+        
+        return folds
+    
+    def run(self, data):
+        """
+        Vykdo walk-forward optimizavimą. Nepriklausomi langai vykdomi lygiagrečiai.
+        
+        Args:
+            data (pandas.DataFrame): Duomenys su DatetimeIndex
+        
+        Returns:
+            dict: Rezultatai:
+                - folds: langų rezultatų lentelė
+                - equity_curve: sujungta testavimo intervalų kapitalo kreivė
+        """
+        features = prepare_features(data)
+        folds = self.split(len(features))
+        
+        if not folds:
+            logger.error("Per mažai duomenų walk-forward langams")
+            return {'folds': pd.DataFrame(), 'equity_curve': stitch_equity_curves([], self.initial_balance)}
+        
+        seeds = np.random.SeedSequence(self.seed).spawn(len(folds))
+        tasks = [
+            {
+                'fold': fold_id,
+                'train_start': train_start,
+                'train_end': train_end,
+                'test_start': test_start,
+                'test_end': test_end,
+                'configs': self.configs,
+                'objective': self.objective,
+                'initial_balance': self.initial_balance,
+                'model_fn': self.model_fn,
+                'seed': seeds[fold_id]
+            }
+            for fold_id, (train_start, train_end, test_start, test_end) in enumerate(folds)
+        ]
+        
+        logger.info(f"Pradedamas walk-forward optimizavimas: {len(tasks)} langai")
+        
+        dataset = sweep.SharedDataset(features)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.processes, len(tasks)),
+                initializer=sweep._init_worker,
+                initargs=(dataset.descriptor(), self.log_level)
+            ) as executor:
+                fold_results = list(executor.map(_run_fold, tasks))
+        finally:
+            dataset.close()
+        
+        equity_curve = stitch_equity_curves([fold.pop('equity_curve') for fold in fold_results], self.initial_balance)
+        folds_df = pd.DataFrame(fold_results).set_index('fold')
+        
+        if not equity_curve.empty:
+            logger.info(f"Walk-forward optimizavimas baigtas: galutinė vertė ${equity_curve.iloc[-1]:.2f}")
+        
+        return {
+            'folds': folds_df,
+            'equity_curve': equity_curve
+        }
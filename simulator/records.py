@@ -0,0 +1,203 @@
+"""
+Simuliatoriaus įrašų tipai
+-----------------------------
+Šis modulis apibrėžia kompaktiškus (__slots__) simuliatoriaus duomenų tipus:
+signalus, užsakymus (prekybos sprendimus), įvykdymus ir pozicijas.
+Įrašai palaiko ir žodyno sintaksę (record['key'], record.get('key'), 'key' in record),
+todėl esamas kodas, dirbantis su žodynais, veikia be pakeitimų.
+"""
+
+class Record:
+    """
+    Bazinė įrašo klasė su žodyno sąsaja.
+    Lauke esanti None reikšmė laikoma nenurodytu raktu.
+    """
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+    
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+    
+    def keys(self):
+        return [key for key in self.__slots__ if getattr(self, key) is not None]
+    
+    def to_dict(self):
+        """
+        Konvertuoja įrašą į žodyną (be nenurodytų laukų).
+        
+        Returns:
+            dict: Įrašo laukai
+        """
+        return {key: getattr(self, key) for key in self.keys()}
+    
+    def __repr__(self):
+        fields = ', '.join(f"{key}={getattr(self, key)!r}" for key in self.keys())
+        return f"{self.__class__.__name__}({fields})"
+
+class Signal(Record):
+    """
+    Prekybos signalas.
+    """
+    __slots__ = ('value', 'type', 'strength', 'timestamp', 'source', 'components',
+                 'prediction', 'confidence', 'alternative_source')
+    
+    def __init__(self, value=0, type='hold', strength=0, timestamp=None, source=None, components=None,
+                 prediction=None, confidence=None, alternative_source=None):
+        """
+        Args:
+            value (float): Signalo reikšmė: teigiama - pirkti, neigiama - parduoti, 0 - laikyti
+            type (str): Signalo tipas: 'buy', 'sell', 'hold'
+            strength (float): Signalo stiprumas nuo 0 iki 1
+            timestamp: Laiko žyma
+            source (str): Signalo šaltinis (generatoriaus pavadinimas)
+            components (dict, optional): Signalo sudedamosios dalys
+            prediction (float, optional): Modelio prognozė
+            confidence (float, optional): Modelio pasitikėjimas
+            alternative_source (str, optional): Alternatyvus šaltinis, jei prognozės nėra
+        """
+        self.value = value
+        self.type = type
+        self.strength = strength
+        self.timestamp = timestamp
+        self.source = source
+        self.components = components
+        self.prediction = prediction
+        self.confidence = confidence
+        self.alternative_source = alternative_source
+
+class Order(Record):
+    """
+    Prekybos sprendimas (užsakymas), kurį sugeneruoja strategija arba variklis.
+    """
+    __slots__ = ('action', 'amount', 'price', 'timestamp', 'strategy', 'symbol', 'reason', 'signal_value',
+                 'stop_loss', 'take_profit', 'order_type', 'limit_price', 'stop_price', 'time_in_force', 'good_for')
+    
+    def __init__(self, action='hold', amount=None, price=None, timestamp=None, strategy=None, symbol=None,
+                 reason=None, signal_value=None, stop_loss=None, take_profit=None, order_type='market',
+                 limit_price=None, stop_price=None, time_in_force=None, good_for=None):
+        """
+        Args:
+            action (str): 'buy', 'sell' arba 'hold'
+            amount (float, optional): BTC kiekis
+            price (float, optional): Kaina (None - dabartinė rinkos kaina)
+            timestamp: Sprendimo laikas
+            strategy (str, optional): Strategijos pavadinimas
+            symbol (str, optional): Prekybos simbolis
+            reason (str, optional): Sprendimo priežastis (pvz. 'stop_loss')
+            signal_value (float, optional): Bendra signalo reikšmė
+            stop_loss (float, optional): Stop-loss kaina
+            take_profit (float, optional): Take-profit kaina
+            order_type (str): 'market', 'limit', 'stop' arba 'stop_limit'
+            limit_price (float, optional): Ribinė kaina ('limit' ir 'stop_limit' užsakymams)
+            stop_price (float, optional): Suveikimo kaina ('stop' ir 'stop_limit' užsakymams)
+            time_in_force (str, optional): Galiojimas: 'GTC' (numatyta), 'IOC' arba 'GTD'
+            good_for (int, optional): Kiek žingsnių galioja 'GTD' užsakymas
+        """
+        self.action = action
+        self.amount = amount
+        self.price = price
+        self.timestamp = timestamp
+        self.strategy = strategy
+        self.symbol = symbol
+        self.reason = reason
+        self.signal_value = signal_value
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.stop_price = stop_price
+        self.time_in_force = time_in_force
+        self.good_for = good_for
+
+class Fill(Record):
+    """
+    Sėkmingai įvykdyto užsakymo rezultatas.
+    """
+    __slots__ = ('status', 'action', 'amount', 'target_price', 'execution_price', 'value', 'fees',
+                 'slippage', 'slippage_percentage', 'trade_id', 'remaining')
+    
+    def __init__(self, action, amount, target_price, execution_price, value, fees, slippage, trade_id=None,
+                 remaining=0.0):
+        """
+        Args:
+            action (str): 'buy' arba 'sell'
+            amount (float): BTC kiekis
+            target_price (float): Norima įvykdymo kaina
+            execution_price (float): Faktinė įvykdymo kaina
+            value (float): Operacijos vertė
+            fees (float): Mokesčiai
+            slippage (float): Praslydimas (absoliutus, USD)
+            trade_id (int, optional): Operacijos numeris žurnale
+            remaining (float): Neįvykdytas užsakymo likutis (dalinio įvykdymo atveju)
+        """
+        self.status = 'success'
+        self.action = action
+        self.amount = amount
+        self.target_price = target_price
+        self.execution_price = execution_price
+        self.value = value
+        self.fees = fees
+        self.slippage = slippage
+        self.slippage_percentage = slippage / target_price * 100 if target_price else 0.0
+        self.trade_id = trade_id
+        self.remaining = remaining
+
+class Position(Record):
+    """
+    Aktyvi prekybos pozicija.
+    """
+    __slots__ = ('position_type', 'entry_price', 'entry_cost', 'amount', 'stop_loss', 'take_profit',
+                 'entry_time', 'highest_price', 'trailing_stop_enabled', 'trailing_stop_percent',
+                 'leverage', 'margin', 'liquidation_price')
+    
+    def __init__(self, position_type, entry_price, amount, stop_loss, take_profit, entry_time,
+                 entry_cost=None, trailing_stop_enabled=True, trailing_stop_percent=0.02,
+                 leverage=1.0, margin=None, liquidation_price=None):
+        """
+        highest_price saugo palankiausią kainą nuo įėjimo: ilgajai pozicijai - aukščiausią,
+        trumpajai - žemiausią.
+        
+        Args:
+            position_type (str): 'long' arba 'short'
+            entry_price (float): Įėjimo kaina
+            amount (float): BTC kiekis
+            stop_loss (float): Stop-loss kaina
+            take_profit (float): Take-profit kaina
+            entry_time: Įėjimo laikas
+            entry_cost (float, optional): Įėjimo kaina su mokesčiais (numatyta - entry_price * amount);
+                trumpajai pozicijai - gautos pardavimo pajamos atėmus mokesčius
+            trailing_stop_enabled (bool): Ar naudojamas slankusis stop-loss
+            trailing_stop_percent (float): Slankiojo stop-loss atstumas nuo palankiausios kainos
+            leverage (float): Pozicijos svertas
+            margin (float, optional): Pozicijai skirta pradinė marža (None - be maržos)
+            liquidation_price (float, optional): Likvidavimo kaina (None - pozicija nelikviduojama)
+
+        """
+        self.position_type = position_type
+        self.entry_price = entry_price
+        self.entry_cost = entry_price * amount if entry_cost is None else entry_cost
+        self.amount = amount
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.entry_time = entry_time
+        self.highest_price = entry_price
+        self.trailing_stop_enabled = trailing_stop_enabled
+        self.trailing_stop_percent = trailing_stop_percent
+        self.leverage = leverage
+        self.margin = margin
+        self.liquidation_price = liquidation_price
@@ -3,20 +3,24 @@ Dinaminis rizikos reguliatorius
 -----------------------------
 Šis modulis realizuoja dinaminio rizikos reguliavimo funkcionalumą,
 kuris automatiškai koreguoja rizikos parametrus pagal prekybos rezultatus.
+Statistika skaičiuojama slenkančiame paskutinių sandorių (arba laiko) lange,
+saugomame fiksuoto dydžio žiediniame buferyje, todėl reguliavimas reaguoja
+į rinkos režimo pokyčius, o atmintis neauga.
 """
 
 import numpy as np
+import pandas as pd
 import logging
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 class DynamicRiskAdjuster:
     """
-    Dinaminio rizikos reguliavimo klasė, kuri koreguoja rizikos parametrus 
+    Dinaminio rizikos reguliavimo klasė, kuri koreguoja rizikos parametrus
     pagal naujausius prekybos rezultatus.
     """
-    def __init__(self, base_risk=0.02, min_risk=0.005, max_risk=0.05, adjustment_period=10):
+    def __init__(self, base_risk=0.02, min_risk=0.005, max_risk=0.05, adjustment_period=10, window=50,
+                 window_time=None):
         """
         Inicializuoja dinaminio rizikos reguliavimo komponentą.
         
@@ -25,24 +29,50 @@ class DynamicRiskAdjuster:
             min_risk (float): Minimali rizika (0.005 = 0.5%)
             max_risk (float): Maksimali rizika (0.05 = 5%)
             adjustment_period (int): Po kiek sandorių reguliuoti riziką
+            window (int): Kiek paskutinių sandorių įtraukiama į statistiką (žiedinio buferio dydis)
+            window_time (str | pandas.Timedelta, optional): Papildomas laiko langas - senesni sandoriai
+                pašalinami iš statistikos (pvz. '30D')
         """
+        if window < 1:
+            raise ValueError("Lango dydis turi būti teigiamas")
+        
         self.base_risk = base_risk
         self.current_risk = base_risk
         self.min_risk = min_risk
         self.max_risk = max_risk
         self.adjustment_period = adjustment_period
+        self.window = window
+        self.window_time = pd.Timedelta(window_time).to_timedelta64() if window_time is not None else None
+        
+        self.reset()
+        
+        logger.info(f"Inicializuotas dinaminis rizikos reguliatorius: base_risk={base_risk*100}%, "
+                   f"min_risk={min_risk*100}%, max_risk={max_risk*100}%, window={window}, "
+                   f"window_time={window_time}")
+    
+    def reset(self):
+        """
+        Išvalo sandorių langą ir atstato bazinę riziką.
+        """
+        self.current_risk = self.base_risk
+        self.update_count = 0  # visi update_risk() iškvietimai (reguliavimo periodui)
+        
+        # Žiedinis buferis: sandorių pelnai ir laiko žymos
+        self._profits = np.zeros(self.window)
+        self._times = np.full(self.window, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self._head = 0  # seniausio sandorio pozicija
+        self._size = 0
+        self._evictions = 0
         
-        # Statistikai
-        self.trades = []
+        # Slenkančio lango statistika
         self.win_count = 0
         self.loss_count = 0
-        self.consecutive_wins = 0
-        self.consecutive_losses = 0
-        self.total_profit = 0
-        self.total_loss = 0
+        self.total_profit = 0.0
+        self.total_loss = 0.0
         
-        logger.info(f"Inicializuotas dinaminis rizikos reguliatorius: base_risk={base_risk*100}%, "
-                   f"min_risk={min_risk*100}%, max_risk={max_risk*100}%")
+        # Paskutinių sandorių serijos (neapribotos langu)
+        self._win_streak = 0
+        self._loss_streak = 0
     
     def update_risk(self, trade_result):
         """
@@ -56,80 +86,276 @@ class DynamicRiskAdjuster:
                 - amount: BTC kiekis
                 - profit: Pelnas/nuostolis
         """
-        # Pridedame prekybos rezultatą į istoriją
-        self.trades.append(trade_result)
+        self.update_count += 1
         
         # Jei nėra profit reikšmės arba ji yra None, nieko nedarome
         if 'profit' not in trade_result or trade_result['profit'] is None:
             return
         
         # Atnaujiname statistiką
-        profit = trade_result['profit']
+        profit = float(trade_result['profit'])
+        if np.isnan(profit):
+            return
+        timestamp = trade_result.get('timestamp')
+        self._push(profit, np.datetime64(timestamp, 'ns') if timestamp is not None else np.datetime64('NaT'))
         
         if profit > 0:
-            self.win_count += 1
-            self.consecutive_wins += 1
-            self.consecutive_losses = 0
-            self.total_profit += profit
+            self._win_streak += 1
+            self._loss_streak = 0
         elif profit < 0:
-            self.loss_count += 1
-            self.consecutive_losses += 1
-            self.consecutive_wins = 0
-            self.total_loss += abs(profit)
+            self._loss_streak += 1
+            self._win_streak = 0
         
         # Jei turime pakankamai sandorių, reguliuojame riziką
-        if len(self.trades) % self.adjustment_period == 0:
+        if self.update_count % self.adjustment_period == 0:
             self._adjust_risk()
     
+    def _push(self, profit, timestamp):
+        """
+        Prideda sandorį į žiedinį buferį ir pašalina į langą nebepatenkančius sandorius.
+        
+        Args:
+            profit (float): Sandorio pelnas/nuostolis
+            timestamp (numpy.datetime64): Sandorio laiko žyma
+        """
+        if self._size == self.window:
+            self._evict()
+        
+        if self.window_time is not None and not np.isnat(timestamp):
+            cutoff = timestamp - self.window_time
+            while self._size and self._times[self._head] < cutoff:
+                self._evict()
+        
+        tail = (self._head + self._size) % self.window
+        self._profits[tail] = profit
+        self._times[tail] = timestamp
+        self._size += 1
+        self._add(profit, 1)
+    
+    def _evict(self):
+        profit = self._profits[self._head]
+        self._head = (self._head + 1) % self.window
+        self._size -= 1
+        self._add(profit, -1)
+        
+        # Išėjus paskutiniam pelningam/nuostolingam sandoriui, suma nustatoma tiksliai į nulį
+        if self.win_count == 0:
+            self.total_profit = 0.0
+        if self.loss_count == 0:
+            self.total_loss = 0.0
+        
+        # Sumos periodiškai perskaičiuojamos, kad nesikauptų slankiojo kablelio paklaidos
+        self._evictions += 1
+        if self._evictions % self.window == 0:
+            self._recompute()
+    
+    def _add(self, profit, sign):
+        if profit > 0:
+            self.win_count += sign
+            self.total_profit += sign * profit
+        elif profit < 0:
+            self.loss_count += sign
+            self.total_loss -= sign * profit
+    
+    def _recompute(self):
+        positions = (self._head + np.arange(self._size)) % self.window
+        profits = self._profits[positions]
+        self.win_count = int(np.count_nonzero(profits > 0))
+        self.loss_count = int(np.count_nonzero(profits < 0))
+        self.total_profit = float(profits[profits > 0].sum())
+        self.total_loss = float(-profits[profits < 0].sum())
+    
+    @property
+    def consecutive_wins(self):
+        """
+        int: Paskutinių pelningų sandorių serija lange.
+        """
+        return min(self._win_streak, self.win_count)
+    
+    @property
+    def consecutive_losses(self):
+        """
+        int: Paskutinių nuostolingų sandorių serija lange.
+        """
+        return min(self._loss_streak, self.loss_count)
+    
+    @property
+    def win_rate(self):
+        """
+        float: Pelningų sandorių dalis lange.
+        """
+        total_trades = self.win_count + self.loss_count
+        return self.win_count / total_trades if total_trades > 0 else 0
+    
+    @property
+    def profit_factor(self):
+        """
+        float: Pelno ir nuostolio santykis lange.
+        """
+        return self.total_profit / self.total_loss if self.total_loss > 0 else float('inf')
+    
     def _adjust_risk(self):
         """
         Koreguoja rizikos parametrus pagal naujausius prekybos rezultatus.
         """
         # Jei neturime pakankamai duomenų, nieko nedarome
-        if len(self.trades) < self.adjustment_period:
+        if self.update_count < self.adjustment_period:
             return
         
-        # Skaičiuojame win rate
-        total_trades = self.win_count + self.loss_count
-        win_rate = self.win_count / total_trades if total_trades > 0 else 0
+        win_rate = self.win_rate
+        profit_factor = self.profit_factor
         
-        # Skaičiuojame profit factor
-        profit_factor = self.total_profit / self.total_loss if self.total_loss > 0 else float('inf')
+        # Apskaičiuojame naują rizikos reikšmę ir ją apribojame
+        new_risk = self.base_risk * float(self._risk_adjustment(win_rate, profit_factor, self.consecutive_wins,
+                                                                self.consecutive_losses))
+        self.current_risk = max(self.min_risk, min(self.max_risk, new_risk))
         
-        # Pradiniai rizikos parametrai
-        risk_adjustment = 1.0
+        logger.debug("Rizikos parametrai dinamiškai pakoreguoti: current_risk=%.2f%%, win_rate=%.2f%%, profit_factor=%.2f, "
+                     "consecutive_wins=%d, consecutive_losses=%d", self.current_risk * 100, win_rate * 100, profit_factor,
+                     self.consecutive_wins, self.consecutive_losses)
+    
+    @staticmethod
+    def _risk_adjustment(win_rate, profit_factor, consecutive_wins, consecutive_losses):
+        """
+        Apskaičiuoja rizikos daugiklį (veikia ir su skaliarais, ir su masyvais).
+        
+        Args:
+            win_rate: Pelningų sandorių dalis
+            profit_factor: Pelno ir nuostolio santykis
+            consecutive_wins: Pelningų sandorių serija
+            consecutive_losses: Nuostolingų sandorių serija
         
-        # Koreguojame riziką pagal win rate
-        if win_rate > 0.6:  # Jei win rate aukštas, galime didinti riziką
-            risk_adjustment *= 1.2
-        elif win_rate < 0.4:  # Jei win rate žemas, mažiname riziką
-            risk_adjustment *= 0.8
+        Returns:
+            numpy.ndarray: Rizikos daugiklis
+        """
+        # Koreguojame riziką pagal win rate: jei aukštas, galime didinti riziką, jei žemas - mažiname
+        risk_adjustment = np.where(win_rate > 0.6, 1.2, np.where(win_rate < 0.4, 0.8, 1.0))
         
         # Koreguojame riziką pagal profit factor
-        if profit_factor > 2.0:  # Jei profit factor aukštas, galime didinti riziką
-            risk_adjustment *= 1.2
-        elif profit_factor < 1.0:  # Jei profit factor žemas, mažiname riziką
-            risk_adjustment *= 0.8
+        risk_adjustment = risk_adjustment * np.where(profit_factor > 2.0, 1.2, np.where(profit_factor < 1.0, 0.8, 1.0))
         
-        # Koreguojame riziką pagal nuoseklių nuostolių skaičių
-        if self.consecutive_losses > 3:
-            # Mažiname riziką po kelių nuoseklių nuostolių
-            risk_adjustment *= max(0.5, 1.0 - (self.consecutive_losses * 0.1))
+        # Mažiname riziką po kelių nuoseklių nuostolių
+        risk_adjustment = risk_adjustment * np.where(consecutive_losses > 3,
+                                                     np.maximum(0.5, 1.0 - np.multiply(consecutive_losses, 0.1)), 1.0)
         
-        # Koreguojame riziką pagal nuoseklių laimėjimų skaičių
-        if self.consecutive_wins > 3:
-            # Didžiname riziką po kelių nuoseklių laimėjimų
-            risk_adjustment *= min(1.5, 1.0 + (self.consecutive_wins * 0.05))
+        # Didžiname riziką po kelių nuoseklių laimėjimų
+        risk_adjustment = risk_adjustment * np.where(consecutive_wins > 3,
+                                                     np.minimum(1.5, 1.0 + np.multiply(consecutive_wins, 0.05)), 1.0)
         
-        # Apskaičiuojame naują rizikos reikšmę
-        new_risk = self.base_risk * risk_adjustment
+        return risk_adjustment
+    
+    def evaluate_batch(self, profits, timestamps=None):
+        """
+        Vektoriškai apskaičiuoja slenkančio lango statistiką ir rizikos kelią visam sandorių sąrašui
+        (kaip nuosekliai kviečiant update_risk() nuo tuščios būsenos). Būsena nekeičiama.
         
-        # Apribojame riziką
-        self.current_risk = max(self.min_risk, min(self.max_risk, new_risk))
+        Args:
+            profits (array-like): Sandorių pelnai (NaN - sandoris be pelno reikšmės)
+            timestamps (array-like, optional): Sandorių laiko žymos (reikalingos laiko langui)
+        
+        Returns:
+            dict: win_rate, profit_factor, consecutive_wins, consecutive_losses ir risk masyvai
+                (reikšmės po kiekvieno sandorio)
+        """
+        profits = np.asarray(profits, dtype=np.float64)
+        n = len(profits)
+        valid = np.flatnonzero(~np.isnan(profits))
+        values = profits[valid]
+        
+        # Slenkančio lango pradžia kiekvienam sandoriui su pelno reikšme
+        positions = np.arange(len(values))
+        window_start = np.maximum(positions - self.window + 1, 0)
+        if self.window_time is not None and timestamps is not None:
+            times = np.asarray(pd.DatetimeIndex(timestamps).to_numpy(dtype='datetime64[ns]'))[valid]
+            window_start = np.maximum(window_start, np.searchsorted(times, times - self.window_time, side='left'))
+        
+        def rolling_sum(x):
+            cumulative = np.concatenate(([0.0], np.cumsum(x)))
+            return cumulative[positions + 1] - cumulative[window_start]
+        
+        wins = rolling_sum(values > 0)
+        losses = rolling_sum(values < 0)
+        gross_profit = rolling_sum(np.where(values > 0, values, 0.0))
+        gross_loss = rolling_sum(np.where(values < 0, -values, 0.0))
+        
+        # Serijos: nuliniai sandoriai jų nenutraukia
+        decisive = np.flatnonzero(values != 0)
+        signs = np.sign(values[decisive])
+        run_index = np.arange(len(decisive))
+        run_start = np.maximum.accumulate(np.where(np.r_[True, signs[1:] != signs[:-1]], run_index, 0))
+        run_length = run_index - run_start + 1
+        last_decisive = np.searchsorted(decisive, positions, side='right') - 1
+        streak = np.where(last_decisive >= 0, run_length[np.maximum(last_decisive, 0)], 0)
+        streak_sign = np.where(last_decisive >= 0, signs[np.maximum(last_decisive, 0)], 0)
+        win_streak = np.minimum(np.where(streak_sign > 0, streak, 0), wins)
+        loss_streak = np.minimum(np.where(streak_sign < 0, streak, 0), losses)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            decided = wins + losses
+            win_rate = np.where(decided > 0, wins / decided, 0.0)
+            profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
         
-        logger.info(f"Rizikos parametrai dinamiškai pakoreguoti: current_risk={self.current_risk*100:.2f}%, "
-                   f"win_rate={win_rate*100:.2f}%, profit_factor={profit_factor:.2f}, "
-                   f"consecutive_wins={self.consecutive_wins}, consecutive_losses={self.consecutive_losses}")
+        # Rizika perskaičiuojama kas adjustment_period update_risk() iškvietimų
+        adjusted = (valid + 1) % self.adjustment_period == 0
+        new_risk = np.clip(self.base_risk * self._risk_adjustment(win_rate, profit_factor, win_streak, loss_streak),
+                           self.min_risk, self.max_risk)
+        risk_points = np.full(n, np.nan)
+        risk_points[valid[adjusted]] = new_risk[adjusted]
+        risk = pd.Series(risk_points).ffill().fillna(self.base_risk).to_numpy()
+        
+        # Statistika išplečiama visiems sandoriams (be pelno reikšmės - kaip po ankstesnio sandorio)
+        last_valid = np.searchsorted(valid, np.arange(n), side='right') - 1
+        
+        def expand(x, empty):
+            return np.where(last_valid >= 0, x[np.maximum(last_valid, 0)] if len(x) else empty, empty)
+        
+        return {
+            'win_rate': expand(win_rate, 0.0),
+            'profit_factor': expand(profit_factor, np.inf),
+            'consecutive_wins': expand(win_streak, 0).astype(int),
+            'consecutive_losses': expand(loss_streak, 0).astype(int),
+            'risk': risk
+        }
+    
+    def replay(self, trade_results):
+        """
+        Atkuria reguliatoriaus būseną iš viso sandorių sąrašo vienu vektoriniu perėjimu
+        (pvz. parametrų perrinkime vietoje nuoseklių update_risk() iškvietimų).
+        
+        Args:
+            trade_results (list): Prekybos rezultatų žodynų sąrašas (kaip update_risk())
+        
+        Returns:
+            dict: evaluate_batch() rezultatai
+        """
+        profits = np.array([np.nan if t.get('profit') is None else t['profit'] for t in trade_results],
+                           dtype=np.float64)
+        timestamps = None
+        if self.window_time is not None:
+            timestamps = [t.get('timestamp') for t in trade_results]
+        
+        batch = self.evaluate_batch(profits, timestamps)
+        
+        # Žiediniame buferyje paliekame tik paskutinį langą
+        self.reset()
+        valid = np.flatnonzero(~np.isnan(profits))
+        for i in valid[-self.window:]:
+            timestamp = trade_results[i].get('timestamp')
+            self._push(profits[i], np.datetime64(timestamp, 'ns') if timestamp is not None else np.datetime64('NaT'))
+        
+        decisive = profits[valid][profits[valid] != 0]
+        if len(decisive):
+            signs = np.sign(decisive)
+            change = np.flatnonzero(signs != signs[-1])
+            run = len(signs) - (change[-1] + 1 if len(change) else 0)
+            self._win_streak = run if signs[-1] > 0 else 0
+            self._loss_streak = run if signs[-1] < 0 else 0
+        
+        self.update_count = len(trade_results)
+        if len(trade_results):
+            self.current_risk = float(batch['risk'][-1])
+        
+        return batch
     
     def get_current_risk(self):
         """
@@ -142,24 +368,21 @@ class DynamicRiskAdjuster:
     
     def get_statistics(self):
         """
-        Grąžina prekybos statistiką.
+        Grąžina slenkančio lango prekybos statistiką.
         
         Returns:
             dict: Prekybos statistikos duomenys
         """
-        total_trades = self.win_count + self.loss_count
-        win_rate = self.win_count / total_trades if total_trades > 0 else 0
-        profit_factor = self.total_profit / self.total_loss if self.total_loss > 0 else float('inf')
-        
         return {
-            'total_trades': total_trades,
+            'total_trades': self.win_count + self.loss_count,
+            'window_trades': self._size,
             'win_count': self.win_count,
             'loss_count': self.loss_count,
-            'win_rate': win_rate,
-            'profit_factor': profit_factor,
+            'win_rate': self.win_rate,
+            'profit_factor': self.profit_factor,
             'consecutive_wins': self.consecutive_wins,
             'consecutive_losses': self.consecutive_losses,
             'total_profit': self.total_profit,
             'total_loss': self.total_loss,
             'current_risk': self.current_risk
-        }
\ No newline at end of file
+        }
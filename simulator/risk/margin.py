@@ -0,0 +1,151 @@
+"""
+Maržos ir finansavimo modulis
+-----------------------------
+Šis modulis realizuoja maržinės (amžinųjų ateities sandorių) prekybos
+apskaitą: pozicijų svertą, palaikomąją maržą, likvidavimo kainas ir
+finansavimo mokesčius. Likvidavimo kaina apskaičiuojama atidarant poziciją,
+o finansavimo mokesčiai sukaupiami iš anksto apskaičiuotame kaupiamajame
+indekse, todėl jų suma bet kuriam žingsnių intervalui gaunama iš karto.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class MarginModel:
+    """
+    Izoliuotos maržos modelis su likvidavimu ir finansavimo mokesčiais.
+    """
+    def __init__(self, leverage=1.0, maintenance_margin=0.005, liquidation_fee=0.005, funding_rate=0.0,
+                 funding_interval='8h', funding_column='funding_rate', allow_short=True):
+        """
+        Inicializuoja maržos modelį.
+        
+        Args:
+            leverage (float): Pozicijų svertas (1.0 - be sverto)
+            maintenance_margin (float): Palaikomoji marža pozicijos vertės dalimis
+            liquidation_fee (float): Likvidavimo mokestis pozicijos vertės dalimis
+            funding_rate (float): Finansavimo norma vienam finansavimo intervalui (teigiama - ilgosios pozicijos moka)
+            funding_interval (str | pandas.Timedelta): Finansavimo intervalas
+            funding_column (str): Duomenų stulpelis su kintama finansavimo norma (naudojamas vietoje funding_rate)
+            allow_short (bool): Ar leidžiama atidaryti trumpąsias pozicijas
+        """
+        if leverage < 1:
+            raise ValueError("Svertas negali būti mažesnis už 1")
+        if not 0 <= maintenance_margin < 1 / leverage:
+            raise ValueError("Palaikomoji marža turi būti mažesnė už pradinę maržą")
+        
+        self.leverage = float(leverage)
+        self.maintenance_margin = maintenance_margin
+        self.liquidation_fee = liquidation_fee
+        self.funding_rate = funding_rate
+        self.funding_interval = pd.Timedelta(funding_interval)
+        self.funding_column = funding_column
+        self.allow_short = allow_short
+        
+        # Kaupiamasis finansavimo indeksas (apskaičiuojamas prepare() metu)
+        self.funding_index = None
+        
+        logger.info(f"Inicializuotas maržos modelis: leverage={leverage}, maintenance_margin={maintenance_margin}, "
+                    f"funding_rate={funding_rate}/{self.funding_interval}, allow_short={allow_short}")
+    
+    def prepare(self, data):
+        """
+        Apskaičiuoja kaupiamąjį finansavimo indeksą: F[i] = sum(Close[k] * norma[k], k <= i),
+        kur norma perskaičiuota vienam žingsniui pagal žingsnio ilgį.
+        Pozicija q, laikoma žingsniais (a, b], sumoka q * (F[b] - F[a]).
+        
+        Args:
+            data (pandas.DataFrame): Simuliacijos duomenys su DatetimeIndex
+        """
+        n = len(data)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        
+        if self.funding_column in data.columns:
+            rates = data[self.funding_column].fillna(0.0).to_numpy(dtype=np.float64)
+        else:
+            rates = np.full(n, float(self.funding_rate))
+        
+        if not rates.any() or n < 2:
+            self.funding_index = np.zeros(n)
+            return
+        
+        # Norma perskaičiuojama pagal kiekvieno žingsnio trukmę
+        bar_lengths = pd.Series(data.index).diff()
+        bar_lengths.iloc[0] = bar_lengths.median()
+        bar_fractions = (bar_lengths / self.funding_interval).to_numpy(dtype=np.float64)
+        
+        self.funding_index = np.cumsum(close * rates * bar_fractions)
+        
+        logger.info(f"Finansavimo indeksas paruoštas: sukaupta {self.funding_index[-1]:.4f} USD vienam BTC")
+    
+    def initial_margin(self, notional):
+        """
+        Apskaičiuoja pradinę maržą pozicijos vertei.
+        
+        Args:
+            notional (float): Pozicijos vertė
+        
+        Returns:
+            float: Pradinė marža
+        """
+        return notional / self.leverage
+    
+    def liquidation_price(self, position_type, entry_price):
+        """
+        Apskaičiuoja izoliuotos maržos pozicijos likvidavimo kainą.
+        
+        Args:
+            position_type (str): 'long' arba 'short'
+            entry_price (float): Įėjimo kaina
+        
+        Returns:
+            float: Likvidavimo kaina (None, jei pozicija be sverto ir ilgoji)
+        """
+        if position_type == 'long':
+            if self.leverage == 1:
+                return None
+            return entry_price * (1 - 1 / self.leverage + self.maintenance_margin)
+        
+        return entry_price * (1 + 1 / self.leverage - self.maintenance_margin)
+    
+    def liquidation_offset(self, position_type, liquidation_price, high, low):
+        """
+        Vektoriškai suranda pirmą žingsnį, kuriame pasiekiama likvidavimo kaina.
+        
+        Args:
+            position_type (str): 'long' arba 'short'
+            liquidation_price (float): Likvidavimo kaina
+            high (numpy.ndarray): Žingsnių High kainos
+            low (numpy.ndarray): Žingsnių Low kainos
+        
+        Returns:
+            int: Žingsnio poslinkis arba None, jei kaina nepasiekta
+        """
+        if liquidation_price is None:
+            return None
+        
+        if position_type == 'long':
+            hits = np.flatnonzero(low <= liquidation_price)
+        else:
+            hits = np.flatnonzero(high >= liquidation_price)
+        
+        return int(hits[0]) if len(hits) else None
+    
+    def funding(self, amount, start, end):
+        """
+        Apskaičiuoja finansavimo mokestį pozicijai, laikomai žingsniais (start, end].
+        
+        Args:
+            amount (float): Pozicijos kiekis su ženklu (neigiamas - trumpoji pozicija)
+            start (int): Paskutinis jau apmokėtas žingsnis
+            end (int): Žingsnis, iki kurio mokama
+        
+        Returns:
+            float: Sumokėta suma (neigiama - gauta)
+        """
+        if self.funding_index is None or end <= start:
+            return 0.0
+        return float(amount * (self.funding_index[end] - self.funding_index[start]))
@@ -7,6 +7,7 @@ kuris apskaičiuoja pozicijos dydį, stop-loss ir take-profit reikšmes.
 
 import numpy as np
 import logging
+from simulator.records import Position
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +34,95 @@ class RiskManager:
                    f"max_risk_multiplier={max_risk_multiplier}, stop_loss_atr_multiplier={stop_loss_atr_multiplier}, "
                    f"take_profit_risk_ratio={take_profit_risk_ratio}")
     
+    def calculate_position_sizes(self, portfolio_value, entry_prices, stop_loss_prices, signal_strengths=0.5):
+        """
+        Vektoriškai apskaičiuoja pozicijų dydžius visiems kandidatams į sandorius.
+        
+        Args:
+            portfolio_value (float | numpy.ndarray): Portfelio vertė
+            entry_prices (numpy.ndarray): Įėjimo kainos
+            stop_loss_prices (numpy.ndarray): Stop-loss kainos
+            signal_strengths (float | numpy.ndarray): Signalų stiprumai (0-1)
+        
+        Returns:
+            numpy.ndarray: Pozicijų dydžiai (BTC kiekiai)
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        
+        # Rizikos daugiklis pagal signalo stiprumą ir rizikuojama suma
+        risk_multiplier = 1.0 + (self.max_risk_multiplier - 1.0) * np.asarray(signal_strengths, dtype=np.float64)
+        risk_amount = np.asarray(portfolio_value, dtype=np.float64) * self.risk_per_trade * risk_multiplier
+        
+        # Potencialus nuostolis vienam BTC (vienodoms kainoms - standartinė 2% rizika)
+        price_difference = np.abs(entry_prices - np.asarray(stop_loss_prices, dtype=np.float64))
+        price_difference = np.where(price_difference == 0, entry_prices * 0.02, price_difference)
+        
+        # Pozicijos dydis USD, konvertuotas į BTC kiekį
+        return risk_amount / price_difference / entry_prices
+    
+    def calculate_stop_loss_take_profit_levels(self, entry_prices, position_types, atr=None,
+                                               custom_sl_percentage=None, custom_tp_percentage=None):
+        """
+        Vektoriškai apskaičiuoja stop-loss ir take-profit kainas visiems kandidatams į sandorius.
+        
+        Args:
+            entry_prices (numpy.ndarray): Įėjimo kainos
+            position_types (str | numpy.ndarray): Pozicijų tipai ("long" arba "short")
+            atr (numpy.ndarray, optional): Average True Range reikšmės (NaN arba <= 0 - numatytasis 5% stop-loss)
+            custom_sl_percentage (float | numpy.ndarray, optional): Pasirinktiniai stop-loss procentai
+            custom_tp_percentage (float | numpy.ndarray, optional): Pasirinktiniai take-profit procentai
+        
+        Returns:
+            tuple: (stop_loss kainos, take_profit kainos)
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        
+        # Stop-loss procentas: pasirinktinis, pagal ATR arba numatytasis 5%
+        if custom_sl_percentage is not None:
+            sl_percentage = np.broadcast_to(np.asarray(custom_sl_percentage, dtype=np.float64), entry_prices.shape)
+        elif atr is not None:
+            atr = np.asarray(atr, dtype=np.float64)
+            with np.errstate(invalid='ignore'):
+                valid_atr = np.isfinite(atr) & (atr > 0)
+            sl_percentage = np.where(valid_atr, atr * self.stop_loss_atr_multiplier / entry_prices, 0.05)
+        else:
+            sl_percentage = np.full(entry_prices.shape, 0.05)
+        
+        # Take-profit proporcingas stop-loss, jei nenurodytas
+        if custom_tp_percentage is not None:
+            tp_percentage = np.asarray(custom_tp_percentage, dtype=np.float64)
+        else:
+            tp_percentage = sl_percentage * self.take_profit_risk_ratio
+        
+        is_long = np.asarray(position_types) == "long"
+        stop_loss_prices = entry_prices * np.where(is_long, 1 - sl_percentage, 1 + sl_percentage)
+        take_profit_prices = entry_prices * np.where(is_long, 1 + tp_percentage, 1 - tp_percentage)
+        
+        return stop_loss_prices, take_profit_prices
+    
+    def plan_entries(self, portfolio_value, entry_prices, position_types="long", atr=None, signal_strengths=0.5):
+        """
+        Vektoriškai apskaičiuoja visų kandidatų į sandorius rizikos parametrus: stop-loss, take-profit
+        ir pozicijos dydį (pvz. vektoriniam testavimui ar parametrų perrinkimui).
+        
+        Args:
+            portfolio_value (float | numpy.ndarray): Portfelio vertė
+            entry_prices (numpy.ndarray): Įėjimo kainos
+            position_types (str | numpy.ndarray): Pozicijų tipai ("long" arba "short")
+            atr (numpy.ndarray, optional): Average True Range reikšmės
+            signal_strengths (float | numpy.ndarray): Signalų stiprumai (0-1)
+        
+        Returns:
+            dict: size, stop_loss ir take_profit masyvai
+        """
+        stop_loss, take_profit = self.calculate_stop_loss_take_profit_levels(entry_prices, position_types, atr)
+        size = self.calculate_position_sizes(portfolio_value, entry_prices, stop_loss, signal_strengths)
+        
+        return {'size': size, 'stop_loss': stop_loss, 'take_profit': take_profit}
+    
     def calculate_position_size(self, portfolio_value, entry_price, stop_loss_price, signal_strength=0.5):
         """
-        Apskaičiuoja pozicijos dydį pagal rizikos valdymo taisykles.
+        Apskaičiuoja pozicijos dydį pagal rizikos valdymo taisykles (žr. calculate_position_sizes).
         
         Args:
             portfolio_value (float): Dabartinė portfelio vertė
@@ -46,32 +133,18 @@ class RiskManager:
         Returns:
             float: Pozicijos dydis (BTC kiekis)
         """
-        # Apskaičiuojame rizikos daugiklį pagal signalo stiprumą
-        risk_multiplier = 1.0 + (self.max_risk_multiplier - 1.0) * signal_strength
-        
-        # Apskaičiuojame rizikuojamą sumą
-        risk_amount = portfolio_value * self.risk_per_trade * risk_multiplier
-        
-        # Apskaičiuojame potencialų nuostolį vienam BTC
-        price_difference = abs(entry_price - stop_loss_price)
-        
-        if price_difference == 0:
+        if entry_price == stop_loss_price:
             logger.warning("Įėjimo kaina ir stop-loss kaina yra vienodos. Naudojama standartinė 2% rizika.")
-            price_difference = entry_price * 0.02
         
-        # Apskaičiuojame pozicijos dydį BTC
-        position_size = risk_amount / price_difference
+        btc_amount = float(self.calculate_position_sizes(portfolio_value, entry_price, stop_loss_price, signal_strength))
         
-        # Konvertuojame į BTC kiekį
-        btc_amount = position_size / entry_price
-        
-        logger.info(f"Apskaičiuotas pozicijos dydis: {btc_amount:.6f} BTC (rizikos suma: ${risk_amount:.2f})")
+        logger.debug("Apskaičiuotas pozicijos dydis: %.6f BTC", btc_amount)
         
         return btc_amount
     
     def calculate_stop_loss_take_profit(self, entry_price, position_type, atr=None, custom_sl_percentage=None, custom_tp_percentage=None):
         """
-        Apskaičiuoja stop-loss ir take-profit kainas.
+        Apskaičiuoja stop-loss ir take-profit kainas (žr. calculate_stop_loss_take_profit_levels).
         
         Args:
             entry_price (float): Įėjimo kaina
@@ -83,36 +156,44 @@ class RiskManager:
         Returns:
             tuple: (stop_loss_price, take_profit_price)
         """
-        # Nustatome stop-loss procentą
-        if custom_sl_percentage is not None:
-            sl_percentage = custom_sl_percentage
-        elif atr is not None and atr > 0:
-            # Naudojame ATR, jei jis yra nurodytas ir teigiamas
-            sl_percentage = (atr * self.stop_loss_atr_multiplier) / entry_price
-        else:
-            # Numatytasis stop-loss procentas
-            sl_percentage = 0.05  # 5%
+        stop_loss_price, take_profit_price = self.calculate_stop_loss_take_profit_levels(
+            entry_price, position_type, atr, custom_sl_percentage, custom_tp_percentage)
+        stop_loss_price, take_profit_price = float(stop_loss_price), float(take_profit_price)
         
-        # Nustatome take-profit procentą
-        if custom_tp_percentage is not None:
-            tp_percentage = custom_tp_percentage
-        else:
-            # Take-profit yra proporcingas stop-loss
-            tp_percentage = sl_percentage * self.take_profit_risk_ratio
+        logger.debug("%s pozicijos SL/TP: įėjimo kaina=$%.2f, stop-loss=$%.2f, take-profit=$%.2f",
+                     position_type.capitalize(), entry_price, stop_loss_price, take_profit_price)
         
-        # Apskaičiuojame stop-loss ir take-profit kainas priklausomai nuo pozicijos tipo
-        if position_type == "long":
-            stop_loss_price = entry_price * (1 - sl_percentage)
-            take_profit_price = entry_price * (1 + tp_percentage)
-        else:  # short
-            stop_loss_price = entry_price * (1 + sl_percentage)
-            take_profit_price = entry_price * (1 - tp_percentage)
+        return stop_loss_price, take_profit_price
+    
+    def create_position(self, entry_price, amount, entry_time, position_type="long", atr=None,
+                        entry_cost=None, trailing_stop_percent=0.02):
+        """
+        Sukuria naują poziciją su apskaičiuotomis stop-loss ir take-profit kainomis.
         
-        logger.info(f"{position_type.capitalize()} pozicijos SL/TP: įėjimo kaina=${entry_price:.2f}, "
-                   f"stop-loss=${stop_loss_price:.2f} ({sl_percentage*100:.2f}%), "
-                   f"take-profit=${take_profit_price:.2f} ({tp_percentage*100:.2f}%)")
+        Args:
+            entry_price (float): Įėjimo kaina
+            amount (float): BTC kiekis
+            entry_time: Įėjimo laikas
+            position_type (str): Pozicijos tipas ("long" arba "short")
+            atr (float, optional): Average True Range reikšmė
+            entry_cost (float, optional): Įėjimo kaina su mokesčiais
+            trailing_stop_percent (float): Slankiojo stop-loss atstumas nuo aukščiausios kainos
         
-        return stop_loss_price, take_profit_price
+        Returns:
+            Position: Nauja pozicija
+        """
+        stop_loss, take_profit = self.calculate_stop_loss_take_profit(entry_price, position_type, atr)
+        
+        return Position(
+            position_type=position_type,
+            entry_price=entry_price,
+            amount=amount,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            entry_time=entry_time,
+            entry_cost=entry_cost,
+            trailing_stop_percent=trailing_stop_percent
+        )
     
     def update_risk_parameters(self, performance_metrics):
         """
@@ -154,4 +235,4 @@ class RiskManager:
         # Trailing stop negali būti žemiau įėjimo kainos
         trailing_stop = max(trailing_stop, entry_price)
         
-        return trailing_stop
\ No newline at end of file
+        return trailing_stop
@@ -6,9 +6,23 @@ kuri naudojama kaip pagrindas visiems signalų generatoriams.
 """
 
 import logging
+import numpy as np
+from simulator.records import Signal
 
 logger = logging.getLogger(__name__)
 
+def value_shape(data):
+    """
+    Grąžina vektorinių signalų reikšmių formą.
+    
+    Args:
+        data (pandas.DataFrame | AssetPanel): Vieno aktyvo duomenys arba kelių aktyvų panelė
+    
+    Returns:
+        tuple: (žingsniai,) vienam aktyvui arba (žingsniai, aktyvai) panelei
+    """
+    return getattr(data, 'value_shape', (len(data),))
+
 class BaseSignalGenerator:  # Pakeitėm iš SignalGenerator į BaseSignalGenerator
     """
     Bazinė signalų generatoriaus klasė, kuri apibrėžia bendrą sąsają (interface).
@@ -33,38 +47,67 @@ class BaseSignalGenerator:  # Pakeitėm iš SignalGenerator į BaseSignalGenerat
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas signalas
+            Signal: Sugeneruotas signalas
         """
         # Bazinė klasė tiesiog grąžina tuščią signalą - turi būti perrašyta paveldėtose klasėse
         logger.warning(f"Bazinė BaseSignalGenerator.generate_signal() metodas iškviestas. Turi būti perrašytas paveldėtose klasėse.")
-        return {
-            'value': 0,  # Signalo reikšmė: teigiama - pirkti, neigiama - parduoti, 0 - laikyti
-            'type': 'hold',  # Signalo tipas: 'buy', 'sell', 'hold'
-            'strength': 0,  # Signalo stiprumas nuo 0 iki 1
-            'timestamp': timestamp,  # Laiko žyma
-            'source': self.name  # Signalo šaltinis (generatoriaus pavadinimas)
-        }
+        return Signal(
+            value=0,  # Signalo reikšmė: teigiama - pirkti, neigiama - parduoti, 0 - laikyti
+            type='hold',  # Signalo tipas: 'buy', 'sell', 'hold'
+            strength=0,  # Signalo stiprumas nuo 0 iki 1
+            timestamp=timestamp,  # Laiko žyma
+            source=self.name  # Signalo šaltinis (generatoriaus pavadinimas)
+        )
+    
+    def signal_values(self, data):
+        """
+        Vektoriškai apskaičiuoja signalo reikšmes (value) visiems žingsniams.
+        Duomenys gali būti vieno aktyvo DataFrame arba kelių aktyvų AssetPanel - tuomet
+        kiekvienas stulpelis yra (žingsniai, aktyvai) matrica ir reikšmės skaičiuojamos visiems aktyvams iš karto.
+        
+        Args:
+            data (pandas.DataFrame | AssetPanel): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: Signalo reikšmės (forma - value_shape(data)) arba None, jei generatorius to nepalaiko
+        """
+        return None
+    
+    def signal_bound(self, data):
+        """
+        Vektoriškai apskaičiuoja viršutinę signalo reikšmės modulio ribą kiekvienam žingsniui.
+        Naudojama įvykiais grindžiamoje simuliacijoje žingsniams, kuriuose strategijos
+        nieko nedarytų, praleisti.
+        
+        Args:
+            data (pandas.DataFrame): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: |value| viršutinė riba kiekvienam žingsniui arba None, jei jos apskaičiuoti negalima
+        """
+        values = self.signal_values(data)
+        return None if values is None else np.abs(values)
     
     def filter_signal(self, signal, threshold=0.3):
         """
         Filtruoja signalą pagal nurodytą slenkstį.
         
         Args:
-            signal (dict): Prekybos signalas
+            signal (Signal): Prekybos signalas
             threshold (float): Signalo stiprumo slenkstis (0-1)
         
         Returns:
-            dict: Filtruotas signalas
+            Signal: Filtruotas signalas
         """
         # Jei signalo stiprumas mažesnis už slenkstį, grąžiname 'hold' signalą
         if signal['strength'] < threshold:
-            return {
-                'value': 0,
-                'type': 'hold',
-                'strength': 0,
-                'timestamp': signal['timestamp'],
-                'source': signal['source']
-            }
+            return Signal(
+                value=0,
+                type='hold',
+                strength=0,
+                timestamp=signal['timestamp'],
+                source=signal['source']
+            )
         
         return signal
 
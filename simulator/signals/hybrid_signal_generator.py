@@ -8,7 +8,8 @@ kelis skirtingus signalų generatorius į vieną hibridinį generatorių.
 import pandas as pd
 import numpy as np
 import logging
-from simulator.signals.base_signal_generator import BaseSignalGenerator
+from simulator.records import Signal
+from simulator.signals.base_signal_generator import BaseSignalGenerator, value_shape
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,7 @@ class HybridSignalGenerator(BaseSignalGenerator):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas hibridinis signalas
+            Signal: Sugeneruotas hibridinis signalas
         """
         all_signals = []
         signals_by_generator = {}
@@ -55,18 +56,18 @@ class HybridSignalGenerator(BaseSignalGenerator):
             all_signals.append(signal)
             signals_by_generator[generator.name] = signal
             
-            logger.debug(f"Gautas signalas iš {generator.name}: {signal['type']}, stiprumas={signal['strength']:.2f}")
+            logger.debug("Gautas signalas iš %s: %s, stiprumas=%.2f", generator.name, signal['type'], signal['strength'])
         
         # Jei nėra signalų, grąžiname tuščią signalą
         if not all_signals:
             logger.warning("Negauta jokių signalų iš generatorių.")
-            return {
-                'value': 0,
-                'type': 'hold',
-                'strength': 0,
-                'timestamp': timestamp,
-                'source': self.name
-            }
+            return Signal(
+                value=0,
+                type='hold',
+                strength=0,
+                timestamp=timestamp,
+                source=self.name
+            )
         
         # Apskaičiuojame svertinį vidurkį
         weighted_sum = 0
@@ -94,15 +95,42 @@ class HybridSignalGenerator(BaseSignalGenerator):
             signal_type = 'hold'
         
         # Suformuojame hibridinį signalą
-        hybrid_signal = {
-            'value': combined_value,
-            'type': signal_type,
-            'strength': abs(combined_value),
-            'timestamp': timestamp,
-            'source': self.name,
-            'components': signals_by_generator
-        }
-        
-        logger.debug(f"Hibridinis generatorius sugeneravo signalą: {signal_type}, stiprumas={abs(combined_value):.2f}")
-        
-        return hybrid_signal
\ No newline at end of file
+        hybrid_signal = Signal(
+            value=combined_value,
+            type=signal_type,
+            strength=abs(combined_value),
+            timestamp=timestamp,
+            source=self.name,
+            components=signals_by_generator
+        )
+        
+        logger.debug("Hibridinis generatorius sugeneravo signalą: %s, stiprumas=%.2f", signal_type, abs(combined_value))
+        
+        return hybrid_signal
+    
+    def signal_values(self, data):
+        """
+        Vektoriškai apskaičiuoja hibridinio signalo reikšmes (svertinis komponentų reikšmių vidurkis).
+        
+        Args:
+            data (pandas.DataFrame | AssetPanel): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: Signalo reikšmės arba None, jei kuris nors generatorius jų neapskaičiuoja
+        """
+        weighted_sum = np.zeros(value_shape(data))
+        total_weight = 0
+        
+        for generator in self.generators:
+            generator_values = generator.signal_values(data)
+            if generator_values is None:
+                return None
+            
+            weight = self.weights.get(generator.name, 1.0)
+            weighted_sum += weight * generator_values
+            total_weight += weight
+        
+        if total_weight <= 0:
+            return np.zeros(value_shape(data))
+        
+        return weighted_sum / total_weight
@@ -8,7 +8,8 @@ mašininio mokymosi modelio prognozes prekybos signalams generuoti.
 import pandas as pd
 import numpy as np
 import logging
-from simulator.signals.base_signal_generator import BaseSignalGenerator
+from simulator.records import Signal
+from simulator.signals.base_signal_generator import BaseSignalGenerator, value_shape
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,7 @@ class ModelPredictionSignalGenerator(BaseSignalGenerator):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas signalas
+            Signal: Sugeneruotas signalas
         """
         # Jei trūksta stulpelių, naudojame techninio indikatoriaus signalus vietoj ML
         # arba grąžiname neutralų signalą
@@ -64,27 +65,27 @@ class ModelPredictionSignalGenerator(BaseSignalGenerator):
                     signal_value = 0
                     signal_type = 'hold'
                 
-                return {
-                    'value': signal_value,
-                    'type': signal_type,
-                    'strength': abs(signal_value),
-                    'timestamp': timestamp,
-                    'source': self.name,
-                    'prediction': None,
-                    'confidence': abs(signal_value),
-                    'alternative_source': 'RSI'
-                }
+                return Signal(
+                    value=signal_value,
+                    type=signal_type,
+                    strength=abs(signal_value),
+                    timestamp=timestamp,
+                    source=self.name,
+                    prediction=None,
+                    confidence=abs(signal_value),
+                    alternative_source='RSI'
+                )
             # Jei nėra techninių indikatorių, grąžiname neutralų signalą
             else:
-                return {
-                    'value': 0,
-                    'type': 'hold',
-                    'strength': 0,
-                    'timestamp': timestamp,
-                    'source': self.name,
-                    'prediction': None,
-                    'confidence': 0
-                }
+                return Signal(
+                    value=0,
+                    type='hold',
+                    strength=0,
+                    timestamp=timestamp,
+                    source=self.name,
+                    prediction=None,
+                    confidence=0
+                )
         
         # Gauname prognozę ir pasitikėjimą
         prediction = current_data[self.prediction_col]
@@ -102,18 +103,40 @@ class ModelPredictionSignalGenerator(BaseSignalGenerator):
             signal_type = 'hold'
             signal_value = 0
         
-        # Sukuriame signalo žodyną
-        signal = {
-            'value': signal_value,
-            'type': signal_type,
-            'strength': abs(signal_value),
-            'timestamp': timestamp,
-            'source': self.name,
-            'prediction': prediction,
-            'confidence': confidence
-        }
+        # Sukuriame signalą
+        signal = Signal(
+            value=signal_value,
+            type=signal_type,
+            strength=abs(signal_value),
+            timestamp=timestamp,
+            source=self.name,
+            prediction=prediction,
+            confidence=confidence
+        )
         
-        logger.debug(f"ML prognozių generatorius sugeneravo signalą: {signal_type}, "
-                    f"stiprumas={abs(signal_value):.2f}, prognozė={prediction}, pasitikėjimas={confidence:.2f}")
+        logger.debug("ML prognozių generatorius sugeneravo signalą: %s, stiprumas=%.2f, prognozė=%s, pasitikėjimas=%.2f",
+                     signal_type, abs(signal_value), prediction, confidence)
         
-        return signal
\ No newline at end of file
+        return signal
+    
+    def signal_values(self, data):
+        """
+        Vektoriškai apskaičiuoja signalo reikšmes visiems žingsniams.
+        
+        Args:
+            data (pandas.DataFrame | AssetPanel): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: Signalo reikšmės
+        """
+        if self.prediction_col not in data.columns or self.confidence_col not in data.columns:
+            # Alternatyvus RSI signalas
+            if 'RSI_14' in data.columns:
+                rsi = data['RSI_14'].to_numpy(dtype=np.float64)
+                return np.where(rsi < 30, 0.7, np.where(rsi > 70, -0.7, 0.0))
+            return np.zeros(value_shape(data))
+        
+        prediction = data[self.prediction_col].to_numpy(dtype=np.float64)
+        confidence = data[self.confidence_col].to_numpy(dtype=np.float64)
+        values = np.where(prediction == 1, confidence, -confidence)
+        return np.where(confidence >= self.threshold, values, 0.0)
@@ -7,6 +7,7 @@ kuris reguliariai generuoja pirkimo ir pardavimo signalus.
 
 import logging
 import random
+from simulator.records import Signal
 from simulator.signals.base_signal_generator import BaseSignalGenerator
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,9 @@ class SimpleTestSignalGenerator(BaseSignalGenerator):
     Paprastas signalų generatorius testavimui, kuris generuoja
     pirkimo ir pardavimo signalus pagal paprastą logiką.
     """
+    # Signalų stiprumas imamas iš globalaus random modulio (variklio sėkla jo neveikia)
+    uses_global_random = True
+    
     def __init__(self, interval=15, name=None):
         """
         Inicializuoja paprastą testavimo signalų generatorių.
@@ -47,7 +51,7 @@ class SimpleTestSignalGenerator(BaseSignalGenerator):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas signalas
+            Signal: Sugeneruotas signalas
         """
         # Padidiname žingsnių skaitliuką
         self.step_counter += 1
@@ -70,21 +74,21 @@ class SimpleTestSignalGenerator(BaseSignalGenerator):
             # Pridedame šiek tiek atsitiktinumo signalo stiprumui
             strength = abs(signal_value) * (0.8 + 0.4 * random.random())
             
-            logger.info(f"SimpleTestSignalGenerator sugeneravo signalą: {signal_type}, stiprumas={strength:.2f}")
+            logger.debug("SimpleTestSignalGenerator sugeneravo signalą: %s, stiprumas=%.2f", signal_type, strength)
         else:
             # Kitais atvejais generuojame neutralų "hold" signalą
             signal_type = "hold"
             signal_value = 0
             strength = 0
         
-        # Sukuriame signalo žodyną
-        signal = {
-            'value': signal_value,
-            'type': signal_type,
-            'strength': strength,
-            'timestamp': timestamp,
-            'source': self.name,
-            'components': {'test_signal': signal_value}
-        }
+        # Sukuriame signalą
+        signal = Signal(
+            value=signal_value,
+            type=signal_type,
+            strength=strength,
+            timestamp=timestamp,
+            source=self.name,
+            components={'test_signal': signal_value}
+        )
         
         return signal
\ No newline at end of file
@@ -8,7 +8,8 @@ techninius indikatorius prekybos signalams generuoti.
 import pandas as pd
 import numpy as np
 import logging
-from simulator.signals.base_signal_generator import BaseSignalGenerator
+from simulator.records import Signal
+from simulator.signals.base_signal_generator import BaseSignalGenerator, value_shape
 
 logger = logging.getLogger(__name__)
 
@@ -16,19 +17,21 @@ class TechnicalIndicatorSignalGenerator(BaseSignalGenerator):
     """
     Signalų generatorius, kuris naudoja techninius indikatorius.
     """
-    def __init__(self, indicators=None, name=None):
+    def __init__(self, indicators=None, threshold=0.3, name=None):
         """
         Inicializuoja techninių indikatorių signalų generatorių.
         
         Args:
             indicators (list): Indikatorių sąrašas
+            threshold (float): Signalo reikšmės slenkstis pirkimo/pardavimo signalui (0-1)
             name (str, optional): Generatoriaus pavadinimas
         """
         super().__init__(name=name or "TechnicalIndicatorSignalGenerator")
         
         self.indicators = indicators or ["SMA_Signal", "RSI_Signal", "MACD_Signal", "Bollinger_Signal"]
+        self.threshold = threshold
         
-        logger.info(f"Inicializuotas TechnicalIndicatorSignalGenerator su indikatoriais: {self.indicators}")
+        logger.info(f"Inicializuotas TechnicalIndicatorSignalGenerator su indikatoriais: {self.indicators}, threshold={threshold}")
     
     def generate_signal(self, current_data, historical_data, timestamp):
         """
@@ -40,7 +43,7 @@ class TechnicalIndicatorSignalGenerator(BaseSignalGenerator):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas signalas
+            Signal: Sugeneruotas signalas
         """
         # Inicializuojame signalo reikšmes
         signal_value = 0
@@ -65,27 +68,46 @@ class TechnicalIndicatorSignalGenerator(BaseSignalGenerator):
             signal_value /= len(self.indicators)
         
         # Nustatome signalo tipą pagal reikšmę
-        if signal_value > 0.3:
+        if signal_value > self.threshold:
             signal_type = 'buy'
-        elif signal_value < -0.3:
+        elif signal_value < -self.threshold:
             signal_type = 'sell'
         else:
             signal_type = 'hold'
         
-        # Sukuriame signalo žodyną
-        signal = {
-            'value': signal_value,
-            'type': signal_type,
-            'strength': abs(signal_value),
-            'timestamp': timestamp,
-            'source': self.name,
-            'components': signal_components
-        }
+        # Sukuriame signalą
+        signal = Signal(
+            value=signal_value,
+            type=signal_type,
+            strength=abs(signal_value),
+            timestamp=timestamp,
+            source=self.name,
+            components=signal_components
+        )
         
-        logger.debug(f"TI generatorius sugeneravo signalą: {signal_type}, stiprumas={abs(signal_value):.2f}")
+        logger.debug("TI generatorius sugeneravo signalą: %s, stiprumas=%.2f", signal_type, abs(signal_value))
         
         return signal
-
+    
+    def signal_values(self, data):
+        """
+        Vektoriškai apskaičiuoja signalo reikšmes visiems žingsniams.
+        
+        Args:
+            data (pandas.DataFrame | AssetPanel): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: Signalo reikšmės
+        """
+        values = np.zeros(value_shape(data))
+        for indicator in self.indicators:
+            if indicator in data.columns:
+                values += data[indicator].to_numpy(dtype=np.float64)
+        
+        if self.indicators:
+            values /= len(self.indicators)
+        
+        return values
 class MacdSignalGenerator(TechnicalIndicatorSignalGenerator):
     """
     Signalų generatorius, kuris specializuojasi MACD indikatoriumi.
@@ -109,13 +131,13 @@ class MacdSignalGenerator(TechnicalIndicatorSignalGenerator):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas signalas
+            Signal: Sugeneruotas signalas
         """
         # Tikriname, ar turime visus reikalingus duomenis
         required_columns = ["MACD", "MACD_signal", "MACD_hist"]
         if not all(col in current_data for col in required_columns):
             logger.warning(f"Trūksta MACD duomenų")
-            return {"value": 0, "type": "hold", "strength": 0, "timestamp": timestamp, "source": self.name, "components": {}}
+            return Signal(value=0, type="hold", strength=0, timestamp=timestamp, source=self.name, components={})
         
         macd = current_data["MACD"]
         macd_signal = current_data["MACD_signal"]
@@ -141,19 +163,33 @@ class MacdSignalGenerator(TechnicalIndicatorSignalGenerator):
             signal_type = "sell"
             signal_components["MACD_cross"] = "down"
         
-        signal = {
-            "value": signal_value,
-            "type": signal_type,
-            "strength": signal_strength,
-            "timestamp": timestamp,
-            "source": self.name,
-            "components": signal_components
-        }
+        signal = Signal(
+            value=signal_value,
+            type=signal_type,
+            strength=signal_strength,
+            timestamp=timestamp,
+            source=self.name,
+            components=signal_components
+        )
         
-        logger.info(f"MACD signalas: {signal_type} (stiprumas: {signal_strength:.2f})")
+        logger.debug("MACD signalas: %s (stiprumas: %.2f)", signal_type, signal_strength)
         
         return signal
-
+    
+    def signal_values(self, data):
+        """
+        Vektoriškai apskaičiuoja signalo reikšmes (MACD histogramą) visiems žingsniams.
+        
+        Args:
+            data (pandas.DataFrame | AssetPanel): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: Signalo reikšmės
+        """
+        if not all(col in data.columns for col in ["MACD", "MACD_signal", "MACD_hist"]):
+            return np.zeros(value_shape(data))
+        
+        return data["MACD_hist"].to_numpy(dtype=np.float64)
 class RsiSignalGenerator(TechnicalIndicatorSignalGenerator):
     """
     Signalų generatorius, kuris specializuojasi RSI indikatoriumi.
@@ -184,11 +220,11 @@ class RsiSignalGenerator(TechnicalIndicatorSignalGenerator):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Sugeneruotas signalas
+            Signal: Sugeneruotas signalas
         """
         if "RSI_14" not in current_data:
             logger.warning("Trūksta RSI_14 duomenų")
-            return {"value": 0, "type": "hold", "strength": 0, "timestamp": timestamp, "source": self.name, "components": {}}
+            return Signal(value=0, type="hold", strength=0, timestamp=timestamp, source=self.name, components={})
         
         rsi = current_data["RSI_14"]
         
@@ -201,20 +237,40 @@ class RsiSignalGenerator(TechnicalIndicatorSignalGenerator):
             signal_value = 1 - (rsi / self.oversold)
             signal_type = "buy"
         elif rsi > self.overbought:
-            signal_value = (rsi - self.overbought) / (100 - self.overbought)
+            signal_value = -(rsi - self.overbought) / (100 - self.overbought)
             signal_type = "sell"
         
         signal_strength = abs(signal_value)
         
-        signal = {
-            "value": signal_value,
-            "type": signal_type,
-            "strength": signal_strength,
-            "timestamp": timestamp,
-            "source": self.name,
-            "components": signal_components
-        }
+        signal = Signal(
+            value=signal_value,
+            type=signal_type,
+            strength=signal_strength,
+            timestamp=timestamp,
+            source=self.name,
+            components=signal_components
+        )
+        
+        logger.debug("RSI signalas: %s (stiprumas: %.2f)", signal_type, signal_strength)
+        
+        return signal
+    
+    def signal_values(self, data):
+        """
+        Vektoriškai apskaičiuoja signalo reikšmes visiems žingsniams.
+        
+        Args:
+            data (pandas.DataFrame | AssetPanel): Visi simuliacijos duomenys
+        
+        Returns:
+            numpy.ndarray: Signalo reikšmės
+        """
+        if "RSI_14" not in data.columns:
+            return np.zeros(value_shape(data))
         
-        logger.info(f"RSI signalas: {signal_type} (stiprumas: {signal_strength:.2f})")
+        rsi = data["RSI_14"].to_numpy(dtype=np.float64)
+        values = np.zeros(rsi.shape)
+        values = np.where(rsi < self.oversold, 1 - rsi / self.oversold, values)
+        values = np.where(rsi > self.overbought, -(rsi - self.overbought) / (100 - self.overbought), values)
         
-        return signal
\ No newline at end of file
+        return values
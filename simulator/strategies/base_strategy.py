@@ -41,7 +41,7 @@ class TradingStrategy(ABC):
             timestamp: Dabartinis laiko žymė
         
         Returns:
-            dict: Prekybos sprendimas su tokiais raktais:
+            Order: Prekybos sprendimas (simulator.records.Order) su tokiais laukais:
                 - action: 'buy', 'sell' arba 'hold'
                 - amount: BTC kiekis (jei None, naudojamas visas galimas kiekis)
                 - price: Kaina (jei None, naudojama dabartinė rinkos kaina)
@@ -50,6 +50,29 @@ class TradingStrategy(ABC):
         """
         pass
     
+    def wake_mask(self, data, signal_bound):
+        """
+        Nurodo žingsnius, kuriuose strategija gali priimti sprendimą (įvykiais grindžiamai simuliacijai).
+        Kituose žingsniuose strategija nekviečiama, o praleistų žingsnių skaičius perduodamas on_skip().
+        
+        Args:
+            data (pandas.DataFrame): Visi simuliacijos duomenys
+            signal_bound (numpy.ndarray): Didžiausia signalų |value| riba kiekvienam žingsniui (None - nežinoma)
+        
+        Returns:
+            numpy.ndarray: Loginė žingsnių kaukė arba None, jei strategiją reikia kviesti kiekvieną žingsnį
+        """
+        return None
+    
+    def on_skip(self, n_bars):
+        """
+        Iškviečiama, kai variklis praleidžia žingsnius, kuriuose strategija sprendimo nepriimtų.
+        
+        Args:
+            n_bars (int): Praleistų žingsnių skaičius
+        """
+        pass
+    
     def update_state(self, key, value):
         """
         Atnaujina strategijos būsenos reikšmę.
@@ -8,6 +8,7 @@ grįžimo prie vidurkio principu.
 import numpy as np
 import pandas as pd
 import logging
+from simulator.records import Order
 from simulator.strategies.base_strategy import TradingStrategy
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,7 @@ class MeanReversionStrategy(TradingStrategy):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Prekybos sprendimas
+            Order: Prekybos sprendimas
         """
         # Jei nėra kainų duomenų, negalime priimti sprendimo
         if 'Close' not in current_data:
@@ -67,30 +68,47 @@ class MeanReversionStrategy(TradingStrategy):
                 return None
         
         # Defoltinis sprendimas - laikyti
-        decision = {
-            'action': 'hold',
-            'price': current_price,
-            'timestamp': timestamp,
-            'strategy': self.name
-        }
+        decision = Order(
+            action='hold',
+            price=current_price,
+            timestamp=timestamp,
+            strategy=self.name
+        )
         
         # Jei kaina pernelyg aukšta (Z > threshold), parduodame
         if z_score > self.z_score_threshold and portfolio.btc_amount > 0:
-            decision['action'] = 'sell'
+            decision.action = 'sell'
             
             # Pardavimo dydis - visas BTC kiekis
-            decision['amount'] = portfolio.btc_amount
+            decision.amount = portfolio.btc_amount
             
-            logger.info(f"MeanReversionStrategy: sugeneruotas pardavimo sprendimas (z_score={z_score:.2f})")
+            logger.debug("MeanReversionStrategy: sugeneruotas pardavimo sprendimas (z_score=%.2f)", z_score)
         
         # Jei kaina pernelyg žema (Z < -threshold), perkame
         elif z_score < -self.z_score_threshold and portfolio.balance > 0:
-            decision['action'] = 'buy'
+            decision.action = 'buy'
             
             # Pirkimo dydis - 20% portfelio
             amount_to_spend = portfolio.balance * 0.2
-            decision['amount'] = amount_to_spend / current_price
+            decision.amount = amount_to_spend / current_price
             
-            logger.info(f"MeanReversionStrategy: sugeneruotas pirkimo sprendimas (z_score={z_score:.2f})")
+            logger.debug("MeanReversionStrategy: sugeneruotas pirkimo sprendimas (z_score=%.2f)", z_score)
         
-        return decision
\ No newline at end of file
+        return decision
+    
+    def wake_mask(self, data, signal_bound):
+        """
+        Sprendimas priimamas tik kai |z_score| viršija slenkstį.
+        
+        Args:
+            data (pandas.DataFrame): Visi simuliacijos duomenys
+            signal_bound (numpy.ndarray): Nenaudojama
+        
+        Returns:
+            numpy.ndarray: Loginė žingsnių kaukė (be z_score stulpelio - visi False, nes variklis
+                perduoda signalų sąrašą be istorinių duomenų ir sprendimas nepriimamas)
+        """
+        if 'z_score' not in data.columns:
+            return np.zeros(len(data), dtype=bool)
+        
+        return np.abs(data['z_score'].to_numpy(dtype=np.float64)) > self.z_score_threshold
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Signalų svorių strategija
+-----------------------------
+Šis modulis realizuoja kelių aktyvų strategiją, kuri signalų matricą
+(žingsniai, aktyvai) vektoriškai paverčia tikslinių portfelio svorių
+matrica: kapitalas paskirstomas aktyvams, kurių signalas viršija slenkstį,
+proporcingai signalo stiprumui.
+"""
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class SignalWeightStrategy:
+    """
+    Kelių aktyvų strategija, paskirstanti kapitalą pagal signalų stiprumą (tik ilgos pozicijos).
+    """
+    def __init__(self, name=None, threshold=0.0, max_positions=None, gross_exposure=1.0, max_weight=1.0):
+        """
+        Inicializuoja strategiją.
+        
+        Args:
+            name (str, optional): Strategijos pavadinimas
+            threshold (float): Mažiausia signalo reikšmė, nuo kurios aktyvas įtraukiamas į portfelį
+            max_positions (int, optional): Didžiausias vienu metu laikomų aktyvų skaičius (stipriausi signalai)
+            gross_exposure (float): Investuojama portfelio vertės dalis
+            max_weight (float): Didžiausias vieno aktyvo svoris
+        """
+        self.name = name or self.__class__.__name__
+        self.threshold = threshold
+        self.max_positions = max_positions
+        self.gross_exposure = gross_exposure
+        self.max_weight = max_weight
+        
+        logger.info(f"Inicializuota kelių aktyvų strategija: {self.name} (threshold={threshold}, "
+                    f"max_positions={max_positions}, gross_exposure={gross_exposure})")
+    
+    def target_weights(self, signals):
+        """
+        Apskaičiuoja tikslinius svorius visiems žingsniams ir aktyvams.
+        
+        Args:
+            signals (numpy.ndarray): Signalų reikšmių matrica (žingsniai, aktyvai)
+        
+        Returns:
+            numpy.ndarray: Tikslinių svorių matrica (žingsniai, aktyvai)
+        """
+        scores = np.where(signals > self.threshold, signals, 0.0)
+        
+        # Paliekame tik stipriausius signalus
+        if self.max_positions is not None and self.max_positions < scores.shape[1]:
+            cutoff = np.partition(scores, -self.max_positions, axis=1)[:, -self.max_positions][:, None]
+            scores = np.where(scores >= cutoff, scores, 0.0)
+        
+        totals = scores.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(totals > 0, scores / totals, 0.0) * self.gross_exposure
+        
+        return np.minimum(weights, self.max_weight)
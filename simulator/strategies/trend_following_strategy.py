@@ -8,6 +8,7 @@ tendencijų sekimo principu.
 import numpy as np
 import pandas as pd
 import logging
+from simulator.records import Order
 from simulator.strategies.base_strategy import TradingStrategy
 
 logger = logging.getLogger(__name__)
@@ -17,19 +18,22 @@ class TrendFollowingStrategy(TradingStrategy):
     Tendencijų sekimo strategija, kuri perka, kai formauojasi kylanti
     tendencija, ir parduoda, kai formauojasi krentanti tendencija.
     """
-    def __init__(self, cooldown_periods=5, name=None):
+    def __init__(self, cooldown_periods=5, name=None, allow_short=False):
         """
         Inicializuoja tendencijų sekimo strategiją.
         
         Args:
             cooldown_periods (int): Laikotarpių skaičius po sandorio prieš naują sandorį
             name (str, optional): Strategijos pavadinimas
+            allow_short (bool): Ar esant krentančiai tendencijai be BTC atidaryti trumpąją poziciją
+                (reikalingas variklio maržos modelis)
         """
         super().__init__(name=name or "TrendFollowingStrategy")
         
         self.cooldown_periods = cooldown_periods
         self.last_trade_time = None
         self.trade_cooldown_counter = 0
+        self.allow_short = allow_short
         
         logger.info(f"Inicializuota TrendFollowingStrategy strategija, cooldown_periods={cooldown_periods}")
     
@@ -44,7 +48,7 @@ class TrendFollowingStrategy(TradingStrategy):
             timestamp: Dabartinė laiko žyma
         
         Returns:
-            dict: Prekybos sprendimas
+            Order: Prekybos sprendimas
         """
         # Jei esame atvėsimo periodu, nesiūlome jokio sprendimo
         if self.trade_cooldown_counter > 0:
@@ -76,37 +80,63 @@ class TrendFollowingStrategy(TradingStrategy):
         avg_signal_value = total_signal_value / total_signal_strength
         
         # Defoltinis sprendimas - laikyti
-        decision = {
-            "action": "hold",
-            "price": current_price,
-            "timestamp": timestamp,
-            "strategy": self.name,
-            "signal_value": avg_signal_value
-        }
+        decision = Order(
+            action="hold",
+            price=current_price,
+            timestamp=timestamp,
+            strategy=self.name,
+            signal_value=avg_signal_value
+        )
         
         # Jei bendras signalas stipriai teigiamas ir turime pinigų, perkame
         if avg_signal_value > 0.5 and portfolio.balance > 0:
-            decision["action"] = "buy"
+            decision.action = "buy"
             
             # Pirkimo dydis - 30% portfelio
             amount_to_spend = portfolio.balance * 0.3
-            decision["amount"] = amount_to_spend / current_price
+            decision.amount = amount_to_spend / current_price
             
             # Nustatome atvėsimo periodą
             self.trade_cooldown_counter = self.cooldown_periods
             
-            logger.info(f"TrendFollowingStrategy: sugeneruotas pirkimo sprendimas (signal_value={avg_signal_value:.2f})")
+            logger.debug("TrendFollowingStrategy: sugeneruotas pirkimo sprendimas (signal_value=%.2f)", avg_signal_value)
         
-        # Jei bendras signalas stipriai neigiamas ir turime BTC, parduodame
-        elif avg_signal_value < -0.5 and portfolio.btc_amount > 0:
-            decision["action"] = "sell"
+        # Jei bendras signalas stipriai neigiamas ir turime BTC (arba leidžiamos trumposios pozicijos), parduodame
+        elif avg_signal_value < -0.5 and (portfolio.btc_amount > 0 or (self.allow_short and portfolio.btc_amount == 0)):
+            decision.action = "sell"
             
-            # Pardavimo dydis - 50% turimų BTC
-            decision["amount"] = portfolio.btc_amount * 0.5
+            # Pardavimo dydis - 50% turimų BTC (trumpąją poziciją dydį nustato variklis)
+            decision.amount = portfolio.btc_amount * 0.5
             
             # Nustatome atvėsimo periodą
             self.trade_cooldown_counter = self.cooldown_periods
             
-            logger.info(f"TrendFollowingStrategy: sugeneruotas pardavimo sprendimas (signal_value={avg_signal_value:.2f})")
+            logger.debug("TrendFollowingStrategy: sugeneruotas pardavimo sprendimas (signal_value=%.2f)", avg_signal_value)
         
-        return decision
\ No newline at end of file
+        return decision
+    
+    def wake_mask(self, data, signal_bound):
+        """
+        Sprendimas priimamas tik kai svertinis signalų vidurkis viršija ±0.5,
+        o jis negali viršyti didžiausio signalo modulio.
+        
+        Args:
+            data (pandas.DataFrame): Visi simuliacijos duomenys
+            signal_bound (numpy.ndarray): Didžiausia signalų |value| riba kiekvienam žingsniui
+        
+        Returns:
+            numpy.ndarray: Loginė žingsnių kaukė arba None
+        """
+        if signal_bound is None:
+            return None
+        
+        return signal_bound > 0.5
+    
+    def on_skip(self, n_bars):
+        """
+        Praleisti žingsniai mažina atvėsimo periodo skaitliuką.
+        
+        Args:
+            n_bars (int): Praleistų žingsnių skaičius
+        """
+        self.trade_cooldown_counter = max(0, self.trade_cooldown_counter - n_bars)
\ No newline at end of file
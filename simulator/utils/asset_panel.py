@@ -0,0 +1,108 @@
+"""
+Kelių aktyvų duomenų panelės modulis
+-----------------------------
+Šis modulis sulygina kelių simbolių duomenis į bendrą laiko ašį ir
+kiekvieną stulpelį (Close, RSI_14, ...) pateikia kaip (žingsniai, aktyvai)
+matricą. Signalų generatoriai panelę gali naudoti vietoje vieno aktyvo
+DataFrame ir reikšmes apskaičiuoti visiems aktyvams vienu metu.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class AssetPanel:
+    """
+    Sulygintų kelių aktyvų duomenų panelė.
+    """
+    def __init__(self, fields, symbols, index):
+        """
+        Inicializuoja panelę.
+        
+        Args:
+            fields (dict): Stulpelio pavadinimas -> (žingsniai, aktyvai) DataFrame
+            symbols (list): Aktyvų simboliai (matricų stulpelių tvarka)
+            index (pandas.Index): Bendra laiko ašis
+        """
+        self.symbols = list(symbols)
+        self.index = index
+        self._fields = fields
+    
+    @classmethod
+    def from_frames(cls, frames, columns=None):
+        """
+        Sukuria panelę iš atskirų simbolių DataFrame'ų.
+        Laiko ašis - visų simbolių laiko žymų sąjunga; trūkstamos reikšmės užpildomos paskutine žinoma
+        reikšme, o žingsniai iki pirmos simbolio reikšmės lieka NaN.
+        
+        Args:
+            frames (dict): Simbolis -> DataFrame su DatetimeIndex
+            columns (list, optional): Įtraukiami stulpeliai (numatyta - visiems simboliams bendri skaitiniai stulpeliai)
+        
+        Returns:
+            AssetPanel: Sulyginta panelė
+        """
+        if not frames:
+            raise ValueError("Nenurodyta nė vieno simbolio duomenų")
+        
+        symbols = list(frames)
+        if columns is None:
+            columns = [col for col in frames[symbols[0]].select_dtypes(include=[np.number]).columns
+                       if all(col in frames[symbol].columns for symbol in symbols)]
+        if 'Close' not in columns:
+            raise ValueError("Panelei būtinas Close stulpelis")
+        
+        index = frames[symbols[0]].index
+        for symbol in symbols[1:]:
+            index = index.union(frames[symbol].index)
+        
+        fields = {}
+        for col in columns:
+            field = pd.concat({symbol: frames[symbol][col] for symbol in symbols}, axis=1)
+            fields[col] = field.reindex(index).ffill().astype(np.float64)
+        
+        logger.info(f"Sukurta aktyvų panelė: {len(symbols)} simbolių, {len(index)} žingsnių, {len(columns)} stulpelių")
+        return cls(fields, symbols, index)
+    
+    @property
+    def columns(self):
+        """
+        list: Panelės stulpelių pavadinimai.
+        """
+        return list(self._fields)
+    
+    @property
+    def value_shape(self):
+        """
+        tuple: Vektorinių signalų reikšmių forma (žingsniai, aktyvai).
+        """
+        return (len(self.index), len(self.symbols))
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def __getitem__(self, column):
+        """
+        Grąžina stulpelio matricą.
+        
+        Args:
+            column (str): Stulpelio pavadinimas
+        
+        Returns:
+            pandas.DataFrame: (žingsniai, aktyvai) reikšmės
+        """
+        return self._fields[column]
+    
+    def asset(self, symbol):
+        """
+        Grąžina vieno simbolio duomenis įprastu DataFrame formatu (pvz. vieno aktyvo simuliatoriui).
+        
+        Args:
+            symbol (str): Simbolis
+        
+        Returns:
+            pandas.DataFrame: Simbolio duomenys bendroje laiko ašyje
+        """
+        return pd.DataFrame({col: field[symbol] for col, field in self._fields.items()}, index=self.index)
@@ -0,0 +1,74 @@
+"""
+Simuliacijos kontrolinių taškų modulis
+-----------------------------
+Šis modulis įrašo ir nuskaito simuliacijos būsenos kontrolinius taškus
+(suspaustas pickle failas). Iš kontrolinio taško simuliaciją galima tęsti
+arba atšakoti su kitais parametrais, nekartojant jau apskaičiuotos dalies.
+"""
+
+import gzip
+import logging
+import os
+import pickle
+from simulator.utils.run_registry import data_hash
+
+logger = logging.getLogger(__name__)
+
+# Kontrolinio taško formato versija
+CHECKPOINT_VERSION = 3
+
+def data_fingerprint(data, digest=None):
+    """
+    Apskaičiuoja duomenų rinkinio atpažinimo žymą (kontrolinis taškas tinka tik tiems patiems duomenims).
+    Turinio maiša atskiria ir duomenis, kurių kainos pakeistos tame pačiame laikotarpyje.
+    
+    Args:
+        data (pandas.DataFrame): Simuliacijos duomenys
+        digest (str, optional): Jau apskaičiuota duomenų turinio maiša (run_registry.data_hash())
+    
+    Returns:
+        tuple: (eilučių skaičius, pirmoji laiko žyma, paskutinė laiko žyma, turinio maiša)
+    """
+    return (len(data), data.index[0], data.index[-1], digest or data_hash(data))
+
+def write_checkpoint(state, path):
+    """
+    Įrašo būseną į kontrolinio taško failą.
+    Failas įrašomas per laikiną failą, todėl nutrūkęs įrašymas nesugadina ankstesnio taško.
+    
+    Args:
+        state (dict): Simuliacijos būsena
+        path (str): Failo kelias
+    
+    Returns:
+        str: Failo kelias
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wb", compresslevel=3) as f:
+        pickle.dump({'version': CHECKPOINT_VERSION, 'state': state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    
+    logger.debug(f"Kontrolinis taškas įrašytas: {path}")
+    return path
+
+def read_checkpoint(path):
+    """
+    Nuskaito būseną iš kontrolinio taško failo.
+    
+    Args:
+        path (str): Failo kelias
+    
+    Returns:
+        dict: Simuliacijos būsena
+    """
+    with gzip.open(path, "rb") as f:
+        payload = pickle.load(f)
+    
+    if payload.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Nepalaikoma kontrolinio taško versija: {payload.get('version')}")
+    
+    return payload['state']
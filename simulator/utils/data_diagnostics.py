@@ -97,6 +97,21 @@ def diagnose_data(data):
     
     return results
 
+def needs_test_signals(data):
+    """
+    Patikrina, ar duomenyse trūksta techninių indikatorių signalų arba ML prognozių
+    (tokiu atveju SimulatorEngine.load_data() prideda testinius signalus).
+    
+    Args:
+        data (pandas.DataFrame): Duomenų rinkinys
+    
+    Returns:
+        bool: True, jei reikia pridėti testinius signalus
+    """
+    has_indicators = any(col.endswith('_Signal') for col in data.columns)
+    has_predictions = 'predicted_direction' in data.columns and 'confidence' in data.columns
+    return not has_indicators or not has_predictions
+
 def add_test_signals(data):
     """
     Prideda testavimo signalų stulpelius į duomenis, jei jų trūksta.
@@ -0,0 +1,130 @@
+"""
+Simuliacijos įvykių įrašymo modulis
+-----------------------------
+Šis modulis realizuoja stulpelinį simuliacijos įvykių žurnalą: portfelio
+būsena kiekviename žingsnyje įrašoma į iš anksto išskirtus NumPy masyvus,
+o prekybos operacijos - į atskirą kompaktišką struktūrinį masyvą.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Prekybos operacijos įrašo struktūra
+TRADE_DTYPE = np.dtype([
+    ('time', 'datetime64[ns]'),
+    ('action', 'i1'),  # 1 - pirkimas, -1 - pardavimas
+    ('btc_amount', 'f8'),
+    ('price', 'f8'),
+    ('value', 'f8'),
+    ('commission', 'f8'),
+    ('balance_after', 'f8'),
+    ('btc_amount_after', 'f8'),
+    ('total_value_after', 'f8')
+])
+
+ACTION_CODES = {'buy': 1, 'sell': -1}
+
+class EventRecorder:
+    """
+    Stulpelinis simuliacijos įvykių žurnalas su iš anksto išskirta atmintimi.
+    """
+    BAR_COLUMNS = ('balance', 'btc_amount', 'btc_value', 'total_value', 'price')
+    
+    def __init__(self, n_bars, trade_capacity=64):
+        """
+        Inicializuoja įvykių žurnalą.
+        
+        Args:
+            n_bars (int): Maksimalus žingsnių skaičius (paprastai - duomenų eilučių skaičius)
+            trade_capacity (int): Pradinė operacijų masyvo talpa (esant poreikiui dvigubinama)
+        """
+        self.n_bars = max(1, n_bars)
+        self.trade_capacity = max(1, trade_capacity)
+        self.reset()
+    
+    def reset(self):
+        """
+        Išvalo žurnalą. Išskiriami nauji masyvai, nes ankstesnio paleidimo bars_frame()
+        rezultatai yra šių masyvų rodiniai ir neturi būti perrašyti.
+        """
+        self.time = np.empty(self.n_bars, dtype='datetime64[ns]')
+        for column in self.BAR_COLUMNS:
+            setattr(self, column, np.empty(self.n_bars, dtype=np.float64))
+        
+        self.trades = np.zeros(self.trade_capacity, dtype=TRADE_DTYPE)
+        self.bar_count = 0
+        self.trade_count = 0
+    
+    def record_bar(self, time, balance, btc_amount, btc_value, total_value, price):
+        """
+        Įrašo portfelio būseną žingsnio metu.
+        
+        Args:
+            time (numpy.datetime64): Simuliacijos laikas
+            balance (float): USD balansas
+            btc_amount (float): BTC kiekis
+            btc_value (float): BTC vertė USD
+            total_value (float): Bendra portfelio vertė
+            price (float): BTC kaina
+        """
+        i = self.bar_count
+        if i == self.n_bars:
+            raise IndexError(f"Viršytas žingsnių skaičius ({self.n_bars})")
+        
+        self.time[i] = time
+        self.balance[i] = balance
+        self.btc_amount[i] = btc_amount
+        self.btc_value[i] = btc_value
+        self.total_value[i] = total_value
+        self.price[i] = price
+        self.bar_count = i + 1
+    
+    def record_trade(self, time, action, btc_amount, price, commission, balance_after, btc_amount_after,
+                     total_value_after):
+        """
+        Įrašo prekybos operaciją.
+        
+        Args:
+            time (numpy.datetime64): Simuliacijos laikas
+            action (str): 'buy' arba 'sell'
+            btc_amount (float): BTC kiekis
+            price (float): Kaina
+            commission (float): Komisiniai
+            balance_after (float): Balansas po operacijos
+            btc_amount_after (float): BTC kiekis po operacijos
+            total_value_after (float): Portfelio vertė po operacijos
+        """
+        if self.trade_count == len(self.trades):
+            trades = np.zeros(len(self.trades) * 2, dtype=TRADE_DTYPE)
+            trades[:self.trade_count] = self.trades
+            self.trades = trades
+        
+        self.trades[self.trade_count] = (time, ACTION_CODES[action], btc_amount, price, btc_amount * price, commission,
+                                         balance_after, btc_amount_after, total_value_after)
+        self.trade_count += 1
+    
+    def bars_frame(self):
+        """
+        Grąžina portfelio būsenų DataFrame, sukurtą be duomenų kopijavimo
+        (reset() išskiria naujus masyvus, todėl rezultatas lieka nepakitęs ir po kito paleidimo).
+        
+        Returns:
+            pandas.DataFrame: Portfelio būsenos, indeksuotos pagal laiką
+        """
+        n = self.bar_count
+        index = pd.DatetimeIndex(self.time[:n], name='time', copy=False)
+        return pd.DataFrame({column: getattr(self, column)[:n] for column in self.BAR_COLUMNS},
+                            index=index, copy=False)
+    
+    def trades_frame(self):
+        """
+        Grąžina prekybos operacijų DataFrame.
+        
+        Returns:
+            pandas.DataFrame: Prekybos operacijos, indeksuotos pagal laiką
+        """
+        trades = self.trades[:self.trade_count]
+        df = pd.DataFrame({name: trades[name] for name in TRADE_DTYPE.names if name != 'time'},
+                          index=pd.DatetimeIndex(trades['time'], name='time'))
+        df['action'] = np.where(df['action'] > 0, 'buy', 'sell')
+        return df
@@ -0,0 +1,143 @@
+"""
+Simuliatoriaus žurnalo konfigūravimo modulis
+-----------------------------
+Šis modulis konfigūruoja simuliatoriaus žurnalą: vienas failo tvarkytuvas
+procesui, įrašai į failą rašomi atskiroje gijoje per eilę (QueueHandler ir
+QueueListener), todėl simuliacijos ciklas nelaukia disko operacijų.
+Pasirinktiems komponentams galima nustatyti atrankos dažnį - dažni
+žemesnio nei WARNING lygio įrašai praleidžiami, paliekant kas N-tąjį.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Proceso žurnalo būsena (po fork() procesas konfigūruojamas iš naujo)
+_state = {'pid': None, 'logger': None, 'handler': None, 'listener': None, 'path': None}
+_lock = threading.Lock()
+
+class SamplingFilter(logging.Filter):
+    """
+    Atrankos filtras: pasirinktų komponentų žemesnio nei WARNING lygio įrašai praleidžiami, paliekant kas N-tąjį.
+    """
+    def __init__(self, rates=None):
+        """
+        Inicializuoja filtrą.
+        
+        Args:
+            rates (dict, optional): Logerio pavadinimo pradžia -> N (paliekamas kas N-tasis įrašas),
+                pvz. {'simulator.signals': 100}
+        """
+        super().__init__()
+        self.rates = {}
+        self._counters = {}
+        self._resolved = {}
+        for prefix, every in (rates or {}).items():
+            self.set_rate(prefix, every)
+    
+    def set_rate(self, prefix, every):
+        """
+        Nustato komponento atrankos dažnį.
+        
+        Args:
+            prefix (str): Logerio pavadinimo pradžia
+            every (int): Paliekamas kas N-tasis įrašas (1 - visi)
+        """
+        if every < 1:
+            raise ValueError("Atrankos dažnis turi būti teigiamas")
+        self.rates[prefix] = int(every)
+        self._resolved = {}
+    
+    def _rate(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            # Tiksliausia (ilgiausia) sutampanti pavadinimo pradžia
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + '.')]
+            rate = self.rates[max(matches, key=len)] if matches else 1
+            self._resolved[name] = rate
+        return rate
+    
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        
+        rate = self._rate(record.name)
+        if rate == 1:
+            return True
+        
+        count = self._counters.get(record.name, 0)
+        self._counters[record.name] = count + 1
+        return count % rate == 0
+
+def configure_logging(level=logging.INFO, log_dir="logs/simulator", sampling=None, logger_name="simulator"):
+    """
+    Prijungia simuliatoriaus žurnalo failą. Kviečiant pakartotinai tame pačiame procese, naujas
+    tvarkytuvas nepridedamas - atnaujinamas tik lygis ir atrankos dažniai.
+    
+    Args:
+        level (int): Failo tvarkytuvo lygis
+        log_dir (str): Žurnalo failų katalogas
+        sampling (dict, optional): Komponentų atrankos dažniai (žr. SamplingFilter)
+        logger_name (str): Logeris, prie kurio prijungiamas tvarkytuvas
+    
+    Returns:
+        str: Žurnalo failo kelias
+    """
+    with _lock:
+        pid = os.getpid()
+        if _state['pid'] == pid:
+            handler = _state['handler']
+            handler.setLevel(level)
+            for prefix, every in (sampling or {}).items():
+                handler.sampling.set_rate(prefix, every)
+            return _state['path']
+        
+        target = logging.getLogger(logger_name)
+        
+        # Po fork() paveldėtas tvarkytuvas rašo į tėvinio proceso eilę, kurios niekas nebeskaito
+        if _state['handler'] is not None:
+            _state['logger'].removeHandler(_state['handler'])
+        
+        os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, f"simulator_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{pid}.log")
+        
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        
+        handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        handler.setLevel(level)
+        handler.sampling = SamplingFilter(sampling)
+        handler.addFilter(handler.sampling)
+        
+        listener = logging.handlers.QueueListener(handler.queue, file_handler, respect_handler_level=False)
+        listener.start()
+        
+        # Logerio lygis nekeičiamas: įrašus, kurių logeris neišleidžia, praleidžia jau logger.isEnabledFor()
+        target.addHandler(handler)
+        
+        _state.update(pid=pid, logger=target, handler=handler, listener=listener, path=path)
+    
+    return path
+
+def shutdown_logging():
+    """
+    Sustabdo žurnalo rašymo giją (įrašo likusius eilės įrašus) ir atjungia tvarkytuvą.
+    """
+    with _lock:
+        if _state['pid'] != os.getpid():
+            return
+        
+        _state['logger'].removeHandler(_state['handler'])
+        _state['listener'].stop()
+        for handler in _state['listener'].handlers:
+            handler.close()
+        
+        _state.update(pid=None, logger=None, handler=None, listener=None, path=None)
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,560 @@
+"""
+Simuliacijų paleidimų registras
+-----------------------------
+Šis modulis saugo baigtų simuliacijų rezultatus pagal paleidimo raktą -
+konfigūracijos ir įvesties duomenų maišos porą. Kiekvieno paleidimo portfelio
+vertės ir sandorių istorija įrašoma į suspaustą stulpelinį .npz failą, o
+metrikos ir konfigūracija - į SQLite indeksą, todėl identiška konfigūracija
+su tais pačiais duomenimis grąžinama iš registro, o šimtus paleidimų galima
+palyginti viena indeksuota užklausa.
+"""
+
+import contextlib
+import datetime
+import enum
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections import deque
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Registro formato versija (įtraukiama į konfigūracijos maišą - pakeitus formatą seni įrašai nebenaudojami)
+REGISTRY_VERSION = 1
+
+# Simuliatoriaus paketo katalogas - jo šaltinio kodo maiša įtraukiama į raktą
+SIMULATOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_REGISTRY_PATH = "data/runs"
+
+# Atributai, kurie neturi įtakos rezultatams (duomenų bazės ryšiai, žurnalai)
+IGNORED_ATTRIBUTES = frozenset({'db_session', 'session', 'journal', 'logger', 'sink', 'profiler'})
+
+# Indekso stulpeliai, pagal kuriuos galima rikiuoti paleidimus
+INDEX_COLUMNS = (
+    'run_id', 'config_hash', 'data_hash', 'label', 'created_at', 'status', 'bars', 'data_start', 'data_end',
+    'trades', 'final_value', 'total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'exposure', 'turnover',
+    'elapsed_s'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    config_hash TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    label TEXT,
+    created_at TEXT NOT NULL,
+    status TEXT,
+    bars INTEGER,
+    data_start TEXT,
+    data_end TEXT,
+    trades INTEGER,
+    final_value REAL,
+    total_return REAL,
+    sharpe_ratio REAL,
+    max_drawdown REAL,
+    win_rate REAL,
+    exposure REAL,
+    turnover REAL,
+    elapsed_s REAL,
+    path TEXT NOT NULL,
+    config_json TEXT,
+    metrics_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_config ON runs (config_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_data ON runs (data_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_total_return ON runs (total_return);
+CREATE INDEX IF NOT EXISTS idx_runs_sharpe_ratio ON runs (sharpe_ratio);
+CREATE INDEX IF NOT EXISTS idx_runs_max_drawdown ON runs (max_drawdown);
+"""
+
+class UncacheableConfig(ValueError):
+    """
+    Konfigūracijos negalima patikimai aprašyti maiša (išoriniai komponentai, funkcijos ar
+    globalaus random modulio būsena), todėl paleidimas į registrą neįrašomas ir iš jo neimamas.
+    """
+
+def _digest(*chunks):
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+def data_hash(data):
+    """
+    Apskaičiuoja duomenų rinkinio turinio maišą (indeksas, stulpelių pavadinimai ir visos reikšmės).
+    
+    Args:
+        data (pandas.DataFrame): Simuliacijos duomenys
+    
+    Returns:
+        str: Šešioliktainė maiša
+    """
+    row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    columns = json.dumps([str(column) for column in data.columns]).encode()
+    dtypes = json.dumps([str(dtype) for dtype in data.dtypes]).encode()
+    return _digest(columns, dtypes, str(data.index.dtype).encode(), row_hashes.tobytes())
+
+# Simuliatoriaus kodo maiša (apskaičiuojama pirmą kartą ją panaudojus)
+_code_version = None
+
+def code_version():
+    """
+    Apskaičiuoja simuliatoriaus šaltinio kodo maišą (visi simulator paketo .py failai). Pakeitus
+    variklio ar komponentų kodą keičiasi ir paleidimų raktai, todėl seni rezultatai nebenaudojami.
+    Maiša skaičiuojama vieną kartą per procesą.
+    
+    Returns:
+        str: Šešioliktainė maiša
+    """
+    global _code_version
+    if _code_version is None:
+        chunks = []
+        for directory, subdirectories, files in os.walk(SIMULATOR_ROOT):
+            subdirectories[:] = sorted(d for d in subdirectories if d != '__pycache__')
+            for file_name in sorted(files):
+                if file_name.endswith('.py'):
+                    path = os.path.join(directory, file_name)
+                    chunks.append(os.path.relpath(path, SIMULATOR_ROOT).replace(os.sep, '/').encode())
+                    with open(path, 'rb') as source:
+                        chunks.append(source.read())
+        _code_version = _digest(*chunks)
+    return _code_version
+
+def canonical(value, _active=None):
+    """
+    Paverčia konfigūracijos reikšmę stabiliu JSON pavidalu. Simuliatoriaus komponentai aprašomi
+    klasės pavadinimu ir atributais (įskaitant vidinę būseną, pvz. atsitiktinių skaičių generatoriaus
+    būseną), masyvai ir pandas objektai - jų turinio maiša.
+    
+    Args:
+        value: Bet kokia reikšmė
+    
+    Returns:
+        JSON suderinama reikšmė
+    
+    Raises:
+        UncacheableConfig: Jei konfigūracijoje yra ne simuliatoriaus objektas ar funkcija (jų būsenos
+            ir kodo neįmanoma įtraukti į maišą) arba komponentas, naudojantis globalų random modulį
+    """
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return value if np.isfinite(value) else repr(value)
+    if isinstance(value, enum.Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, np.generic):
+        return canonical(value.item(), _active)
+    if isinstance(value, (datetime.datetime, datetime.date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, (datetime.timedelta, pd.Timedelta, np.timedelta64)):
+        return str(pd.Timedelta(value))
+    if isinstance(value, np.ndarray):
+        return {'ndarray': _digest(np.ascontiguousarray(value).tobytes()), 'shape': list(value.shape),
+                'dtype': str(value.dtype)}
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return {type(value).__name__: _digest(pd.util.hash_pandas_object(value).to_numpy().tobytes())}
+    if isinstance(value, np.random.Generator):
+        return {'class': 'Generator', 'state': canonical(value.bit_generator.state, _active)}
+    if isinstance(value, np.random.SeedSequence):
+        return {'class': 'SeedSequence', 'entropy': canonical(value.entropy, _active),
+                'spawn_key': list(value.spawn_key)}
+    
+    _active = _active if _active is not None else set()
+    if id(value) in _active:
+        return {'ref': type(value).__name__}
+    _active.add(id(value))
+    try:
+        if isinstance(value, dict):
+            return {str(key): canonical(item, _active) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))
+                    if str(key) not in IGNORED_ATTRIBUTES}
+        if isinstance(value, (list, tuple, deque)):
+            return [canonical(item, _active) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted((canonical(item, _active) for item in value), key=repr)
+        
+        cls = type(value)
+        name = f"{cls.__module__}.{cls.__qualname__}"
+        if not cls.__module__.startswith('simulator.') or not hasattr(value, '__dict__') or callable(value):
+            raise UncacheableConfig(f"Konfigūracijoje yra objektas, kurio negalima aprašyti maiša: {name}")
+        if getattr(value, 'uses_global_random', False):
+            raise UncacheableConfig(f"{name} naudoja globalų random modulį - rezultatai nepriklauso nuo sėklos")
+        attributes = {key: item for key, item in vars(value).items() if not isinstance(item, logging.Logger)}
+        return {'class': name, 'attributes': canonical(attributes, _active)}
+    finally:
+        _active.discard(id(value))
+
+def config_hash(config):
+    """
+    Apskaičiuoja konfigūracijos maišą.
+    
+    Args:
+        config (dict): Paleidimo konfigūracija
+    
+    Returns:
+        tuple: (maiša, kanoninis konfigūracijos JSON)
+    
+    Raises:
+        UncacheableConfig: Jei konfigūracijos negalima aprašyti maiša
+    """
+    config_json = json.dumps({'registry_version': REGISTRY_VERSION, 'code_version': code_version(),
+                              'config': canonical(config)},
+                             sort_keys=True, separators=(',', ':'))
+    return _digest(config_json.encode()), config_json
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.datetime, datetime.date, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+def _finite(value):
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if np.isfinite(value) else None
+
+def encode_frame(df, prefix):
+    """
+    Paverčia DataFrame stulpelius numpy masyvais .npz failui (be pickle): laiko stulpeliai -
+    int64 nanosekundėmis, skaitiniai - kaip yra, kiti - eilutėmis su trūkstamų reikšmių kauke.
+    
+    Args:
+        df (pandas.DataFrame): Lentelė
+        prefix (str): Masyvų pavadinimų priešdėlis
+    
+    Returns:
+        tuple: (masyvų žodynas, stulpelių aprašai)
+    """
+    arrays = {}
+    columns = []
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        key = f"{prefix}{i}"
+        if isinstance(series.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+            tz = getattr(series.dt, 'tz', None)
+            values = series.dt.tz_convert('UTC') if tz is not None else series
+            arrays[key] = values.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            columns.append({'name': str(column), 'key': key, 'kind': 'datetime', 'tz': str(tz) if tz else None})
+        elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy()
+            if values.dtype == object:
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            arrays[key] = values
+            columns.append({'name': str(column), 'key': key, 'kind': 'numeric'})
+        else:
+            mask = series.isna().to_numpy()
+            arrays[key] = np.array(['' if missing else str(item) for item, missing in zip(series.tolist(), mask)],
+                                   dtype=str)
+            arrays[f"{key}_na"] = mask
+            columns.append({'name': str(column), 'key': key, 'kind': 'string'})
+    return arrays, columns
+
+def decode_frame(arrays, columns, length):
+    """
+    Atkuria DataFrame iš encode_frame() masyvų.
+    
+    Args:
+        arrays: .npz failo masyvai
+        columns (list): Stulpelių aprašai
+        length (int): Eilučių skaičius
+    
+    Returns:
+        pandas.DataFrame: Lentelė
+    """
+    data = {}
+    for column in columns:
+        values = arrays[column['key']]
+        if column['kind'] == 'datetime':
+            times = pd.to_datetime(values.view('datetime64[ns]'))
+            if column['tz']:
+                times = times.tz_localize('UTC').tz_convert(column['tz'])
+            data[column['name']] = times
+        elif column['kind'] == 'numeric':
+            data[column['name']] = values
+        else:
+            data[column['name']] = pd.Series(values, dtype=object).mask(arrays[f"{column['key']}_na"], None)
+    return pd.DataFrame(data, index=pd.RangeIndex(length))
+
+class RunRegistry:
+    """
+    Simuliacijų paleidimų registras: stulpeliniai rezultatų failai ir SQLite indeksas.
+    Registras laiko tik katalogo kelią (prisijungimas atidaromas kiekvienai operacijai),
+    todėl jį galima perduoti į kitus procesus, o keli procesai gali rašyti vienu metu.
+    """
+    def __init__(self, root=DEFAULT_REGISTRY_PATH, label=None):
+        """
+        Inicializuoja registrą.
+        
+        Args:
+            root (str): Registro katalogas (index.sqlite ir runs/ pakatalogis)
+            label (str, optional): Žymė, priskiriama naujiems įrašams (pvz. eksperimento pavadinimas)
+        """
+        self.root = root
+        self.label = label
+        self.index_path = os.path.join(root, "index.sqlite")
+        os.makedirs(os.path.join(root, "runs"), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+    
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        Atidaro indekso prisijungimą vienai operacijai (transakcija patvirtinama, prisijungimas uždaromas).
+        """
+        connection = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+    
+    def key(self, config, data, data_digest=None):
+        """
+        Apskaičiuoja paleidimo raktą.
+        
+        Args:
+            config (dict): Paleidimo konfigūracija (žr. SimulatorEngine.run_config())
+            data (pandas.DataFrame): Simuliacijos duomenys
+            data_digest (str, optional): Jau apskaičiuota duomenų maiša
+        
+        Returns:
+            dict: run_id, config_hash, data_hash ir config_json
+        
+        Raises:
+            UncacheableConfig: Jei konfigūracijos negalima aprašyti maiša
+        """
+        config_digest, config_json = config_hash(config)
+        data_digest = data_digest or data_hash(data)
+        return {
+            'run_id': _digest(config_digest.encode(), data_digest.encode()),
+            'config_hash': config_digest,
+            'data_hash': data_digest,
+            'config_json': config_json
+        }
+    
+    def _path(self, run_id):
+        return os.path.join("runs", run_id[:2], f"{run_id}.npz")
+    
+    def contains(self, run_id):
+        """
+        Patikrina, ar paleidimas jau yra registre.
+        
+        Args:
+            run_id (str): Paleidimo ID
+        
+        Returns:
+            bool: True, jei rezultatai įrašyti
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT path FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row is not None and os.path.exists(os.path.join(self.root, row[0]))
+    
+    def save(self, key, results, data=None, elapsed=None):
+        """
+        Įrašo simuliacijos rezultatus į registrą (portfelio ir sandorių istorija - .npz faile,
+        metrikos ir konfigūracija - indekse). Failas įrašomas per laikiną failą, todėl nutrūkęs
+        įrašymas nesugadina registro.
+        
+        Args:
+            key (dict): key() rezultatas
+            results (dict): SimulatorEngine.run_simulation() rezultatai
+            data (pandas.DataFrame, optional): Simuliacijos duomenys (laikotarpiui ir eilučių skaičiui indekse)
+            elapsed (float, optional): Simuliacijos trukmė sekundėmis
+        
+        Returns:
+            str: Paleidimo ID
+        """
+        run_id = key['run_id']
+        history = results.get('portfolio_history')
+        if history is None:
+            history = pd.DataFrame({'portfolio_value': []}, index=pd.DatetimeIndex([], name='timestamp'))
+        trade_history = results.get('trade_history') or []
+        trades = pd.DataFrame(trade_history)
+        # Sandorių įrašai gali turėti skirtingus laukus (pvz. 'profit' tik uždarymo sandoriuose)
+        trade_keys = np.array([[column in trade for column in trades.columns] for trade in trade_history], dtype=bool)
+        
+        history_arrays, history_columns = encode_frame(history.reset_index(), 'h')
+        trade_arrays, trade_columns = encode_frame(trades, 't')
+        if trade_keys.size and not trade_keys.all():
+            trade_arrays['trade_keys'] = trade_keys
+        meta = {
+            'version': REGISTRY_VERSION,
+            'history': {'columns': history_columns, 'length': len(history), 'index': history.index.name},
+            'trades': {'columns': trade_columns, 'length': len(trades)}
+        }
+        
+        path = self._path(run_id)
+        full_path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = f"{full_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta)), **history_arrays, **trade_arrays)
+        os.replace(tmp_path, full_path)
+        
+        online = results.get('online_metrics') or {}
+        metrics = {
+            'performance_metrics': results.get('performance_metrics') or {},
+            'online_metrics': online
+        }
+        values = history['portfolio_value'].to_numpy() if 'portfolio_value' in history.columns else np.array([])
+        row = {
+            'run_id': run_id,
+            'config_hash': key['config_hash'],
+            'data_hash': key['data_hash'],
+            'label': self.label,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'status': results.get('status', 'finished'),
+            'bars': len(data) if data is not None else len(history),
+            'data_start': data.index[0].isoformat() if data is not None and len(data) else None,
+            'data_end': data.index[-1].isoformat() if data is not None and len(data) else None,
+            'trades': len(trades),
+            'final_value': _finite(values[-1]) if len(values) else _finite(online.get('equity')),
+            'total_return': _finite(online.get('total_return')),
+            'sharpe_ratio': _finite(online.get('sharpe_ratio')),
+            'max_drawdown': _finite(online.get('max_drawdown')),
+            'win_rate': _finite(online.get('win_rate')),
+            'exposure': _finite(online.get('exposure')),
+            'turnover': _finite(online.get('turnover')),
+            'elapsed_s': _finite(elapsed),
+            'path': path,
+            'config_json': key['config_json'],
+            'metrics_json': json.dumps(metrics, default=_json_default)
+        }
+        
+        with self._connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values())
+            )
+        
+        logger.debug("Paleidimas įrašytas į registrą: %s", run_id)
+        return run_id
+    
+    def load(self, run_id):
+        """
+        Nuskaito paleidimo rezultatus iš registro. Žingsnių rezultatai (signalai ir sprendimai)
+        registre nesaugomi, todėl 'results' sąrašas tuščias.
+        
+        Args:
+            run_id (str): Paleidimo ID
+        
+        Returns:
+            dict: Rezultatai tuo pačiu pavidalu kaip SimulatorEngine.run_simulation() (su 'run_id' ir
+                'cached': True) arba None, jei paleidimo registre nėra
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT path, status, metrics_json FROM runs WHERE run_id = ?",
+                                     (run_id,)).fetchone()
+        if row is None:
+            return None
+        
+        path, status, metrics_json = row
+        full_path = os.path.join(self.root, path)
+        if not os.path.exists(full_path):
+            logger.warning("Registro įrašo %s rezultatų failas nerastas: %s", run_id, full_path)
+            return None
+        
+        with np.load(full_path, allow_pickle=False) as arrays:
+            meta = json.loads(str(arrays['meta']))
+            history = decode_frame(arrays, meta['history']['columns'], meta['history']['length'])
+            trades = decode_frame(arrays, meta['trades']['columns'], meta['trades']['length'])
+            trade_keys = arrays['trade_keys'] if 'trade_keys' in arrays else None
+        
+        trade_history = trades.to_dict('records')
+        if trade_keys is not None:
+            columns = list(trades.columns)
+            trade_history = [{column: trade[column] for column, present in zip(columns, keys) if present}
+                             for trade, keys in zip(trade_history, trade_keys.tolist())]
+        
+        index_name = meta['history']['index']
+        if index_name in history.columns:
+            history = history.set_index(index_name)
+        metrics = json.loads(metrics_json) if metrics_json else {}
+        
+        return {
+            'results': [],
+            'portfolio_history': history,
+            'trade_history': trade_history,
+            'performance_metrics': metrics.get('performance_metrics', {}),
+            'online_metrics': metrics.get('online_metrics', {}),
+            'status': status,
+            'prune_reason': None,
+            'profile': None,
+            'run_id': run_id,
+            'cached': True
+        }
+    
+    def config(self, run_id):
+        """
+        Grąžina paleidimo konfigūraciją.
+        
+        Args:
+            run_id (str): Paleidimo ID
+        
+        Returns:
+            dict: Kanoninė konfigūracija arba None
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT config_json FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0])['config'] if row and row[0] else None
+    
+    def runs(self, where=None, params=(), order_by='created_at', descending=True, limit=None, metrics=False):
+        """
+        Grąžina paleidimų lentelę iš indekso.
+        
+        Args:
+            where (str, optional): SQL sąlyga (pvz. "data_hash = ? AND max_drawdown > ?")
+            params (tuple): Sąlygos parametrai
+            order_by (str): Rikiavimo stulpelis (žr. INDEX_COLUMNS)
+            descending (bool): Ar rikiuoti mažėjančiai
+            limit (int, optional): Didžiausias eilučių skaičius
+            metrics (bool): Ar įtraukti metrikų ir konfigūracijos JSON stulpelius
+        
+        Returns:
+            pandas.DataFrame: Paleidimai (indeksas - run_id)
+        """
+        if order_by not in INDEX_COLUMNS:
+            raise ValueError(f"Nežinomas rikiavimo stulpelis: {order_by}")
+        
+        columns = list(INDEX_COLUMNS) + (['config_json', 'metrics_json'] if metrics else [])
+        query = f"SELECT {', '.join(columns)} FROM runs"
+        if where:
+            query += f" WHERE {where}"
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        
+        with self._connect() as connection:
+            return pd.read_sql_query(query, connection, params=tuple(params), index_col='run_id')
+    
+    def delete(self, run_id):
+        """
+        Pašalina paleidimą iš registro.
+        
+        Args:
+            run_id (str): Paleidimo ID
+        
+        Returns:
+            bool: True, jei paleidimas buvo registre
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT path FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return False
+            connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        
+        full_path = os.path.join(self.root, row[0])
+        if os.path.exists(full_path):
+            os.remove(full_path)
+        return True
@@ -0,0 +1,150 @@
+"""
+Simuliacijos žingsnio profiliavimo modulis
+-----------------------------
+Šis modulis realizuoja mažų sąnaudų simuliacijos žingsnio etapų laikmatį:
+kiekvieno etapo (signalų generatorių, strategijų, pozicijų atnaujinimo,
+vykdymo, įrašymo) trukmė matuojama monotoniniu laikrodžiu ir kaupiama
+logaritminėje histogramoje, todėl atmintis nepriklauso nuo žingsnių skaičiaus.
+Išjungus profiliavimą (profiler=None), variklis laikmačių nekviečia.
+"""
+
+import math
+from time import perf_counter_ns
+import pandas as pd
+
+# Histogramos intervalai: i-tasis intervalas - trukmės [2^(i-1), 2^i) nanosekundžių
+HISTOGRAM_BUCKETS = 48
+
+class StepProfiler:
+    """
+    Simuliacijos žingsnio etapų laikmatis su trukmių histogramomis.
+    """
+    def __init__(self):
+        """
+        Inicializuoja laikmatį.
+        """
+        self.reset()
+    
+    def reset(self):
+        """
+        Išvalo sukauptus matavimus.
+        """
+        # Etapas -> [iškvietimai, bendra trukmė ns, ilgiausia trukmė ns, histograma]
+        self._stats = {}
+        self._mark = perf_counter_ns()
+    
+    def start(self):
+        """
+        Pažymi matavimo pradžią.
+        """
+        self._mark = perf_counter_ns()
+    
+    def lap(self, stage):
+        """
+        Užfiksuoja laiką nuo paskutinės žymos kaip etapo trukmę ir pažymi naują pradžią.
+        
+        Args:
+            stage (str): Etapo pavadinimas
+        """
+        now = perf_counter_ns()
+        self.record(stage, now - self._mark)
+        self._mark = now
+    
+    def record(self, stage, elapsed):
+        """
+        Prideda etapo trukmę.
+        
+        Args:
+            stage (str): Etapo pavadinimas
+            elapsed (int): Trukmė nanosekundėmis
+        """
+        stats = self._stats.get(stage)
+        if stats is None:
+            stats = self._stats[stage] = [0, 0, 0, [0] * HISTOGRAM_BUCKETS]
+        
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed > stats[2]:
+            stats[2] = elapsed
+        stats[3][min(elapsed.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+    
+    @property
+    def stages(self):
+        """
+        list: Išmatuotų etapų pavadinimai (pirmo matavimo tvarka).
+        """
+        return list(self._stats)
+    
+    def histogram(self, stage):
+        """
+        Grąžina etapo trukmių histogramą.
+        
+        Args:
+            stage (str): Etapo pavadinimas
+        
+        Returns:
+            pandas.Series: Intervalo viršutinė riba mikrosekundėmis -> matavimų skaičius (tik netušti intervalai)
+        """
+        counts = self._stats[stage][3]
+        return pd.Series({(2 ** bucket) / 1000: count for bucket, count in enumerate(counts) if count})
+    
+    def percentile(self, stage, q):
+        """
+        Įvertina etapo trukmės procentilį iš histogramos (intervalo viršutinė riba).
+        
+        Args:
+            stage (str): Etapo pavadinimas
+            q (float): Procentilis (0-100)
+        
+        Returns:
+            float: Trukmė mikrosekundėmis
+        """
+        calls, _, max_ns, counts = self._stats[stage]
+        threshold = math.ceil(calls * q / 100)
+        cumulative = 0
+        for bucket, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= max(threshold, 1):
+                return min(2 ** bucket, max_ns) / 1000
+        return max_ns / 1000
+    
+    def summary(self):
+        """
+        Sudaro etapų suvestinės lentelę.
+        
+        Returns:
+            pandas.DataFrame: Iškvietimai, bendra ir vidutinė trukmė, p50/p99 įverčiai, ilgiausia trukmė
+                ir dalis nuo viso išmatuoto laiko (surikiuota pagal bendrą trukmę)
+        """
+        total_ns = sum(stats[1] for stats in self._stats.values()) or 1
+        rows = []
+        for stage, (calls, stage_ns, max_ns, _) in self._stats.items():
+            rows.append({
+                'stage': stage,
+                'calls': calls,
+                'total_ms': stage_ns / 1e6,
+                'mean_us': stage_ns / calls / 1000,
+                'p50_us': self.percentile(stage, 50),
+                'p99_us': self.percentile(stage, 99),
+                'max_us': max_ns / 1000,
+                'share': stage_ns / total_ns
+            })
+        
+        if not rows:
+            return pd.DataFrame(columns=['calls', 'total_ms', 'mean_us', 'p50_us', 'p99_us', 'max_us', 'share'])
+        
+        return pd.DataFrame(rows).set_index('stage').sort_values('total_ms', ascending=False)
+    
+    def report(self):
+        """
+        Suformatuoja suvestinės lentelę tekstu.
+        
+        Returns:
+            str: Lentelė
+        """
+        summary = self.summary()
+        if summary.empty:
+            return "Nėra profiliavimo matavimų"
+        
+        summary['share'] = (summary['share'] * 100).map('{:.1f}%'.format)
+        return summary.to_string(float_format=lambda value: f"{value:.2f}")
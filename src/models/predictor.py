@@ -51,6 +51,11 @@ def prepare_data_for_ml(df, target_column='Close', forecast_horizon=1, test_size
         features, target, test_size=test_size, shuffle=False
     )
     
+    # Paskutinių forecast_horizon mokymosi eilučių tikslas yra testavimo intervale - jas pašaliname
+    if forecast_horizon > 0:
+        X_train = X_train.iloc[:-forecast_horizon]
+        y_train = y_train.iloc[:-forecast_horizon]
+    
     # Normalizuojame duomenis
     scaler = MinMaxScaler()
     X_train_scaled = scaler.fit_transform(X_train)
@@ -60,6 +65,70 @@ def prepare_data_for_ml(df, target_column='Close', forecast_horizon=1, test_size
     
     return X_train_scaled, X_test_scaled, y_train, y_test, feature_names, scaler
 
+def walk_forward_splits(df, train_size, test_size, step_size=None, anchored=False,
+                        target_column='Close', forecast_horizon=1):
+    """
+    Paruošia duomenis walk-forward mokymui: požymiai ir tikslas sukuriami vieną kartą,
+    o kiekvienam langui tik išpjaunami ir normalizuojami. Mokymosi langas baigiamas
+    forecast_horizon eilučių anksčiau, kad jo tikslas neapimtų testavimo intervalo kainų
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Apdorotas duomenų rinkinys su indikatoriais
+    train_size : int
+        Mokymosi lango ilgis (eilutėmis)
+    test_size : int
+        Testavimo lango ilgis (eilutėmis)
+    step_size : int
+        Per kiek eilučių pastumiamas langas (numatyta - test_size)
+    anchored : bool
+        Ar mokymosi langas visada prasideda nuo duomenų pradžios
+    target_column : str
+        Stulpelis, kurį bandysime prognozuoti
+    forecast_horizon : int
+        Kiek periodų į priekį prognozuoti
+        
+    Yields:
+    -------
+    tuple
+        X_train, X_test, y_train, y_test, feature_names, scaler
+    """
+    step_size = step_size or test_size
+    if forecast_horizon >= train_size:
+        raise ValueError("forecast_horizon turi būti mažesnis už train_size")
+    
+    # Tikslą ir požymius sukuriame vieną kartą visam duomenų rinkiniui
+    data = df.copy()
+    data[f'Target_{forecast_horizon}'] = data[target_column].shift(-forecast_horizon)
+    data = data.dropna()
+    
+    features = data.drop([f'Target_{forecast_horizon}'], axis=1)
+    target = data[f'Target_{forecast_horizon}']
+    feature_names = features.columns.tolist()
+    feature_values = features.to_numpy(dtype=np.float64)
+    
+    train_start = 0
+    train_end = train_size
+    while train_end + test_size <= len(data):
+        # Eilutės tikslas - kaina po forecast_horizon periodų, todėl paskutinės eilutės į mokymą neįtraukiamos
+        fit_end = train_end - forecast_horizon
+        X_train = feature_values[train_start:fit_end]
+        X_test = feature_values[train_end:train_end + test_size]
+        
+        # Normalizavimo parametrai apskaičiuojami tik iš mokymosi lango
+        scaler = MinMaxScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        
+        yield (X_train_scaled, X_test_scaled,
+               target.iloc[train_start:fit_end], target.iloc[train_end:train_end + test_size],
+               feature_names, scaler)
+        
+        train_end += step_size
+        if not anchored:
+            train_start += step_size
+
 def train_model(X_train, y_train, model_type='random_forest', params=None):
     """
     Apmoko mašininio mokymosi modelį